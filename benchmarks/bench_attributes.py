@@ -0,0 +1,122 @@
+"""Micro-benchmark of the attribute engine of items.
+
+The per-access cost of getting and setting attributes and the memory
+allocated by Python per item are measured for the real nodes and edges
+of nezzle. Each tree is measured in its own process, so the current tree
+can be compared with a checkout of an older commit, for example:
+
+    git worktree add /tmp/nezzle-baseline <commit>
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_attributes.py \\
+        --baseline /tmp/nezzle-baseline
+
+The access times are the minimums of repeated runs, which are the least
+disturbed by the other processes. The memory is traced with tracemalloc,
+so the memory of the Qt objects is not included.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_attributes.py
+        [--baseline PATH] [--num-items N] [--repeat R]
+"""
+
+import os
+import sys
+import json
+import timeit
+import argparse
+import subprocess
+import tracemalloc
+
+
+NUMBER = 100000
+
+
+def create_items(num_items):
+    from qtpy.QtCore import QPointF
+    from nezzle.graphics import NodeClassFactory
+    from nezzle.graphics import EdgeClassFactory
+    from nezzle.graphics import ArrowClassFactory
+
+    NodeClass = NodeClassFactory.create("ELLIPSE_NODE")
+    EdgeClass = EdgeClassFactory.create("STRAIGHT_EDGE")
+    ArrowClass = ArrowClassFactory.create("TRIANGLE")
+
+    items = []
+    for i in range(0, num_items, 3):
+        source = NodeClass("S%d" % i, 40, 30, pos=QPointF(i, 0))
+        target = NodeClass("T%d" % i, 40, 30, pos=QPointF(i, 100))
+        edge = EdgeClass("E%d" % i, source, target, head=ArrowClass())
+        items.extend((source, target, edge))
+
+    return items[:num_items]
+
+
+def min_ns(stmt, repeat):
+    times = timeit.repeat(stmt, number=NUMBER, repeat=repeat)
+    return 1e9 * min(times) / NUMBER
+
+
+def measure(num_items, repeat):
+    node, _, edge = create_items(3)
+    result = {
+        "node get": min_ns(lambda: node['FILL_COLOR'], repeat),
+        "node set": min_ns(lambda: node.__setitem__('NAME', 'N'), repeat),
+        "edge get": min_ns(lambda: edge['WIDTH'], repeat),
+        "edge set": min_ns(lambda: edge.__setitem__('NAME', 'E'), repeat),
+    }
+
+    # The allocations are deterministic, so the memory is traced once.
+    tracemalloc.start()
+    items = create_items(num_items)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+
+    result["memory"] = size / num_items
+    return result
+
+
+def run_tree(dpath, num_items, repeat):
+    """Measure the tree of nezzle at dpath in a new process.
+    """
+    env = dict(os.environ, PYTHONPATH=dpath)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    cmd = [sys.executable, os.path.abspath(__file__), "--measure",
+           "--num-items", str(num_items), "--repeat", str(repeat)]
+    out = subprocess.check_output(cmd, env=env, cwd=dpath)
+    return json.loads(out.decode().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--baseline", default=None,
+                        help="Path to a checkout of nezzle to compare with.")
+    parser.add_argument("--num-items", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--measure", action="store_true",
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.num_items, args.repeat)))
+        return
+
+    trees = []
+    if args.baseline:
+        trees.append(("baseline", os.path.abspath(args.baseline)))
+
+    dpath_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    trees.append(("current", dpath_root))
+
+    keys = ("node get", "node set", "edge get", "edge set")
+    print("%-9s" % "tree" + "".join("%10s" % key for key in keys)
+          + "%16s" % "memory [B/item]")
+    print("%-9s" % "" + "".join("%10s" % "[ns]" for _ in keys))
+    for name, dpath in trees:
+        result = run_tree(dpath, args.num_items, args.repeat)
+        print("%-9s" % name
+              + "".join("%10.1f" % result[key] for key in keys)
+              + "%16.1f" % result["memory"])
+
+
+if __name__ == "__main__":
+    main()
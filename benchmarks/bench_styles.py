@@ -0,0 +1,73 @@
+"""Micro-benchmark of the memory of styles per item.
+
+The resident memory of the pens, colors and fonts of items is compared
+between owning a copy per item, as items did before the style pool,
+and referring to the pooled objects.
+
+Usage:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_styles.py [num_items]
+"""
+
+import gc
+import os
+import sys
+
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QColor
+from qtpy.QtGui import QFont
+from qtpy.QtGui import QPen
+from qtpy.QtWidgets import QApplication
+
+from nezzle.graphics import stylepool
+
+
+def get_rss():
+    """Resident set size of this process in bytes (Linux only).
+    """
+    with open("/proc/self/statm") as fin:
+        return int(fin.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def create_owned_styles():
+    pen = QPen()
+    pen.setBrush(Qt.transparent)
+    pen.setJoinStyle(Qt.MiterJoin)
+    pen.setColor(QColor(Qt.darkGray))
+    color = QColor(Qt.white)
+    font = QFont()
+    font.setFamily("Tahoma")
+    font.setPixelSize(10)
+    return pen, color, font
+
+
+def create_pooled_styles():
+    pen = stylepool.restyle_pen(stylepool.get_pen(),
+                                color=stylepool.get_color(Qt.darkGray))
+    color = stylepool.get_color(Qt.white)
+    font = QFont(stylepool.get_font(QFont()))
+    font.setFamily("Tahoma")
+    font.setPixelSize(10)
+    return pen, color, stylepool.get_font(font)
+
+
+def measure(func, num_items):
+    gc.collect()
+    rss_beg = get_rss()
+    styles = [func() for _ in range(num_items)]
+    rss_end = get_rss()
+    del styles
+    gc.collect()
+    return (rss_end - rss_beg) / num_items
+
+
+def main(num_items=100000):
+    app = QApplication.instance() or QApplication([])
+
+    print("%-8s %16s" % ("styles", "memory [B/item]"))
+    for name, func in (("pooled", create_pooled_styles),
+                       ("owned", create_owned_styles)):
+        print("%-8s %16.1f" % (name, measure(func, num_items)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -49,12 +49,7 @@ def create_movie(fpaths, fout):
 
 
 def update(nav, net):
-    num_nodes = len(net.nodes)
-    positions = np.zeros((num_nodes, 2))
-
-    for i, (iden, node) in enumerate(net.nodes.items()):
-        positions[i, :] = (node["POS_X"], node["POS_Y"])
-    # end of for
+    positions = net.positions.copy()
 
     # Layout by maximizing mean pairwise distances (MPD) (== minimizing the negative MPD).
     model = MeanPairwiseDistances(positions)
@@ -80,9 +75,7 @@ def update(nav, net):
             positions = model.pos.cpu().detach().numpy()
 
             net = net.copy()
-            for i, (iden, node) in enumerate(net.nodes.items()):
-                node["POS_X"] = positions[i, 0]
-                node["POS_Y"] = positions[i, 1]
+            net.set_positions(positions)
 
             fpath = osp.join(dpath, "%s-layout-%03d.jpg" % (net.name, epoch))
             fpaths_img.append((epoch, fpath))
@@ -125,10 +125,7 @@ def update(nav, net):
             positions = model.pos.cpu().detach().numpy()
 
             net = net.copy()
-            for iden, node in net.nodes.items():
-                i = int(iden)
-                node["POS_X"] = positions[i, 0]
-                node["POS_Y"] = positions[i, 1]
+            net.set_positions(positions)
 
             fpath = osp.join(dpath, "layout-%03d.jpg" % (epoch))
             fpaths_img.append((epoch, fpath))
@@ -3,7 +3,6 @@ import os.path as osp
 
 import numpy as np
 from scipy.integrate import odeint
-import moviepy.editor as mpy
 
 from qtpy.QtCore import Qt
 from qtpy.QtCore import QPointF
@@ -14,7 +13,7 @@ from nezzle.graphics import TextLabel
 from nezzle.graphics import CurvedEdge
 from nezzle.graphics import Triangle, Hammer
 from nezzle.graphics import Network
-from nezzle.io import write_image
+from nezzle.io import write_animation
 
 
 def create_network(pos_x, pos_y, s):
@@ -44,21 +43,21 @@ def create_network(pos_x, pos_y, s):
     net.add_edge(edge1)
     net.add_edge(edge2)
 
-    for i, node in enumerate([src, trg]):
-
-        if s[i] > 0.5:
-            color = color_white + s[i] * (color_up - color_white)
-        else:
-            color = color_white + s[i] * (color_dn - color_white)
+    s = np.asarray(s)[:2, None]
+    colors = np.where(s > 0.5,
+                      color_white + s * (color_up - color_white),
+                      color_white + s * (color_dn - color_white))
+    colors[:, 3] = 255
 
-        color[3] = 255
-        node["FILL_COLOR"] = QColor(*color)
-        node["BORDER_COLOR"] = Qt.black
-        node["BORDER_WIDTH"] = 2
-        node["WIDTH"] = node["HEIGHT"] = 20 + 50 * s[i]
+    net.set_node_attr("FILL_COLOR", colors.astype(np.uint8))
+    net.set_node_attr("BORDER_COLOR", Qt.black)
+    net.set_node_attr("BORDER_WIDTH", 2)
+    net.set_node_attr("WIDTH", 20 + 50 * s[:, 0])
+    net.set_node_attr("HEIGHT", 20 + 50 * s[:, 0])
 
+    for i, node in enumerate([src, trg]):
         label_name = TextLabel(node, node.iden)
-        label_name["FONT_SIZE"] = 10 + 30 * s[i]
+        label_name["FONT_SIZE"] = int(10 + 30 * s[i, 0])
         label_name["TEXT_COLOR"] = Qt.white
         label_name.align()
 
@@ -75,16 +74,31 @@ def create_network(pos_x, pos_y, s):
     return net
 
 
-def create_movie(fpaths, fout):
-    clips = []
-    for fpath in fpaths:
-        img = mpy.ImageClip(fpath).set_duration(0.2)
-        clips.append(img)
+def create_frames(norm_s):
+    color_white = np.array([255, 255, 255, 0])
+    color_up = np.array([255, 0, 0, 0])
+    color_dn = np.array([0, 0, 255, 0])
+
+    s = norm_s[:, :, None]
+    colors = np.where(s > 0.5,
+                      color_white + s * (color_up - color_white),
+                      color_white + s * (color_dn - color_white))
+    colors[..., 3] = 255
+    colors = colors.astype(np.uint8)
+
+    lightness = np.array([QColor(*rgba).lightness()
+                          for rgba in colors.reshape(-1, 4).tolist()])
+    is_dark = lightness.reshape(norm_s.shape) < 200
+    text_colors = np.where(is_dark[..., None],
+                           np.array([255, 255, 255, 255]),
+                           np.array([0, 0, 0, 255]))
 
-    concat_clip = mpy.concatenate_videoclips(clips,
-                                             bg_color=(255, 255, 255),
-                                             method="compose")
-    concat_clip.write_gif(fout, fps=30)
+    return {"NODES": {"FILL_COLOR": colors,
+                      "WIDTH": 20 + 50 * norm_s,
+                      "HEIGHT": 20 + 50 * norm_s},
+            "LABELS": {"TEXT_COLOR": text_colors,
+                       "FONT_BOLD": is_dark,
+                       "FONT_SIZE": (10 + 30 * norm_s).astype(int)}}
 
 
 def update(nav, net):
@@ -114,12 +128,8 @@ def update(nav, net):
     dpath = osp.join(osp.dirname(__file__), "2nnfl-dynamics-results")
     os.makedirs(dpath, exist_ok=True)
 
-    fpaths = []
-    for i, s in enumerate(norm_s):
-        net = create_network(pos_x, pos_y, s)
-        fpath = osp.join(dpath, "2nnfl-dynamics-%03d.png"%(i))
-        fpaths.append(fpath)
-        write_image(net, fpath, transparent=False, scale_width=200, scale_height=200)
-    # end of for
-
-    create_movie(fpaths, osp.join(dpath, "2nnfl-dynamics.gif"))
\ No newline at end of file
+    # The network is created once, and the frames change its attributes.
+    net = create_network(pos_x, pos_y, norm_s[0])
+    write_animation(net, osp.join(dpath, "2nnfl-dynamics.gif"),
+                    create_frames(norm_s), fps=5,
+                    transparent=False, scale_width=200, scale_height=200)
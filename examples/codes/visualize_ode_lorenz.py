@@ -3,7 +3,6 @@ import os.path as osp
 
 import numpy as np
 from scipy.integrate import odeint
-import moviepy.editor as mpy
 
 from qtpy.QtCore import Qt
 from qtpy.QtCore import QPointF
@@ -14,7 +13,7 @@ from nezzle.graphics import TextLabel
 from nezzle.graphics import CurvedEdge
 from nezzle.graphics import Triangle, Hammer
 from nezzle.graphics import Network
-from nezzle.io import write_image
+from nezzle.io import write_animation
 
 
 def create_network(pos_x, pos_y, state, norm_abs_state):
@@ -50,13 +49,13 @@ def create_network(pos_x, pos_y, state, norm_abs_state):
     edge3["CP_POS_Y"] = -28
     
     head = Hammer(width=14, height=4, offset=4)
-    edge4 = CurvedEdge("EDGE3", z, y, width=4, head=head)
+    edge4 = CurvedEdge("EDGE4", z, y, width=4, head=head)
     edge4["FILL_COLOR"] = Qt.black
     edge4["CP_POS_X"] = 45
     edge4["CP_POS_Y"] = 40
     
     head = Triangle(width=10, height=10, offset=4)
-    edge5 = CurvedEdge("EDGE3", z, x, width=4, head=head)
+    edge5 = CurvedEdge("EDGE5", z, x, width=4, head=head)
     edge5["FILL_COLOR"] = Qt.black
     edge5["CP_POS_X"] = -45
     edge5["CP_POS_Y"] = 40
@@ -74,13 +73,13 @@ def create_network(pos_x, pos_y, state, norm_abs_state):
             color = color_white + norm_abs_state[i] * (color_dn - color_white)
 
         color[3] = 255
-        node["FILL_COLOR"] = QColor(*color)
+        node["FILL_COLOR"] = QColor(*color.astype(int))
         node["BORDER_COLOR"] = Qt.black
         node["BORDER_WIDTH"] = 2
         node["WIDTH"] = node["HEIGHT"] = 20 + 50 * norm_abs_state[i]
 
         label_name = TextLabel(node, node.iden)
-        label_name["FONT_SIZE"] = 10 + 30 * norm_abs_state[i]
+        label_name["FONT_SIZE"] = int(10 + 30 * norm_abs_state[i])
         label_name["TEXT_COLOR"] = Qt.white
         label_name.align()
 
@@ -97,16 +96,31 @@ def create_network(pos_x, pos_y, state, norm_abs_state):
     return net
 
 
-def create_movie(fpaths, fout):
-    clips = []
-    for fpath in fpaths:
-        img = mpy.ImageClip(fpath).set_duration(0.2)
-        clips.append(img)
+def create_frames(s, norm_abs_s):
+    color_white = np.array([255, 255, 255, 0])
+    color_up = np.array([255, 0, 0, 0])
+    color_dn = np.array([0, 0, 255, 0])
+
+    norm = norm_abs_s[:, :, None]
+    colors = np.where(s[:, :, None] > 0.0,
+                      color_white + norm * (color_up - color_white),
+                      color_white + norm * (color_dn - color_white))
+    colors[..., 3] = 255
+    colors = colors.astype(np.uint8)
 
-    concat_clip = mpy.concatenate_videoclips(clips,
-                                             bg_color=(255, 255, 255),
-                                             method="compose")
-    concat_clip.write_gif(fout, fps=10)
+    lightness = np.array([QColor(*rgba).lightness()
+                          for rgba in colors.reshape(-1, 4).tolist()])
+    is_dark = lightness.reshape(s.shape) < 200
+    text_colors = np.where(is_dark[..., None],
+                           np.array([255, 255, 255, 255]),
+                           np.array([0, 0, 0, 255]))
+
+    return {"NODES": {"FILL_COLOR": colors,
+                      "WIDTH": 20 + 50 * norm_abs_s,
+                      "HEIGHT": 20 + 50 * norm_abs_s},
+            "LABELS": {"TEXT_COLOR": text_colors,
+                       "FONT_BOLD": is_dark,
+                       "FONT_SIZE": (10 + 30 * norm_abs_s).astype(int)}}
 
 
 def update(nav, net):
@@ -132,12 +146,8 @@ def update(nav, net):
     dpath = osp.join(osp.dirname(__file__), "lorenz-dynamics-results")
     os.makedirs(dpath, exist_ok=True)
 
-    fpaths = []
-    for i, (state, norm_abs_state) in enumerate(zip(s, norm_abs_s)):
-        net = create_network(pos_x, pos_y, state, norm_abs_state)
-        fpath = osp.join(dpath, "lorenz-dynamics-%03d.png"%(i))
-        fpaths.append(fpath)
-        write_image(net, fpath, scale_width=200, scale_height=200)
-    # end of for
-
-    create_movie(fpaths, osp.join(dpath, "lorenz-dynamics.gif"))
+    # The network is created once, and the frames change its attributes.
+    net = create_network(pos_x, pos_y, s[0], norm_abs_s[0])
+    write_animation(net, osp.join(dpath, "lorenz-dynamics.gif"),
+                    create_frames(s, norm_abs_s), fps=5,
+                    scale_width=200, scale_height=200)
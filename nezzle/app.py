@@ -14,11 +14,19 @@ from qtpy.QtGui import QIcon
 
 from nezzle.mainwindow import MainWindow
 
+# The working directory where nezzle is launched, which is changed below.
+launch_dir = os.getcwd()
+
 base_dir = os.path.dirname(os.path.abspath(__file__))
 os.chdir(base_dir)
 
 
 def main():
+    # Subcommands run without GUI.
+    if len(sys.argv) > 1 and sys.argv[1] == "render":
+        from nezzle.render import main as render_main
+        sys.exit(render_main(sys.argv[2:], cwd=launch_dir))
+
     argparser = argparse.ArgumentParser(description="Nezzle arguments for CUI execution")
     argparser.add_argument('-fc', '--fpath-code',
                            action='store',
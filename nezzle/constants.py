@@ -6,6 +6,18 @@ from qtpy.QtCore import Qt
 DEFAULT_SCENE_WIDTH = 1000
 DEFAULT_SCENE_HEIGHT = 1000
 
+# The number of items built between the progress reports of readers.
+PROGRESS_INTERVAL = 1024
+
+# Levels of detail (i.e., the scale of view) below which the items
+# of each kind are painted in simplified forms, when the level of detail
+# is turned on in the system state. It is turned off by default.
+LOD_THRESHOLDS = {
+    'label': 0.5,  # Labels are not painted.
+    'edge': 0.3,  # Edges are painted as polylines without heads.
+    'node': 0.2,  # Nodes are painted as filled rects.
+}
+
 
 #class Lock(enum.IntFlag):
 class Lock(object):
@@ -19,16 +19,18 @@ from nezzle.constants import DEFAULT_SCENE_WIDTH, DEFAULT_SCENE_HEIGHT
 from nezzle.utils.math import rotate, dist, internal_division
 
 
-def to_graphics(dg, iden, no_edge_type=False):
+def to_graphics(dg, iden, no_edge_type=False, headless=False):
     if not isinstance(dg, nx.DiGraph):
         raise TypeError("NetworkX.DiGraph should be given, not %s"%(type(dg)))
 
-    net = Network(iden)
+    net = Network(iden, headless=headless)
     #net.scene.setBackgroundBrush(QColor(0, 0, 0, 0))
-    net.scene.setBackgroundBrush(Qt.transparent)
+    net.background_color = Qt.transparent
 
     NodeClass = NodeClassFactory.create("ELLIPSE_NODE")
     nodes = {}
+    heads = {}  # Prototypes of heads
+    edges = []
     counter_node = 0
     counter_edge = 0
 
@@ -151,7 +153,10 @@ def to_graphics(dg, iden, no_edge_type=False):
                 pass  # This logic is processed just below.
 
             if ArrowClass:
-                head = ArrowClass()
+                # The heads of the same type share their attributes.
+                if ArrowClass not in heads:
+                    heads[ArrowClass] = ArrowClass()
+                head = heads[ArrowClass].copy(cow=True)
 
         # Add edge with head
         if str_src == str_trg:  # Self-loop edge
@@ -184,22 +189,26 @@ def to_graphics(dg, iden, no_edge_type=False):
 
         src.add_edge(edge)
         trg.add_edge(edge)
-        net.add_edge(edge)
+        edges.append(edge)
     # end of for : reading each line of SIF file
 
+    net.add_edges(edges)
+
     # Add nodes and labels in network
     font = QFont()
     font.setFamily("Tahoma")
     font.setPointSize(10)
     LabelClass = LabelClassFactory.create("TEXT_LABEL")
+    labels = []
     for str_name, node in nodes.items():
-        net.add_node(node)
         label = LabelClass(node, str_name)
         label.font = font
         rect = label.boundingRect()
         label.setPos(-rect.width()/2, -rect.height()/2)
-        net.add_label(label)
-        nodes[str_name] = node
+        labels.append(label)
+
+    net.add_nodes(nodes.values())
+    net.add_labels(labels)
 
     # Make the two edges of interconnected nodes curved.
     for src, trg, attr in net.nxgraph.edges(data=True):
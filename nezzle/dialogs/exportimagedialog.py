@@ -70,7 +70,7 @@ class ExportImageDialog(QDialog, Ui_ExportImageDialog):
             fpath = QFileDialog.getSaveFileName(self,
                                                 self.tr("Save an image"),
                                                 "",
-                                                self.tr("Image files (*.png *.jpeg)"))
+                                                self.tr("Image files (*.png *.jpeg *.svg *.pdf)"))
 
             fpath = fpath[0]
             if fpath:
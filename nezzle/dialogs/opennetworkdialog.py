@@ -52,7 +52,7 @@ class OpenNetworkDialog(QDialog, Ui_OpenNetworkDialog):
             dialog = QFileDialog(self)
             dialog.setWindowTitle("Open a network file")
             dialog.setAcceptMode(QFileDialog.AcceptOpen)
-            dialog.setNameFilters([self.tr("Text files (*.sif *.cx *.nzj *.json)")])
+            dialog.setNameFilters([self.tr("Network files (*.sif *.cx *.nzj *.json *.nzj.gz *.nzb)")])
             dialog.setFileMode(QFileDialog.ExistingFile)
             if dialog.exec() == QDialog.Accepted:
                 fpath = dialog.selectedFiles()[0]
@@ -1,5 +1,5 @@
-
 from qtpy.QtCore import Qt
+from qtpy.QtCore import Signal
 
 from qtpy.QtWidgets import QDialog
 
@@ -10,20 +10,47 @@ from nezzle.ui.ui_progressdialog import Ui_ProgressDialog
 
 class ProgressDialog(QDialog, Ui_ProgressDialog):
 
+    # Emitted when the cancel button is clicked.
+    canceled = Signal()
+
+    # Resolution of the progress bar, which does not overflow
+    # for the large numbers of bytes or items.
+    MAXIMUM = 1000
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
         self.setupUi(self)
         self.setModal(False)
 
         self.setWindowFlags(Qt.FramelessWindowHint)
-        self.setGeometry(parent.width()/2,
-                         parent.height()/2,
-                         self.width(), self.height())
+        if parent:
+            self.setGeometry(int(parent.width()/2),
+                             int(parent.height()/2),
+                             self.width(), self.height())
 
         self._progress_bar = self.ui_progressBar
         self._progress_bar.setMaximum(100)
         self._progress_bar.setValue(-1)
 
+        self._message_label = self.ui_messageLabel
+        self._cancel_button = self.ui_cancelButton
+        self._cancel_button.clicked.connect(self.canceled)
+
+    def set_message(self, text):
+        self._message_label.setText(text)
+
+    def set_progress(self, done, total):
+        """Show the progress of a task.
+
+        The progress bar is busy (i.e., indeterminate)
+        if the total amount is unknown (e.g., 0 or None).
+        """
+        if not total:
+            self._progress_bar.setMaximum(0)
+            return
+
+        self._progress_bar.setMaximum(self.MAXIMUM)
+        self._progress_bar.setValue(int(self.MAXIMUM * min(done, total) / total))
 
     def exec(self):
         self._progress_bar.setMaximum(0)
@@ -36,4 +63,4 @@ class ProgressDialog(QDialog, Ui_ProgressDialog):
 
     def close(self):
         self._progress_bar.setMaximum(100)
-        super().close()
\ No newline at end of file
+        super().close()
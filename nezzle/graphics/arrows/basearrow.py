@@ -1,8 +1,10 @@
 from qtpy.QtCore import QPointF
 from nezzle.utils import TriggerDict
+from nezzle.utils import Triggerable
+from nezzle.utils import trigger
 
 
-class BaseArrow(object):
+class BaseArrow(Triggerable):
 
     ITEM_TYPE = 'BASE_HEAD'
 
@@ -10,17 +12,13 @@ class BaseArrow(object):
 
     def __init__(self, width, height, offset):
 
-        self._attr = TriggerDict()
+        self._attr = TriggerDict(owner=self)
         self._attr['ITEM_TYPE'] = self.ITEM_TYPE
 
         self._offset = offset
         self._height = height
         self._width = width
 
-        self._attr.set_trigger('WIDTH', self._trigger_set_width, when='set')
-        self._attr.set_trigger('HEIGHT', self._trigger_set_height, when='set')
-        self._attr.set_trigger('OFFSET', self._trigger_set_offset, when='set')
-        
         self._attr['WIDTH'] = width
         self._attr['HEIGHT'] = height
         self._attr['OFFSET'] = offset
@@ -43,6 +41,7 @@ class BaseArrow(object):
         self._attr['WIDTH'] = val
         self.update()
 
+    @trigger('WIDTH')
     def _trigger_set_width(self, key, value):
         self._width = value
         return value
@@ -56,6 +55,7 @@ class BaseArrow(object):
         self._attr['HEIGHT'] = val
         self.update()
 
+    @trigger('HEIGHT')
     def _trigger_set_height(self, key, value):
         self._height = value
         return value
@@ -72,6 +72,7 @@ class BaseArrow(object):
         self._attr['OFFSET'] = val
         self.update()
 
+    @trigger('OFFSET')
     def _trigger_set_offset(self, key, value):
         self._offset = value
         return value
@@ -92,6 +93,21 @@ class BaseArrow(object):
 
         return dict_head
 
+    def copy(self, cow=False):
+        """Copy this arrow.
+
+        Args:
+            cow : bool
+                If True, the attribute storage is shared with this arrow
+                until either of them is modified (copy-on-write).
+        """
+        obj = type(self)(self.width, self.height, offset=self.offset)
+        if cow:
+            obj._attr.share(self._attr)
+        else:
+            obj._attr.data = dict(self._attr.data)
+        return obj
+
     @classmethod
     def from_dict(cls, dict_head):
         width = dict_head['WIDTH']
@@ -16,10 +16,46 @@ from qtpy.QtCore import QPointF
 from qtpy.QtWidgets import QGraphicsItem
 from qtpy.QtWidgets import QStyle
 from qtpy.QtGui import QColor
+from qtpy.QtGui import QFont
 from qtpy.QtGui import QPen
 
 from nezzle.graphics.attributemapper import AttributeMapper
+from nezzle.graphics import stylepool
 from nezzle.utils import TriggerDict
+from nezzle.utils import Triggerable
+from nezzle.utils import trigger
+from nezzle.systemstate import get_system_state
+
+
+def _copy_value(value):
+    """Copy a Qt value object, which is mutable unlike Python scalars.
+    """
+    if isinstance(value, (QPointF, QColor, QFont)):
+        return type(value)(value)
+    return value
+
+
+def lod_threshold(widget, name):
+    """Get the threshold of level of detail below which
+    the items of a kind are painted in a simplified form.
+
+    The thresholds are the attributes of GraphicsView (e.g., lod_node),
+    which follow the setting of system state if they are None.
+    Returns 0 (full fidelity) if the items are not painted on a view,
+    for example, when the scene is rendered for exporting an image.
+    """
+    if widget is None:
+        return 0
+
+    view = widget.parent()
+    if not hasattr(view, 'lod_' + name):
+        return 0
+
+    threshold = getattr(view, 'lod_' + name)
+    if threshold is None:
+        return get_system_state().lod_threshold(name)
+
+    return threshold
 
 
 class MappableGraphicsItemMeta(type(QGraphicsItem),
@@ -29,12 +65,10 @@ class MappableGraphicsItemMeta(type(QGraphicsItem),
         return super().__new__(cls, *args, **kwargs)
 
 
-class MappableItem(MutableMapping):
+class MappableItem(Triggerable, MutableMapping):
     def __init__(self, iden, *args, name=None, **kwargs):
         super().__init__(*args, **kwargs)
-        self._attr = TriggerDict()
-        self._attr.set_trigger('ID', self._trigger_set_iden)
-        self._attr.set_trigger('NAME', self._trigger_set_name)
+        self._attr = TriggerDict(owner=self)
         self._attr['ID'] = iden
         self._attr['NAME'] = name if name else iden
 
@@ -54,19 +88,21 @@ class MappableItem(MutableMapping):
     def name(self, val):
         self._attr['NAME'] = val
 
+    @trigger('ID')
     def _trigger_set_iden(self, key, value):
         self._iden = value
         return value
 
+    @trigger('NAME')
     def _trigger_set_name(self, key, value):
         self._name = value
         return value
 
     def __getitem__(self, key):
-        return self._attr[key]
+        return self._attr.get(key)
 
     def __setitem__(self, key, value):
-        self._attr[key] = value
+        self._attr.set(key, value)
 
     def __delitem__(self, key):
         del self._attr[key]
@@ -92,6 +128,29 @@ class MappableItem(MutableMapping):
     def to_dict(self):
         return dict(self._attr)
 
+    def _copy_state(self, other, cow=False):
+        """Copy the state of other item without the dict round-trip.
+
+        The attributes are copied without calling the triggers,
+        so the subclasses should copy their Qt value objects
+        before calling this method.
+
+        Args:
+            other : MappableItem
+                Item to be copied.
+            cow : bool
+                If True, the attribute storage is shared with the other item
+                until either of them is modified (copy-on-write).
+        """
+        if cow:
+            self._attr.share(other._attr)
+        else:
+            self._attr.data = {key: _copy_value(value)
+                               for key, value in other._attr.data.items()}
+
+        self._iden = other._iden
+        self._name = other._name
+
     @classmethod
     def from_dict(cls, attr):
         obj = cls()
@@ -119,6 +178,10 @@ class MappableGraphicsItem(MappableItem,
         attr["ZVALUE"] = self.zValue()
         return attr
 
+    def _copy_state(self, other, cow=False):
+        self.setZValue(other.zValue())
+        super()._copy_state(other, cow=cow)
+
 
 class Movable(object):
     def is_movable(self):
@@ -137,9 +200,6 @@ class GeometryChangeItem(MappableGraphicsItem,
 
         super().__init__(*args, **kwargs)
 
-        self._attr.set_trigger('POS_X', self._trigger_set_x)
-        self._attr.set_trigger('POS_Y', self._trigger_set_y)
-
         if pos:
             self._attr['POS_X'] = pos.x()
             self._attr['POS_Y'] = pos.y()
@@ -152,10 +212,12 @@ class GeometryChangeItem(MappableGraphicsItem,
         self.setFlags(QGraphicsItem.ItemIsMovable
                       | QGraphicsItem.ItemSendsGeometryChanges)
 
+    @trigger('POS_X')
     def _trigger_set_x(self, key, value):
         self.setX(value)
         return value
 
+    @trigger('POS_Y')
     def _trigger_set_y(self, key, value):
         self.setY(value)
         return value
@@ -168,6 +230,10 @@ class GeometryChangeItem(MappableGraphicsItem,
 
         return super().itemChange(change, value)
 
+    def _copy_state(self, other, cow=False):
+        self.setPos(other.pos())
+        super()._copy_state(other, cow=cow)
+
     def gather_children(self):
         children = self.childItems()
         return children
@@ -189,45 +255,67 @@ class PainterOptionItem(GeometryChangeItem):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self._attr.set_trigger("BORDER_WIDTH", self._trigger_set_border_width)
-        self._attr.set_trigger('BORDER_COLOR', self._trigger_set_border_color)
-        self._attr.set_trigger('BORDER_JOIN', self._trigger_set_border_join)
-        self._attr.set_trigger('BORDER_LINE', self._trigger_set_border_line)
-        self._attr.set_trigger("FILL_COLOR", self._trigger_set_fill_color)
-
-        self._pen = QPen()
-        self._pen.setBrush(Qt.transparent)
-        self._pen.setJoinStyle(Qt.MiterJoin)
-
-        self._color = QColor()
+        # The pen and color are shared with other items in the style pool,
+        # so they should be replaced, not modified, to restyle this item.
+        self._pen = stylepool.get_pen()
+        self._color = stylepool.get_color()
 
     @property
     def attr_map(self):
         return __class__._attr_map
 
+    @property
+    def pen(self):
+        """Pooled QPen of the border, which should not be modified.
+        """
+        return self._pen
+
+    @property
+    def fill_color(self):
+        """Pooled QColor of the fill, which should not be modified.
+        """
+        return self._color
+
+    def _copy_state(self, other, cow=False):
+        self._pen = other._pen
+        self._color = other._color
+        super()._copy_state(other, cow=cow)
+
     def _invalidate(self):
         if self.scene():
             self.scene().invalidate()
 
+    def _defer_update(self):
+        """Queue the update of this item if its scene is in the batch mode.
+        """
+        scene = self.scene()
+        if scene:
+            return scene.defer_update(self)
+        return False
+
+    @trigger('BORDER_WIDTH')
     def _trigger_set_border_width(self, key, value):
         width = int(value)
-        self._pen.setWidth(width)
+        self.prepareGeometryChange()
+        self._pen = stylepool.restyle_pen(self._pen, width=width)
         self._invalidate()
         return width
 
+    @trigger('BORDER_COLOR')
     def _trigger_set_border_color(self, key, value):
-        color = QColor(value)
-        self._pen.setColor(color)
+        color = stylepool.get_color(value)
+        self._pen = stylepool.restyle_pen(self._pen, color=color)
         self._invalidate()
         return color.name(QColor.HexArgb)
 
+    @trigger('BORDER_JOIN')
     def _trigger_set_border_join(self, key, value):
         if isinstance(value, str):
             join_style = self.attr_map.to_qt('BORDER_JOIN', value)
-            self._pen.setJoinStyle(join_style)
+            self._pen = stylepool.restyle_pen(self._pen, join=join_style)
             return value
         elif isinstance(value, Qt.JoinStyle):
-            self._pen.setJoinStyle(value)
+            self._pen = stylepool.restyle_pen(self._pen, join=value)
             return self.attr_map.to_str('BORDER_JOIN', value)
         else:
             err_msg = "It is not an border join option: %s"%(value)
@@ -237,13 +325,14 @@ class PainterOptionItem(GeometryChangeItem):
 
         return value
 
+    @trigger('BORDER_LINE')
     def _trigger_set_border_line(self, key, value):
         if isinstance(value, str):
             line_type = self.attr_map.to_qt('BORDER_LINE', value)
-            self._pen.setStyle(line_type)
+            self._pen = stylepool.restyle_pen(self._pen, style=line_type)
             return value
         elif isinstance(value, Qt.PenStyle):
-            self._pen.setStyle(value)
+            self._pen = stylepool.restyle_pen(self._pen, style=value)
             return self.attr_map.to_str('BORDER_LINE', value)
         else:
             err_msg = "It is not an border line type: %s"%(value)
@@ -253,8 +342,9 @@ class PainterOptionItem(GeometryChangeItem):
 
         return value
 
+    @trigger('FILL_COLOR')
     def _trigger_set_fill_color(self, key, value):
-        self._color = QColor(value)
+        self._color = stylepool.get_color(value)
         self._invalidate()
         return self._color.name(QColor.HexArgb)
 
@@ -269,9 +359,20 @@ class PainterOptionItem(GeometryChangeItem):
         self._set_border_options(painter)
         self._set_fill_options(painter)
 
+    def _is_simplified(self, name, painter, option, widget):
+        """Decide whether this item is painted in a simplified form
+        at the current level of detail of the view.
+        """
+        threshold = lod_threshold(widget, name)
+        if threshold <= 0:
+            return False
+
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        return lod < threshold
+
     def paint(self, painter, option, widget):
 
-        painter.setClipRect(option.exposedRect)
+        painter.setClipRect(option.exposedRect, Qt.IntersectClip)
 
         if option.state & QStyle.State_Selected:
             pen = QPen(self._pen)
@@ -1,18 +1,25 @@
+from collections.abc import ValuesView
+
 import numpy as np
 
 from qtpy.QtCore import QPointF, Qt
 from qtpy.QtCore import QRectF
 
 from qtpy.QtGui import QPainterPath
+from qtpy.QtGui import QPen
+from qtpy.QtGui import QPolygonF
 from qtpy.QtWidgets import QGraphicsItem
+from qtpy.QtWidgets import QStyle
 
 from nezzle.utils import dist
 from nezzle.utils import length
 from nezzle.utils import internal_division
+from nezzle.utils import trigger
 
 from nezzle.graphics.baseitem import PainterOptionItem
 from nezzle.graphics import ArrowClassFactory
 from nezzle.graphics.nodes.basenode import BaseNode
+from nezzle.graphics.edges.controlpoint import BaseControlPoint
 
 
 class BaseEdge(PainterOptionItem):
@@ -35,15 +42,16 @@ class BaseEdge(PainterOptionItem):
         self._path_paint = QPainterPath()
         self._bounding_rect = QRectF()
 
+        # The key of geometry from which the current path has been created.
+        self._geometry_key = None
+
         self.setFlags(QGraphicsItem.ItemIsSelectable
                       | QGraphicsItem.ItemIsFocusable
                       | QGraphicsItem.ItemSendsGeometryChanges)
 
-        self._attr.set_trigger('WIDTH', self._trigger_set_width, when='set')
         self._attr.set('WIDTH', width, trigger=False)
         self._width = width
 
-        self._attr.set_trigger('HEAD', self._trigger_set_head, when='set')
         self._attr.set('HEAD', head, trigger=False)
 
         self._head = head
@@ -55,6 +63,16 @@ class BaseEdge(PainterOptionItem):
     def __str__(self):
         return 'Edge(%s)'%(self._iden)
 
+    def __getitem__(self, key):
+        # The head is owned by each edge, even if the storage is shared
+        # with a copy. A get trigger would slow down getting all keys.
+        if key == 'HEAD':
+            return self._head
+        return self._attr.get(key)
+
+    def values(self):
+        return ValuesView(self)
+
     @property
     def width(self):
         return self._attr['WIDTH']
@@ -71,10 +89,12 @@ class BaseEdge(PainterOptionItem):
         self._attr.set('WIDTH', val, trigger=False)
         self.update()
 
+    @trigger('WIDTH')
     def _trigger_set_width(self, key, value):
         self.set_width(value)
         return value
 
+    @trigger('HEAD')
     def _trigger_set_head(self, key, value):
         self._head = value
         if self._head:
@@ -87,7 +107,7 @@ class BaseEdge(PainterOptionItem):
 
     @property
     def head(self):
-        return self._attr['HEAD']
+        return self._head
 
     @head.setter
     def head(self, obj):
@@ -125,6 +145,12 @@ class BaseEdge(PainterOptionItem):
         return self._path_paint
 
     def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemSelectedChange:
+            # Control points have their geometry only if this edge is selected.
+            for child in self.childItems():
+                if isinstance(child, BaseControlPoint):
+                    child.prepareGeometryChange()
+
         return super().itemChange(change, value)
 
     def _create_head_path(self):
@@ -139,15 +165,69 @@ class BaseEdge(PainterOptionItem):
         self._path_head = path
 
     def update(self, *args, **kwargs):
-        self._create_path()
-        self._update_bounding_rect()
+        if self._defer_update():
+            return
+
+        key = self._identify_geometry_key()
+        if key != self._geometry_key:
+            self._create_path()
+            self._update_bounding_rect()
+            self._geometry_key = key
+
         self._invalidate()
         return super().update(*args, **kwargs)
 
+    def invalidate_geometry(self):
+        """Force the path to be recreated at the next update.
+
+        The path of an edge is recreated only if its geometry key
+        is changed. This should be called when the geometry is changed
+        by something that the key does not capture.
+        """
+        self._geometry_key = None
+
+    def _identify_geometry_key(self):
+        """Identify the values that determine the path of this edge.
+        """
+        head = self._head
+        if head:
+            key_head = (type(head), head.width, head.height, head.offset)
+        else:
+            key_head = None
+
+        return self._width, key_head, self._pen.widthF()
+
     def paint(self, painter, option, widget):
+        if self._is_simplified('edge', painter, option, widget):
+            return self._paint_simplified(painter, option)
+
         super().paint(painter, option, widget)
         painter.drawPath(self._path_paint)
 
+    def _paint_simplified(self, painter, option):
+        """Paint this edge as a polyline of cosmetic pen without the head.
+        """
+        if option.state & QStyle.State_Selected:
+            color = Qt.green
+        else:
+            color = self._color
+
+        painter.setPen(QPen(color, 0))
+        painter.setBrush(Qt.NoBrush)
+
+        points = self._identify_simplified_points()
+        if points:
+            painter.drawPolyline(QPolygonF(points))
+        else:
+            painter.drawPath(self._path_paint)
+
+    def _identify_simplified_points(self):
+        """Identify the points of polyline for the simplified form.
+
+        The outline of the path is painted if no point is given.
+        """
+        return None
+
     def to_dict(self):
         attr = super().to_dict()
         if self.head:
@@ -173,6 +253,19 @@ class BaseEdge(PainterOptionItem):
     def copy(self):
         return self.from_dict(self.to_dict())
 
+    def _copy_state(self, other, cow=False):
+        self._width = other._width
+        self._head = other._head.copy() if other._head else None
+        if self._head:
+            self._head.parent = self
+
+        super()._copy_state(other, cow=cow)
+
+        # The shared storage is not detached for the head,
+        # which is resolved by __getitem__.
+        if not cow:
+            self._attr.set('HEAD', self._head, trigger=False)
+
     def initialize(self):
         pass
 
@@ -189,6 +282,7 @@ class BaseEdge(PainterOptionItem):
         return False
 
     def _update_bounding_rect(self):
+        self.prepareGeometryChange()
         rect = self._path_paint.boundingRect()
         if self._pen:
             pad = 2 * self._pen.width()
@@ -221,9 +315,8 @@ class TwoNodeEdge(BaseEdge):
 
     @source.setter
     def source(self, obj: BaseNode):
-        if not obj.has_edge(self):
-            obj.add_edge(self)
         self._source = obj
+        obj.add_edge(self)
 
     @property
     def target(self):
@@ -231,9 +324,8 @@ class TwoNodeEdge(BaseEdge):
 
     @target.setter
     def target(self, obj: BaseNode):
-        if not obj.has_edge(self):
-            obj.add_edge(self)
         self._target = obj
+        obj.add_edge(self)
 
     # Read-only properties
     @property
@@ -251,6 +343,16 @@ class TwoNodeEdge(BaseEdge):
     def is_node_selected(self):
         return self.source.isSelected() or self.target.isSelected()
 
+    def _identify_geometry_key(self):
+        src = self._source
+        trg = self._target
+        return (super()._identify_geometry_key(),
+                id(src), src.x(), src.y(), src.width, src.height,
+                id(trg), trg.x(), trg.y(), trg.width, trg.height)
+
+    def _identify_simplified_points(self):
+        return [self.pos_src, self.pos_trg]
+
     def are_nodes_close(self):
         """Decide whether the two nodes are overlapped to show the graphics of edge appropriately.
         """
@@ -296,11 +398,27 @@ class TwoNodeEdge(BaseEdge):
 
         return obj
 
-    def copy(self, source=None, target=None):
+    def copy(self, source=None, target=None, cow=False):
+        """Copy this edge without the dict round-trip.
+
+        Args:
+            source : BaseNode, optional
+                Source of the new edge. The source of this edge is used
+                if it is not given.
+            target : BaseNode, optional
+                Target of the new edge. The target of this edge is used
+                if it is not given.
+            cow : bool
+                If True, the attribute storage is shared with this edge
+                until either of them is modified (copy-on-write).
+        """
         if not source:
             source = self.source
 
         if not target:
             target = self.target
 
-        return self.from_dict(self.to_dict(), source, target)
+        obj = type(self)(self.iden, source, target, width=self.width)
+        obj._copy_state(self, cow=cow)
+        obj.update()
+        return obj
@@ -12,6 +12,7 @@ from nezzle.graphics.edges.controlpoint import ControlPoint
 from nezzle.utils import dot
 from nezzle.utils import internal_division
 from nezzle.utils import length
+from nezzle.utils import trigger
 from nezzle.graphics import quadbezier
 from nezzle.graphics.mixins import Lockable
 
@@ -23,20 +24,9 @@ class CurvedEdge(StraightEdge):
 
     def __init__(self, *args, **kwargs):
         self._t_head = 0
+        self._ctrl_point = None
         super().__init__(*args, **kwargs)
 
-        self._attr.set_trigger('CP_POS_X',
-                               self._trigger_set_cp_pos_x,
-                               when='set')
-
-        self._attr.set_trigger('CP_POS_Y',
-                               self._trigger_set_cp_pos_y,
-                               when='set')
-
-
-        # To avoid repetitive memory allocation, make this variable as a member.
-        self._arr_t = np.arange(1, 0.5, -0.001, dtype=np.float64)
-
     @property
     def pos_ctrl(self):
         return self._ctrl_point.pos()
@@ -45,14 +35,26 @@ class CurvedEdge(StraightEdge):
     def ctrl_point(self):
         return self._ctrl_point
 
+    @trigger('CP_POS_X')
     def _trigger_set_cp_pos_x(self, key, value):
-        self._ctrl_point.setX(value)
+        if self._ctrl_point is not None:
+            self._ctrl_point.setX(value)
         return value
 
+    @trigger('CP_POS_Y')
     def _trigger_set_cp_pos_y(self, key, value):
-        self._ctrl_point.setY(value)
+        if self._ctrl_point is not None:
+            self._ctrl_point.setY(value)
         return value
 
+    def _identify_geometry_key(self):
+        pos = self._ctrl_point.pos()
+        return super()._identify_geometry_key(), pos.x(), pos.y()
+
+    def _copy_state(self, other, cow=False):
+        self._ctrl_point.setPos(other.ctrl_point.pos())
+        super()._copy_state(other, cow=cow)
+
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemSelectedChange:
             self._ctrl_point.update()
@@ -60,6 +62,9 @@ class CurvedEdge(StraightEdge):
         return super().itemChange(change, value)
 
     def update(self):
+        if self._defer_update():
+            return
+
         self.update_ctrl_points()
         super().update()
 
@@ -83,6 +88,11 @@ class CurvedEdge(StraightEdge):
                 painter.drawLine(self.pos_ctrl, self.pos_src)
                 painter.drawLine(self.pos_ctrl, self.pos_trg)
 
+    def _identify_simplified_points(self):
+        # The point of the curve at t=0.5
+        pos_mid = 0.25*self.pos_src + 0.5*self.pos_ctrl + 0.25*self.pos_trg
+        return [self.pos_src, pos_mid, self.pos_trg]
+
     def is_straight(self):
         v1 = self.pos_src - self.ctrl_point.pos()
         v2 = self.pos_trg - self.ctrl_point.pos()
@@ -150,11 +160,7 @@ class CurvedEdge(StraightEdge):
         x = np.array([p1.x(), pc.x(), p2.x()], dtype=np.float64)
         y = np.array([p1.y(), pc.y(), p2.y()], dtype=np.float64)
 
-        arclen = quadbezier.arc_length(x, y, self._arr_t, 1)
-        rchange = np.abs(arclen - offset) / offset
-
-        ix = np.argmax(rchange < 5e-2)
-        t = self._arr_t[ix]
+        t = quadbezier.solve_arc_length(x, y, offset)
         self._t_head = t
 
         ph = (1-t)**2*p1 + 2*(1-t)*t*pc + t**2*p2
@@ -199,8 +205,10 @@ class CurvedEdge(StraightEdge):
         self._dps_bottom = dps_bottom
 
     def _create_curve_path(self):
-
         self._identify_curve_points()
+        self._build_curve_path()
+
+    def _build_curve_path(self):
         self._path_paint = QPainterPath()
         # self._path_paint.clear()  # supported from Qt 5.13
         self._path_paint.setFillRule(Qt.WindingFill)
@@ -228,4 +236,85 @@ class CurvedEdge(StraightEdge):
         try:
             self._create_curve_path()
         except FloatingPointError:
-            super(StraightEdge, self)._create_path()
\ No newline at end of file
+            super(StraightEdge, self)._create_path()
+
+    @classmethod
+    def update_edges(cls, edges):
+        """Update the geometry of many edges at once.
+
+        The offset curves and head positions of the curved edges whose
+        geometry has been changed are calculated in a single vectorized
+        call of quadbezier, and the rest of edges are updated as usual.
+
+        Args:
+            edges : iterable
+                Edge objects derived from nezzle.graphics.BaseEdge.
+        """
+        curved = []
+        for edge in edges:
+            if not isinstance(edge, CurvedEdge):
+                edge.update()
+                continue
+
+            if edge._defer_update():
+                continue
+
+            key = edge._identify_geometry_key()
+            if key == edge._geometry_key:
+                edge.update()
+                continue
+
+            edge._identify_pos()
+            if edge.is_straight():
+                edge.update()
+                continue
+
+            curved.append((edge, key))
+        # end of for
+
+        if not curved:
+            return
+
+        cps = np.array([[(p.x(), p.y()) for p in (edge.pos_src,
+                                                   edge.pos_ctrl,
+                                                   edge.pos_trg)]
+                        for edge, _ in curved], dtype=np.float64)
+
+        valid = np.ones(len(curved), dtype=bool)
+        t_head = np.ones(len(curved), dtype=np.float64)
+        ix_head = [i for i, (edge, _) in enumerate(curved) if edge.head]
+        if ix_head:
+            offset = np.array([curved[i][0]._calculate_head_offset()
+                               for i in ix_head], dtype=np.float64)
+            pos_head, t = quadbezier.identify_head_batch(cps[ix_head], offset)
+            cps[ix_head, 2] = pos_head
+            t_head[ix_head] = t
+            valid[ix_head] = np.isfinite(t)
+
+        widths = np.array([edge.width for edge, _ in curved], dtype=np.float64)
+        sps, valid_sps = quadbezier.identify_sps_batch(cps)
+        valid &= valid_sps
+        qps_top, qps_bottom = quadbezier.identify_qps_batch(sps, widths)
+        dps_top, dps_bottom = quadbezier.identify_dps_batch(sps, widths)
+
+        for i, (edge, key) in enumerate(curved):
+            if not valid[i]:
+                edge.invalidate_geometry()
+                edge.update()
+                continue
+
+            if edge.head:
+                edge._t_head = t_head[i]
+                edge.pos_head.setX(cps[i, 2, 0])
+                edge.pos_head.setY(cps[i, 2, 1])
+                CurvedEdge._calculate_head_angle(edge)
+                edge._create_head_path()
+
+            edge._qps_top = [QPointF(x, y) for x, y in qps_top[i].tolist()]
+            edge._qps_bottom = [QPointF(x, y) for x, y in qps_bottom[i].tolist()]
+            edge._dps_top = [QPointF(x, y) for x, y in dps_top[i].tolist()]
+            edge._dps_bottom = [QPointF(x, y) for x, y in dps_bottom[i].tolist()]
+            edge._build_curve_path()
+            edge._update_bounding_rect()
+            edge._geometry_key = key
+            edge.update()
\ No newline at end of file
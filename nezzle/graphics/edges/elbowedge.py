@@ -22,6 +22,7 @@ from nezzle.utils import internal_division
 from nezzle.utils import normal_vector
 from nezzle.utils import length
 from nezzle.utils import rotate
+from nezzle.utils import trigger
 from nezzle.graphics import quadbezier
 from nezzle.graphics.mixins import Lockable
 
@@ -34,27 +35,18 @@ class ElbowEdge(StraightEdge):
     def __init__(self, *args, **kwargs):
         self._ctrl_points = []
         self._t_head = 0
-
-        # To avoid repetitive memory allocation, make this variable as a member.
-        self._arr_t = np.arange(1, 0.5, -0.001, dtype=np.float64)
         super().__init__(*args, **kwargs)  # initialize() is called in the hierarchy of super().__init__
 
-        for i in range(3):
-            self._attr.set_trigger(f'CP{i}_POS_X',
-                                   self._trigger_set_cp_pos_x,
-                                   when='set')
-
-            self._attr.set_trigger(f'CP{i}_POS_Y',
-                                   self._trigger_set_cp_pos_y,
-                                   when='set')
-
-
     @property
     def ctrl_points(self):
         return self._ctrl_points
 
+    @trigger('CP0_POS_X', 'CP1_POS_X', 'CP2_POS_X')
     def _trigger_set_cp_pos_x(self, key, value):
         ix = int(key[2])
+        if ix >= len(self._ctrl_points):  # Not created yet
+            return value
+
         cp = self._ctrl_points[ix]
         old_selected = cp.isSelected()
         cp.setSelected(True)
@@ -62,8 +54,12 @@ class ElbowEdge(StraightEdge):
         cp.setSelected(old_selected)
         return value
 
+    @trigger('CP0_POS_Y', 'CP1_POS_Y', 'CP2_POS_Y')
     def _trigger_set_cp_pos_y(self, key, value):
         ix = int(key[2])
+        if ix >= len(self._ctrl_points):  # Not created yet
+            return value
+
         cp = self._ctrl_points[ix]
         old_selected = cp.isSelected()
         cp.setSelected(True)
@@ -71,6 +67,17 @@ class ElbowEdge(StraightEdge):
         cp.setSelected(old_selected)
         return value
 
+    def _identify_geometry_key(self):
+        return (super()._identify_geometry_key(),
+                tuple((cp.x(), cp.y()) for cp in self._ctrl_points))
+
+    def _copy_state(self, other, cow=False):
+        for i, cp in enumerate(other.ctrl_points):
+            self._trigger_set_cp_pos_x(f'CP{i}_POS_X', cp.x())
+            self._trigger_set_cp_pos_y(f'CP{i}_POS_Y', cp.y())
+
+        super()._copy_state(other, cow=cow)
+
     def initialize(self):
         self._identify_pos()
         self._create_connectors()
@@ -86,6 +93,9 @@ class ElbowEdge(StraightEdge):
         return super().itemChange(change, value)
 
     def update(self):
+        if self._defer_update():
+            return
+
         self.update_ctrl_points()
         super().update()
 
@@ -110,6 +120,12 @@ class ElbowEdge(StraightEdge):
             painter.drawEllipse(QPointF(-2.5, -2.5), 5, 5)
             painter.setPen(QColor(50, 50, 50, 100))
 
+    def _identify_simplified_points(self):
+        if not self._cps:
+            return None
+
+        return self._cps[:-1]  # The last one is a dummy point.
+
     def is_head_visible(self):
         if not self.head:
             return False
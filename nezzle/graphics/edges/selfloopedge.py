@@ -33,6 +33,12 @@ class SelfloopEdge(BaseEdge):
     def node(self, obj):
         self._node = obj
 
+    def _identify_geometry_key(self):
+        node = self._node
+        return (super()._identify_geometry_key(),
+                id(node), node.x(), node.y(), node.width, node.height,
+                self._angle_begin)
+
     def initialize(self):
         self._identify_pos()
         self._create_path()
@@ -161,6 +167,25 @@ class SelfloopEdge(BaseEdge):
     def paint(self, painter, option, widget):
         super().paint(painter, option, widget)
 
+    def copy(self, node=None, cow=False):
+        """Copy this edge without the dict round-trip.
+
+        Args:
+            node : BaseNode, optional
+                Node of the new edge. The node of this edge is used
+                if it is not given.
+            cow : bool
+                If True, the attribute storage is shared with this edge
+                until either of them is modified (copy-on-write).
+        """
+        if not node:
+            node = self.node
+
+        obj = type(self)(self.iden, node, width=self.width)
+        obj._copy_state(self, cow=cow)
+        obj.update()
+        return obj
+
     def to_dict(self):
         attr = super().to_dict()
         attr['ID_NODE'] = self.node.iden
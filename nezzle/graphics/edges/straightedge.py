@@ -94,8 +94,4 @@ class StraightEdge(TwoNodeEdge):
             self._path_paint.lineTo(rotate(self.pos_src, head1, angle))
             self._path_paint.lineTo(rotate(self.pos_src, head2, angle))
 
-    def paint(self, painter, option, widget):
-        super().paint(painter, option, widget)
-        painter.drawPath(self._path_paint)
-
 
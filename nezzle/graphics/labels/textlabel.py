@@ -1,42 +1,73 @@
 from qtpy.QtCore import Qt
+from qtpy.QtCore import QPointF
+from qtpy.QtCore import QRectF
 from qtpy.QtGui import QFont
 from qtpy.QtGui import QColor
+from qtpy.QtGui import QPainterPath
+from qtpy.QtGui import QPen
+from qtpy.QtGui import QStaticText
+from qtpy.QtGui import QTransform
 
 from qtpy.QtWidgets import QGraphicsItem
 from qtpy.QtWidgets import QGraphicsTextItem
+from qtpy.QtWidgets import QStyle
 
+from nezzle.utils import trigger
 from nezzle.graphics.mixins import Lockable
 from nezzle.graphics.baseitem import PainterOptionItem
+from nezzle.graphics import stylepool
 from nezzle.graphics import BaseEdge
 
 
+# The margin around the text, which is the same as
+# the default document margin of QGraphicsTextItem.
+TEXT_MARGIN = 4
+
+# Laid-out static texts shared by the labels of the same text and font.
+_static_texts = {}
+_MAX_STATIC_TEXTS = 8192
+
+
+def get_static_text(text, font):
+    """Get the laid-out QStaticText of a plain text, which is shared
+    by all labels of the same text and font.
+
+    The color is not a part of the layout, so it is given by
+    the pen of painter when drawing the text.
+    """
+    key = (text, font.key())
+    static_text = _static_texts.get(key)
+    if static_text is None:
+        if len(_static_texts) >= _MAX_STATIC_TEXTS:
+            _static_texts.clear()
+
+        static_text = QStaticText(text)
+        static_text.setTextFormat(Qt.PlainText)
+        static_text.prepare(QTransform(), font)
+        _static_texts[key] = static_text
+
+    return static_text
+
+
 @Lockable
 class TextLabel(PainterOptionItem):
 
     ITEM_TYPE = 'TEXT_LABEL'
 
     def __init__(self, parent, text, font=None, pos=None):
-        self._text_item = QGraphicsTextItem()
+        # The text is drawn as a shared QStaticText, and QGraphicsTextItem
+        # is created only if text_item is requested.
+        self._text_item = None
+        self._text = ''
+        self._text_color = stylepool.get_color(Qt.black)
         self._font = None
+        self._static_text = None
+        self._brect = QRectF()
+        self._layout_key = None
 
         iden = "[%s-%s]%s-%s"%(parent.__class__.__name__, str(parent.iden), id(self), text)
         super().__init__(parent=parent, iden=iden)
 
-        self._attr.set_trigger('TEXT',
-                               self._trigger_set_text_str, when='set')
-        self._attr.set_trigger('TEXT_COLOR',
-                               self._trigger_set_text_color, when='set')
-        self._attr.set_trigger('FONT',
-                               self._trigger_set_font, when='set')
-        self._attr.set_trigger('FONT_SIZE',
-                               self._trigger_set_font_size, when='set')
-        self._attr.set_trigger('FONT_FAMILY',
-                               self._trigger_set_font_family, when='set')
-        self._attr.set_trigger('FONT_BOLD',
-                               self._trigger_set_font_bold, when='set')
-        self._attr.set_trigger('FONT_ITALIC',
-                               self._trigger_set_font_italic, when='set')
-
         if not font:
             font = QFont()
             font.setFamily('Arial')
@@ -45,9 +76,6 @@ class TextLabel(PainterOptionItem):
 
         if pos:
             self.setPos(pos)
-            self._text_item.setPos(pos)
-
-        self._text_item.setDefaultTextColor(Qt.black)
 
         self.setFlags(QGraphicsItem.ItemIsSelectable
                       | QGraphicsItem.ItemIsMovable
@@ -89,86 +117,162 @@ class TextLabel(PainterOptionItem):
 
     @property
     def text_item(self):
+        """QGraphicsTextItem of the text, which is created on demand.
+        """
+        if self._text_item is None:
+            text_item = QGraphicsTextItem()
+            text_item.setPlainText(self._text)
+            text_item.setDefaultTextColor(self._text_color)
+            if self._font:
+                text_item.setFont(self._font)
+            text_item.setPos(self.pos())
+            self._text_item = text_item
+
         return self._text_item
 
+    @property
+    def text_color(self):
+        return self._text_color
+
     def _trigger_set_x(self, key, value):
         self.setX(value)
-        self._text_item.setX(value)
+        if self._text_item:
+            self._text_item.setX(value)
         self.update()
         return value
 
     def _trigger_set_y(self, key, value):
         self.setY(value)
-        self._text_item.setY(value)
+        if self._text_item:
+            self._text_item.setY(value)
         self.update()
         return value
 
+    def _invalidate_layout(self):
+        """Invalidate the layout and the bounding rect of the text,
+        which are created again at the next update.
+        """
+        self.prepareGeometryChange()
+        self._layout_key = None
+
+    def _create_layout(self):
+        self._static_text = get_static_text(self._text, self._font)
+        size = self._static_text.size()
+        self._brect = QRectF(0, 0,
+                             size.width() + 2*TEXT_MARGIN,
+                             size.height() + 2*TEXT_MARGIN)
+        self._layout_key = (self._text, self._font.key())
+
+        if self._text_item:
+            self._text_item.setFont(self._font)
+
+    @trigger('FONT')
     def _trigger_set_font(self, key, value):
 
-        if isinstance(value, QFont):
-            self._font = QFont(value)
-        elif isinstance(value, str):
-            self._font = QFont()
-            self._font.fromString(value)
+        # The font is shared with other labels in the style pool.
+        if isinstance(value, (QFont, str)):
+            self._font = stylepool.get_font(value)
         else:
             fstr = "%s is not allowed for setting font." % (type(value))
             raise ValueError(fstr)
 
+        self._invalidate_layout()
+
         # Synchronize the properties related to the font.
         self._attr.set('FONT_SIZE', self._font.pixelSize(), trigger=False)
         self._attr.set('FONT_FAMILY', self._font.family(), trigger=False)
         self._attr.set('FONT_BOLD', self._font.bold(), trigger=False)
         self._attr.set('FONT_ITALIC', self._font.italic(), trigger=False)
 
-        # update should be called to reflect the font
-        # to that of self._text_item
+        # update should be called to lay out the text with the font.
         self.update()
         return self._font
 
+    @trigger('TEXT')
     def _trigger_set_text_str(self, key, value):
-        self._text_item.setPlainText(value)
+        self._invalidate_layout()
+        self._text = value
+        if self._text_item:
+            self._text_item.setPlainText(value)
         self.update()
         return value
 
+    @trigger('TEXT_COLOR')
     def _trigger_set_text_color(self, key, value):
-        color = QColor(value)
-        self._text_item.setDefaultTextColor(color)
+        color = stylepool.get_color(value)
+        self._text_color = color
+        if self._text_item:
+            self._text_item.setDefaultTextColor(color)
         self.update()
         return color.name(QColor.HexArgb)
 
+    @trigger('FONT_SIZE')
     def _trigger_set_font_size(self, key, value):
-        self.font.setPixelSize(value)
+        self._invalidate_layout()
+        font = QFont(self._font)
+        font.setPixelSize(value)
+        self._font = stylepool.get_font(font)
         self.update()
         return value
 
+    @trigger('FONT_FAMILY')
     def _trigger_set_font_family(self, key, value):
-        self.font.setFamily(value)
+        self._invalidate_layout()
+        font = QFont(self._font)
+        font.setFamily(value)
+        self._font = stylepool.get_font(font)
         self.update()
         return value
 
+    @trigger('FONT_BOLD')
     def _trigger_set_font_bold(self, key, value):
-        self.font.setBold(value)
+        self._invalidate_layout()
+        font = QFont(self._font)
+        font.setBold(value)
+        self._font = stylepool.get_font(font)
         self.update()
         return value
 
+    @trigger('FONT_ITALIC')
     def _trigger_set_font_italic(self, key, value):
-        self.font.setItalic(value)
+        self._invalidate_layout()
+        font = QFont(self._font)
+        font.setItalic(value)
+        self._font = stylepool.get_font(font)
         self.update()
         return value
 
     def setSelected(self, val):
-        self._text_item.setSelected(val)
+        if self._text_item:
+            self._text_item.setSelected(val)
         super().setSelected(val)
 
     def boundingRect(self):
-        return self._text_item.boundingRect()
+        return self._brect
 
     def shape(self):
-        return self._text_item.shape()
+        path = QPainterPath()
+        path.addRect(self._brect)
+        return path
 
     def paint(self, painter, option, widget):
+        if self._is_simplified('label', painter, option, widget):
+            return  # Too small to read
+
         super().paint(painter, option, widget)
-        self._text_item.paint(painter, option, widget)
+        if not self._static_text:
+            return
+
+        # QStaticText is drawn with the font of painter, not the one prepared.
+        painter.setFont(self._font)
+        painter.setPen(self._text_color)
+        painter.drawStaticText(QPointF(TEXT_MARGIN, TEXT_MARGIN),
+                               self._static_text)
+
+        if option.state & QStyle.State_Selected:
+            painter.setPen(QPen(Qt.black, 0, Qt.DashLine))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self._brect)
 
     def is_movable(self):
         return True
@@ -178,7 +282,8 @@ class TextLabel(PainterOptionItem):
             parent = self.parentItem()
             if isinstance(parent, BaseEdge):
                 if parent.is_node_selected():
-                    self._text_item.itemChange(change, self.pos())
+                    if self._text_item:
+                        self._text_item.itemChange(change, self.pos())
                     return super().itemChange(change, self.pos())
 
         return super().itemChange(change, value)
@@ -189,21 +294,41 @@ class TextLabel(PainterOptionItem):
                 For example, __init__ of a super class calls it
                 to initialize the position.
             """
-            self._text_item.setFont(self._font)
-            self._text_item.update()
+            if self._layout_key is None:
+                self._create_layout()
         self._invalidate()
         super().update()
 
-    def copy(self, parent=None):
+    def copy(self, parent=None, cow=False):
+        """Copy this label without the dict round-trip.
+
+        Args:
+            parent : QGraphicsItem, optional
+                Parent of the new label. The parent of this label is used
+                if it is not given.
+            cow : bool
+                If True, the attribute storage is shared with this label
+                until either of them is modified (copy-on-write).
+        """
         if not parent:
             parent = self.parentItem()
 
-        return self.from_dict(self.to_dict(), parent)
+        obj = type(self)(parent, self.text, self._font)
+        obj._copy_state(self, cow=cow)
+        return obj
+
+    def _copy_state(self, other, cow=False):
+        self._text_color = other.text_color
+        super()._copy_state(other, cow=cow)
+
+        # The font is pooled, so the shared storage already holds it.
+        if self._attr.get('FONT', trigger=False) is not self._font:
+            self._attr.set('FONT', self._font, trigger=False)
 
     def to_dict(self):
         attr = super().to_dict()
         attr['ID_PARENT'] = self.parentItem().iden
-        attr['FONT'] = self._text_item.font().toString()
+        attr['FONT'] = self._font.toString()
         return attr
 
     @classmethod
@@ -219,7 +344,7 @@ class TextLabel(PainterOptionItem):
         return obj
 
     def align(self, mode="middle-center"):
-        rect = self._text_item.boundingRect()
+        rect = self.boundingRect()
 
         if "top" in mode:
             self._attr["POS_Y"] = -rect.height()
@@ -1,11 +1,14 @@
 import math
 import random
+from contextlib import contextmanager
 
 from qtpy.QtCore import Qt
 from qtpy.QtCore import QPointF
 from qtpy.QtGui import QColor
 from qtpy.QtGui import QFont
+from qtpy.QtWidgets import QGraphicsItem
 
+import numpy as np
 import networkx as nx
 
 import nezzle
@@ -18,27 +21,57 @@ from nezzle.graphics.arrows.arrowclassfactory import ArrowClassFactory
 from nezzle.graphics.edges.baseedge import BaseEdge
 from nezzle.graphics.labels.textlabel import TextLabel
 from nezzle.graphics.nodes.basenode import BaseNode
+from nezzle.graphics.nodes.positionstore import PositionStore
 
 from nezzle.graphics import SelfloopEdge
+from nezzle.graphics import CurvedEdge
 from nezzle.graphics.baseitem import MappableItem
 from nezzle.graphics.screen import GraphicsScene
 from nezzle.utils.math import rotate, dist, internal_division
+from nezzle.utils.triggerdict import trigger
+from nezzle.constants import PROGRESS_INTERVAL
+
+
+def _to_attr_value(key, value):
+    """Convert a value in NumPy arrays to the value of an attribute.
+    """
+    if isinstance(value, np.ndarray):
+        if key.endswith('COLOR'):
+            return QColor(*value.astype(int).tolist())
+        return value.tolist()
+    elif isinstance(value, np.generic):
+        return value.item()
+    return value
 
 
 class Network(MappableItem):
-    def __init__(self, iden, name=None):
+    """Network of nodes, edges and labels.
+
+    Args:
+        iden : str
+            Identity of the network.
+        name : str, optional
+            Name of the network. The identity is used if it is not given.
+        headless : bool, optional
+            If True, the GraphicsScene is not created until the scene
+            is accessed for the first time (e.g., showing the network
+            in the GUI or writing an image). A headless network can be built,
+            laid out and serialized without the overhead of the scene.
+    """
+    def __init__(self, iden, name=None, headless=False):
         self._item = None
+        self._scene = None
+        self._background_color = QColor(Qt.transparent)
         super().__init__(iden, name=name)
         self._nodes = {}
         self._edges = {}
         self._labels = {}
-        self._scene = GraphicsScene()
+        self._positions = PositionStore()
+        if not headless:
+            self._materialize_scene()
         self._nxgraph = nx.DiGraph(name=name)
         self.nxgraph.labels = {}
 
-        self._attr.set_trigger('BACKGROUND_COLOR', self._trigger_set_background_color)
-
-
     def __str__(self):
         return self.name
 
@@ -67,12 +100,181 @@ class Network(MappableItem):
 
     @property
     def scene(self):
+        if self._scene is None:
+            self._materialize_scene()
         return self._scene
 
+    @property
+    def is_headless(self):
+        """True if the scene of this network has not been created yet.
+        """
+        return self._scene is None
+
+    @property
+    def background_color(self):
+        if self._scene is None:
+            return QColor(self._background_color)
+        return self._scene.backgroundBrush().color()
+
+    @background_color.setter
+    def background_color(self, color):
+        self._background_color = QColor(color)
+        if self._scene is not None:
+            self._scene.setBackgroundBrush(self._background_color)
+
     @property
     def nxgraph(self):
         return self._nxgraph
 
+    @property
+    def positions(self):
+        """Read-only (N, 2) array of node positions.
+
+        The i-th row is the position of the i-th node in nodes,
+        and the array reflects the nodes moved after it is taken.
+        Use set_positions() to move the nodes.
+        """
+        return self._positions.array
+
+    def set_positions(self, positions):
+        """Move all nodes at once.
+
+        The coordinates are applied in a single pass, and the geometry
+        of each edge incident to the nodes is recomputed only once.
+
+        Args:
+            positions : array-like
+                (N, 2) array of positions in the order of nodes.
+
+        Examples:
+            >>> pos = net.positions.copy()
+            >>> pos += np.random.normal(scale=5.0, size=pos.shape)
+            >>> net.set_positions(pos)
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.shape != (len(self._positions), 2):
+            raise ValueError("The shape of positions should be (%d, 2), not %s."
+                             % (len(self._positions), positions.shape))
+
+        edges = {}
+        flag = QGraphicsItem.ItemSendsGeometryChanges
+        with self.index_suspended(), self.batch():
+            for node, (x, y) in zip(self._positions.nodes, positions.tolist()):
+                # Move the node without the notification of the change,
+                # which updates the incident edges for every node.
+                node.setFlag(flag, False)
+                node.setPos(x, y)
+                node.setFlag(flag, True)
+                node._attr.set('POS_X', x, trigger=False)
+                node._attr.set('POS_Y', y, trigger=False)
+                edges.update((id(edge), edge) for edge in node.iter_edges())
+
+            self._positions.assign(positions)
+            CurvedEdge.update_edges(edges.values())
+
+            if self._scene is not None:
+                self._scene.invalidate()
+
+    @contextmanager
+    def batch(self):
+        """Suspend the per-item invalidation of the scene.
+
+        Invalidations of the scene and geometry updates of edges are queued
+        while styling or moving the items of this network, and
+        they are processed once at the end of the outermost batch.
+        The geometry of an edge should not be read inside the batch,
+        because it is updated only when the batch is finished.
+
+        Examples:
+            >>> with net.batch():
+            ...     for node in net.nodes.values():
+            ...         node["FILL_COLOR"] = Qt.red
+        """
+        if self._scene is None:
+            yield self
+            return
+
+        with self._scene.batch():
+            yield self
+
+    @contextmanager
+    def index_suspended(self):
+        """Suspend the spatial index of the scene.
+
+        The index is rebuilt once after the outermost context,
+        instead of being updated for every moved item.
+
+        Examples:
+            >>> with net.index_suspended():
+            ...     for pos in frames:
+            ...         net.set_positions(pos)
+            ...         app.processEvents()
+        """
+        if self._scene is None:
+            yield self
+            return
+
+        with self._scene.index_suspended():
+            yield self
+
+    def _materialize_scene(self):
+        """Create the scene and add the items that have been added so far.
+        """
+        scene = GraphicsScene()
+        scene.setBackgroundBrush(self._background_color)
+        self._scene = scene
+        scene.add_items(self.edges.values())
+        scene.add_items(self.nodes.values())
+
+    def iter_materialize_scene(self, chunk_size=PROGRESS_INTERVAL):
+        """Create the scene adding the items chunk by chunk.
+
+        This generator yields after each chunk of items, so the caller can
+        process the events of GUI between the chunks or stop
+        the materialization. The scene is attached to this network
+        only after all items are added.
+
+        Yields:
+            (num_added, total) : the numbers of items added and all items.
+        """
+        if self._scene is not None:
+            return
+
+        items = list(self.edges.values()) + list(self.nodes.values())
+        total = len(items)
+
+        scene = GraphicsScene()
+        scene.setBackgroundBrush(self._background_color)
+
+        end = 0
+        try:
+            # The index is rebuilt once after all chunks.
+            with scene.index_suspended():
+                for i in range(0, total, chunk_size):
+                    end = min(i + chunk_size, total)
+                    scene.add_items(items[i:end])
+                    yield end, total
+        except BaseException:
+            # The scene deletes its items when it is destroyed,
+            # so the items added so far are taken back, including
+            # those of a chunk that has failed partway.
+            for item in items[:end]:
+                if item.scene() is scene:
+                    scene.removeItem(item)
+            raise
+
+        self._scene = scene
+
+    def _add_to_scene(self, item):
+        if self._scene is not None:
+            self._scene.addItem(item)
+
+    def _remove_from_scene(self, item):
+        if self._scene is not None:
+            self._scene.removeItem(item)
+        else:
+            item.setParentItem(None)
+
     def _trigger_set_name(self, key, value):
         self._name = value
         if self._item:
@@ -80,18 +282,112 @@ class Network(MappableItem):
 
         return value
 
+    @trigger('BACKGROUND_COLOR')
     def _trigger_set_background_color(self, key, value):
-        self._background_color = QColor(value)
-        self.scene.setBackgroundBrush(self._background_color)
+        self.background_color = value
         return self._background_color.name(QColor.HexArgb)
 
+    def set_node_attr(self, key, values):
+        """Assign an attribute of all nodes at once.
+
+        Args:
+            key : str
+                Attribute key (e.g., 'FILL_COLOR', 'WIDTH').
+            values : array-like, dict or scalar
+                Values in the order of nodes, a dict of values keyed by
+                node identities, or a single value assigned to all nodes.
+                An (N, 3) or (N, 4) array of RGB(A) integers is converted to
+                colors for the keys of colors (e.g., 'FILL_COLOR').
+
+        Examples:
+            >>> rgba = np.zeros((len(net.nodes), 4), dtype=np.uint8)
+            >>> rgba[:, 0] = (255 * s).astype(np.uint8)
+            >>> rgba[:, 3] = 255
+            >>> net.set_node_attr('FILL_COLOR', rgba)
+            >>> net.set_node_attr('WIDTH', 20 + 50 * s)
+        """
+        self._set_items_attr(self.nodes, key, values)
+
+    def set_edge_attr(self, key, values):
+        """Assign an attribute of all edges at once.
+
+        The values are given in the same manner as set_node_attr(),
+        in the order of edges.
+        """
+        self._set_items_attr(self.edges, key, values)
+
+    def set_label_attr(self, key, values):
+        """Assign an attribute of all labels at once.
+
+        The values are given in the same manner as set_node_attr(),
+        in the order of labels.
+        """
+        self._set_items_attr(self.labels, key, values)
+
+    def _set_items_attr(self, items, key, values):
+        if isinstance(values, dict):
+            with self.batch():
+                for iden, value in values.items():
+                    items[iden][key] = _to_attr_value(key, value)
+            return
+
+        if not isinstance(values, (np.ndarray, list, tuple)):
+            value = _to_attr_value(key, values)
+            with self.batch():
+                for item in items.values():
+                    item[key] = value
+            return
+
+        if len(values) != len(items):
+            raise ValueError("The number of values (%d) should be "
+                             "the number of items (%d)." % (len(values), len(items)))
+
+        if isinstance(values, np.ndarray):
+            if key.endswith('COLOR') and values.ndim == 2 and values.shape[1] in (3, 4):
+                values = [QColor(*rgba) for rgba in values.astype(int).tolist()]
+            else:
+                values = values.tolist()
+
+        with self.batch():
+            for item, value in zip(items.values(), values):
+                item[key] = _to_attr_value(key, value)
+
+    def _add_position(self, node):
+        node_old = self.nodes.get(node.iden)
+        if node_old is None:
+            self._positions.add(node)
+        elif node_old is not node:
+            self._positions.replace(node_old, node)
+
     def add_node(self, node):
         node.setZValue(0)
+        self._add_position(node)
         self.nodes[node.iden] = node
-        self.scene.addItem(node)
+        self._add_to_scene(node)
         self.nxgraph.add_node(node.iden)
         self.nxgraph.nodes[node.iden]['GRAPHICS'] = node
 
+    def add_nodes(self, nodes):
+        """Add multiple nodes at once.
+
+        Args:
+            nodes : iterable
+                Node objects derived from nezzle.graphics.BaseNode.
+
+        Returns:
+            None
+        """
+        nodes = list(nodes)
+        for node in nodes:
+            node.setZValue(0)
+            self._add_position(node)
+            self.nodes[node.iden] = node
+
+        if self._scene is not None:
+            self._scene.add_items(nodes)
+        self.nxgraph.add_nodes_from((node.iden, {'GRAPHICS': node})
+                                    for node in nodes)
+
     def remove_node(self, obj):
         if isinstance(obj, BaseNode):
             iden = obj.iden
@@ -99,16 +395,16 @@ class Network(MappableItem):
             iden = obj
 
         node = self.nodes[iden]
-        while node.edges:
-            edge = node.edges.pop()
+        for edge in node.edges:
             self.remove_edge(edge)
 
-        self.scene.removeItem(node)
+        self._remove_from_scene(node)
+        self._positions.remove(node)
         del self.nodes[iden]
 
     def replace_node(self, old_node, new_node):
-        while old_node.edges:
-            edge = old_node.edges.pop()  # Remove all edges from old node
+        for edge in old_node.edges:
+            old_node.remove_edge(edge)  # Remove all edges from old node
 
             if isinstance(edge, SelfloopEdge):
                 edge.node = new_node
@@ -123,7 +419,7 @@ class Network(MappableItem):
                 new_node.add_edge(edge)
             else:
                 raise RuntimeError("[SYSTEM] this point should not be reached!")
-        # end of while
+        # end of for
 
         # Add the new node.
         self.add_node(new_node)
@@ -133,7 +429,7 @@ class Network(MappableItem):
             child.setParentItem(new_node)
 
         # Remove the old node from the scene.
-        self.scene.removeItem(old_node)
+        self._remove_from_scene(old_node)
 
     def replace_edge(self, old_edge, new_edge):
 
@@ -158,8 +454,8 @@ class Network(MappableItem):
 
         old_edge.setZValue(-1)
         new_edge.setZValue(-1)
-        self.scene.removeItem(old_edge)
-        self.scene.addItem(new_edge)
+        self._remove_from_scene(old_edge)
+        self._add_to_scene(new_edge)
         new_edge.update()
 
     def add_edge(self, edge):
@@ -175,17 +471,39 @@ class Network(MappableItem):
 
         edge.setZValue(-1)
         self.edges[edge.iden] = edge
-        self.scene.addItem(edge)
-
-        if isinstance(edge, SelfloopEdge):
-            iden_src = iden_trg = edge.node.iden
-        else:
-            iden_src = edge.source.iden
-            iden_trg = edge.target.iden
+        self._add_to_scene(edge)
 
+        iden_src, iden_trg = self._get_edge_endpoints(edge)
         self.nxgraph.add_edge(iden_src, iden_trg)
         self.nxgraph[iden_src][iden_trg]['GRAPHICS'] = edge
 
+    def add_edges(self, edges):
+        """Add multiple edges at once.
+
+        Args:
+            edges : iterable
+                Edge objects derived from nezzle.graphics.BaseEdge.
+
+        Returns:
+            None
+        """
+        edges = list(edges)
+        for edge in edges:
+            edge.setZValue(-1)
+
+        self.edges.update((edge.iden, edge) for edge in edges)
+        if self._scene is not None:
+            self._scene.add_items(edges)
+        self.nxgraph.add_edges_from((*self._get_edge_endpoints(edge),
+                                     {'GRAPHICS': edge})
+                                    for edge in edges)
+
+    def _get_edge_endpoints(self, edge):
+        if isinstance(edge, SelfloopEdge):
+            return edge.node.iden, edge.node.iden
+
+        return edge.source.iden, edge.target.iden
+
     def remove_edge(self, obj):
         if isinstance(obj, BaseEdge):
             iden = obj.iden
@@ -193,8 +511,8 @@ class Network(MappableItem):
             iden = obj
 
         edge = self.edges[iden]
-        self.scene.removeItem(edge)
-        if isinstance(obj, SelfloopEdge):
+        self._remove_from_scene(edge)
+        if isinstance(edge, SelfloopEdge):
             self.nxgraph.remove_edge(edge.node.iden, edge.node.iden)
             edge.node.remove_edge(edge)
         else:
@@ -209,34 +527,102 @@ class Network(MappableItem):
         self.nxgraph.labels[label.iden] = {}
         self.nxgraph.labels[label.iden]['GRAPHICS'] = label
 
+    def add_labels(self, labels):
+        """Add multiple labels at once.
+
+        Labels are added to the scene together with their parent items.
+        """
+        labels = list(labels)
+        self.labels.update((label.iden, label) for label in labels)
+        self.nxgraph.labels.update((label.iden, {'GRAPHICS': label})
+                                   for label in labels)
+
     def remove_label(self, obj):
         if isinstance(obj, TextLabel):
             iden = obj.iden
         elif isinstance(obj, str):
             iden = obj
 
-        self.scene.removeItem(self.labels[iden])
+        self._remove_from_scene(self.labels[iden])
         del self.labels[iden]
 
-    def copy(self):
-        net = self.from_dict(self.to_dict())
+    def copy(self, cow=False):
+        """Copy this network without the dict round-trip.
+
+        The nodes, edges and labels are cloned directly from their
+        attributes and Qt value objects, and the data of nxgraph
+        are copied shallowly.
+
+        Args:
+            cow : bool
+                If True, the attribute storage of each item is shared
+                with the copied item until either of them is modified
+                (copy-on-write). This is useful for taking many snapshots
+                of a network that are rarely modified.
+        """
+        net = type(self)(self.iden, name=self.name, headless=self.is_headless)
+        net.background_color = self.background_color
+        net._attr.data = dict(self._attr.data)
+
+        dict_graphics = {}
+        list_nodes = []
+        list_edges = []
+        list_labels = []
+
+        for iden, node in self.nodes.items():
+            node_new = node.copy(cow=cow)
+            dict_graphics[iden] = node_new
+            list_nodes.append(node_new)
+
+        for iden, edge in self.edges.items():
+            if isinstance(edge, SelfloopEdge):
+                node = dict_graphics[edge.node.iden]
+                edge_new = edge.copy(node, cow=cow)
+            else:
+                src = dict_graphics[edge.source.iden]
+                trg = dict_graphics[edge.target.iden]
+                edge_new = edge.copy(src, trg, cow=cow)
+
+            dict_graphics[iden] = edge_new
+            list_edges.append(edge_new)
+
+        for label in self.labels.values():
+            parent = dict_graphics[label.parentItem().iden]
+            list_labels.append(label.copy(parent, cow=cow))
+
+        net.add_edges(list_edges)
+        net.add_labels(list_labels)
+        net.add_nodes(list_nodes)
+
+        for iden, data in self.nxgraph.nodes(data=True):
+            net.nxgraph.nodes[iden].update(
+                (key, val) for key, val in data.items() if key != 'GRAPHICS')
+
+        for u, v, data in self.nxgraph.edges(data=True):
+            net.nxgraph.edges[u, v].update(
+                (key, val) for key, val in data.items() if key != 'GRAPHICS')
+
         return net
 
 
-    def to_dict(self):
+    def to_header_dict(self):
+        """Get the dict of network without the nodes, edges and labels.
+        """
         dict_net = {}
 
         # TODO: Use a global variable for setting the version
         dict_net["NEZZLE_VERSION"] = tuple(nezzle.__version__.split('.'))
         dict_net["NAME"] = self.name
 
-        bg_color = self.scene.backgroundBrush().color()
+        bg_color = self.background_color
         dict_net["BACKGROUND_COLOR"] = bg_color.name(QColor.HexArgb)
 
-        dict_net["NODES"] = []
-        dict_net["EDGES"] = []
-        dict_net["LABELS"] = []
+        dict_net.update(self._attr)
+        return dict_net
 
+    def iter_node_dicts(self):
+        """Iterate the dicts of nodes, which are created one at a time.
+        """
         for iden, node in self.nodes.items():
             dict_node = node.to_dict()
             dict_node = {key: val for key, val in dict_node.items() if not key.startswith("_")}
@@ -247,57 +633,81 @@ class Network(MappableItem):
             data.pop('GRAPHICS')
             dict_node['NXGRAPH'] = data
 
-            dict_net["NODES"].append(dict_node)
+            yield dict_node
 
+    def iter_edge_dicts(self):
+        """Iterate the dicts of edges, which are created one at a time.
+        """
         for iden, edge in self.edges.items():
             dict_edge = edge.to_dict()
             dict_edge = {key: val for key, val in dict_edge.items() if not key.startswith("_")}
 
             # Update edge data from nxgraph.
-            u = edge.source.iden
-            v = edge.target.iden
+            u, v = self._get_edge_endpoints(edge)
             data = self.nxgraph.edges[u, v]
             data = data.copy()
             data.pop('GRAPHICS')
             dict_edge["NXGRAPH"] = data
 
-            dict_net["EDGES"].append(dict_edge)
+            yield dict_edge
 
+    def iter_label_dicts(self):
+        """Iterate the dicts of labels, which are created one at a time.
+        """
         for iden, label in self.labels.items():
             dict_label = label.to_dict()
             dict_label = {key: val for key, val in dict_label.items() if not key.startswith("_")}
-            dict_net["LABELS"].append(dict_label)
+            yield dict_label
 
-        dict_net.update(self._attr)
+    def to_dict(self):
+        dict_net = self.to_header_dict()
+        dict_net["NODES"] = list(self.iter_node_dicts())
+        dict_net["EDGES"] = list(self.iter_edge_dicts())
+        dict_net["LABELS"] = list(self.iter_label_dicts())
         return dict_net
 
     @classmethod
-    def from_dict(cls, dict_net):
+    def from_dict(cls, dict_net, headless=False, progress=None):
         """
         Adding objects should be in the following order:
 
             Edge -> Node -> Label
 
         This order prevents an abnormal visualization.
+
+        The progress is reported as progress("build", num_built, total)
+        for every PROGRESS_INTERVAL items if the callback is given.
         """
         # TODO: Using Z-value for maintaining the order.
 
-        net = cls(dict_net['ID'])
+        net = cls(dict_net['ID'], headless=headless)
         net.name = dict_net['NAME']
 
         bg_color_rgb = dict_net["BACKGROUND_COLOR"]
         bg_color = QColor(bg_color_rgb)
-        net.scene.setBackgroundBrush(bg_color)
+        net.background_color = bg_color
 
         list_nodes = []
+        list_edges = []
+        list_labels = []
         dict_graphics = {}
 
+        total = len(dict_net["NODES"]) + len(dict_net["EDGES"]) \
+                + len(dict_net["LABELS"])
+        num_built = 0
+
+        def report_progress():
+            if progress and num_built % PROGRESS_INTERVAL == 0:
+                progress("build", num_built, total)
+
         for dict_node in dict_net["NODES"]:
             item_type = dict_node.pop('ITEM_TYPE')
             NodeClass = NodeClassFactory.create(item_type)
             node = NodeClass.from_dict(dict_node)
             dict_graphics[node.iden] = node
             list_nodes.append(node)
+            num_built += 1
+            report_progress()
 
         for dict_edge in dict_net["EDGES"]:
             item_type = dict_edge.pop("ITEM_TYPE")
@@ -315,7 +725,12 @@ class Network(MappableItem):
                 edge = EdgeClass.from_dict(dict_edge, src, trg)
 
             dict_graphics[edge.iden] = edge
-            net.add_edge(edge)
+            list_edges.append(edge)
+            num_built += 1
+            report_progress()
+
+        net.add_edges(list_edges)
+        for edge in list_edges:
             edge.update()
 
         for dict_label in dict_net["LABELS"]:
@@ -324,10 +739,12 @@ class Network(MappableItem):
             parent = dict_graphics[iden_parent]
             LabelClass = LabelClassFactory.create(item_type)
             label = LabelClass.from_dict(dict_label, parent)
-            net.add_label(label)
+            list_labels.append(label)
+            num_built += 1
+            report_progress()
 
-        for node in list_nodes:
-            net.add_node(node)
+        net.add_labels(list_labels)
+        net.add_nodes(list_nodes)
 
         for iden, node in net.nodes.items():
             if 'NXGRAPH' in node:
@@ -337,10 +754,12 @@ class Network(MappableItem):
         for iden, edge in net.edges.items():
             if 'NXGRAPH' in edge:
                 data = edge.pop('NXGRAPH', {})
-                u = edge.source.iden
-                v = edge.target.iden
+                u, v = net._get_edge_endpoints(edge)
                 net.nxgraph.edges[u, v].update(data)
 
+        if progress:
+            progress("build", total, total)
+
         return net
 # end of class Network
 
@@ -1,6 +1,9 @@
+from qtpy.QtCore import Qt
 from qtpy.QtCore import QRectF
 from qtpy.QtWidgets import QGraphicsItem
+from qtpy.QtWidgets import QStyle
 
+from nezzle.utils import trigger
 from nezzle.graphics import PainterOptionItem
 
 
@@ -8,14 +11,19 @@ class BaseNode(PainterOptionItem):
 
     ITEM_TYPE = 'NODE'
 
+    # PositionStore of the network that this node belongs to.
+    _position_store = None
+
     def __init__(self, iden, width, height, *args, **kwargs):
         super().__init__(iden, *args, **kwargs)
         self._iden = iden
         self._brect = QRectF()
-        self._edges = []
 
-        self._attr.set_trigger('WIDTH', self._trigger_set_width)
-        self._attr.set_trigger('HEIGHT', self._trigger_set_height)
+        # Incident edges are indexed by their ids,
+        # since graphics items are not hashable.
+        self._edges = {}
+        self._in_edges = {}
+        self._out_edges = {}
 
         self.width = width
         self.height = height
@@ -37,7 +45,23 @@ class BaseNode(PainterOptionItem):
 
     @property
     def edges(self):
-        return self._edges
+        return list(self._edges.values())
+
+    @property
+    def in_edges(self):
+        """Edges whose target is this node."""
+        return list(self._in_edges.values())
+
+    @property
+    def out_edges(self):
+        """Edges whose source is this node."""
+        return list(self._out_edges.values())
+
+    def iter_edges(self):
+        """Iterate the incident edges without copying them into a list.
+           The edges should not be added or removed during the iteration.
+        """
+        return iter(self._edges.values())
 
     @property
     def width(self):
@@ -60,9 +84,11 @@ class BaseNode(PainterOptionItem):
 
     def gather_children(self):
         children = super().gather_children()
-        for edge in self.edges:
+        ids = {id(child) for child in children}
+        for edge in self.iter_edges():
             for child in edge.childItems():
-                if child not in children:
+                if id(child) not in ids:
+                    ids.add(id(child))
                     children.append(child)
 
         return children
@@ -75,14 +101,22 @@ class BaseNode(PainterOptionItem):
 
         return rect
 
+    def _paint_simplified(self, painter, option):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(self._brect, Qt.green)
+        else:
+            painter.fillRect(self._brect, self._color)
+
     def update(self, *args, **kwargs):
-        for edge in self._edges:
+        for edge in self._edges.values():
             edge.update()
         self._invalidate()
         return super().update(*args, **kwargs)
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemPositionHasChanged:
+            if self._position_store is not None:
+                self._position_store.update(self)
             self.update()
         elif change == QGraphicsItem.ItemSelectedHasChanged:
             self.update()
@@ -90,28 +124,55 @@ class BaseNode(PainterOptionItem):
         return super().itemChange(change, value)
 
     def has_edge(self, edge):
-        return edge in self._edges
+        return id(edge) in self._edges
 
     def add_edge(self, edge):
-        if self.has_edge(edge):
-            return
-        self._edges.append(edge)
+        key = id(edge)
+        self._edges[key] = edge
+        if getattr(edge, '_source', None) is self:
+            self._out_edges[key] = edge
+        if getattr(edge, '_target', None) is self:
+            self._in_edges[key] = edge
 
     def remove_edge(self, edge):
-        if edge in self._edges:
-            self._edges.remove(edge)
+        key = id(edge)
+        self._edges.pop(key, None)
+        self._in_edges.pop(key, None)
+        self._out_edges.pop(key, None)
+
+    def copy(self, cow=False):
+        """Copy this node without the dict round-trip.
+
+        Args:
+            cow : bool
+                If True, the attribute storage is shared with this node
+                until either of them is modified (copy-on-write).
+        """
+        obj = self._create_instance()
+        obj._copy_state(self, cow=cow)
+        return obj
+
+    def _create_instance(self):
+        return type(self)(iden=self.iden, width=self.width, height=self.height)
 
-    def copy(self):
-        return self.from_dict(self.to_dict())
+    def _copy_state(self, other, cow=False):
+        self._width = other._width
+        self._height = other._height
+        self._brect = QRectF(other._brect)
+        super()._copy_state(other, cow=cow)
 
+    @trigger('WIDTH')
     def _trigger_set_width(self, key, value):
+        self.prepareGeometryChange()
         self._width = value
         self._brect.setX(-value / 2)
         self._brect.setWidth(value)
         self.update()
         return value
 
+    @trigger('HEIGHT')
     def _trigger_set_height(self, key, value):
+        self.prepareGeometryChange()
         self._height = value
         self._brect.setY(-value / 2)
         self._brect.setHeight(value)
@@ -2,6 +2,7 @@ import math
 
 from qtpy.QtGui import QPainterPath
 
+from nezzle.utils import trigger
 from nezzle.graphics.mixins import Lockable
 from nezzle.graphics.nodes.basenode import BaseNode
 
@@ -22,6 +23,9 @@ class EllipseNode(BaseNode):
         return path
 
     def paint(self, painter, option, widget):
+        if self._is_simplified('node', painter, option, widget):
+            return self._paint_simplified(painter, option)
+
         super().paint(painter, option, widget)
         painter.drawEllipse(self._brect)
 
@@ -41,11 +45,11 @@ class CircleNode(EllipseNode):
 
     def __init__(self, iden, radius, *args, **kwargs):
         super().__init__(iden, width=2*radius, height=2*radius, *args, **kwargs)
-        self._attr.set_trigger('RADIUS', self._trigger_set_radius)
         self._attr['RADIUS'] = radius
         assert self.width == self.height
     # end of def __init__
 
+    @trigger('RADIUS')
     def _trigger_set_radius(self, key, value):
         diameter = 2*value
         self._attr['WIDTH'] = diameter
@@ -79,6 +83,9 @@ class CircleNode(EllipseNode):
     def calculate_radius(self, angle=None):
         return self.radius
 
+    def _create_instance(self):
+        return type(self)(iden=self.iden, radius=self.radius)
+
     @classmethod
     def from_dict(cls, attr):
         iden = attr.pop('ID')
@@ -0,0 +1,70 @@
+import numpy as np
+
+
+class PositionStore(object):
+    """Positions of nodes in a contiguous (N, 2) array.
+
+    Each node occupies a row of the array in the order of addition,
+    and nodes write their positions to the row when they are moved.
+    Removing a node shifts the rows below it, so the order of rows
+    is always the order of the remaining nodes.
+    """
+
+    def __init__(self, capacity=64):
+        self._array = np.zeros((capacity, 2), dtype=np.float64)
+        self._nodes = []
+        self._rows = {}  # id(node) -> row
+
+    def __len__(self):
+        return len(self._nodes)
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def array(self):
+        """Read-only view of the positions (N, 2)."""
+        view = self._array[:len(self._nodes)]
+        view.flags.writeable = False
+        return view
+
+    def index(self, node):
+        return self._rows[id(node)]
+
+    def add(self, node):
+        n = len(self._nodes)
+        if n == self._array.shape[0]:
+            array = np.zeros((2 * n, 2), dtype=np.float64)
+            array[:n] = self._array
+            self._array = array
+
+        self._array[n] = node.x(), node.y()
+        self._nodes.append(node)
+        self._rows[id(node)] = n
+        node._position_store = self
+
+    def remove(self, node):
+        row = self._rows.pop(id(node))
+        n = len(self._nodes)
+        self._array[row:n - 1] = self._array[row + 1:n]
+        del self._nodes[row]
+        for i in range(row, n - 1):
+            self._rows[id(self._nodes[i])] = i
+
+        node._position_store = None
+
+    def replace(self, old_node, new_node):
+        row = self._rows.pop(id(old_node))
+        old_node._position_store = None
+
+        self._array[row] = new_node.x(), new_node.y()
+        self._nodes[row] = new_node
+        self._rows[id(new_node)] = row
+        new_node._position_store = self
+
+    def update(self, node):
+        self._array[self._rows[id(node)]] = node.x(), node.y()
+
+    def assign(self, positions):
+        self._array[:len(self._nodes)] = positions
@@ -1,6 +1,7 @@
 import math
 from qtpy.QtGui import QPainterPath
 
+from nezzle.utils import trigger
 from nezzle.graphics.mixins import Lockable
 from nezzle.graphics.nodes.basenode import BaseNode
 
@@ -21,6 +22,9 @@ class RectangleNode(BaseNode):
         return path
 
     def paint(self, painter, option, widget):
+        if self._is_simplified('node', painter, option, widget):
+            return self._paint_simplified(painter, option)
+
         super().paint(painter, option, widget)
         painter.drawRect(self._brect)
 
@@ -40,11 +44,11 @@ class SquareNode(RectangleNode):
 
     def __init__(self, iden, radius, *args, **kwargs):
         super().__init__(iden, width=2*radius, height=2*radius, *args, **kwargs)
-        self._attr.set_trigger('RADIUS', self._trigger_set_radius)
         self._attr['RADIUS'] = radius
         assert self.width == self.height
     # end of def __init__
 
+    @trigger('RADIUS')
     def _trigger_set_radius(self, key, value):
         diameter = 2*value
         self._attr['WIDTH'] = diameter
@@ -78,6 +82,9 @@ class SquareNode(RectangleNode):
     def calculate_radius(self, angle=None):
         return self.radius
 
+    def _create_instance(self):
+        return type(self)(iden=self.iden, radius=self.radius)
+
     @classmethod
     def from_dict(cls, attr):
         iden = attr.pop('ID')
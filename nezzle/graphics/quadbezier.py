@@ -9,7 +9,9 @@ by Gabriel Suchowolski, Jul 10, 2012
 http://microbians.com/?page=math&id=math-quadraticbezieroffseting
 """
 
+import math
 from typing import Union
+
 import numpy as np
 # from cachetools import cached
 
@@ -20,6 +22,7 @@ from nezzle.utils import dot
 from nezzle.utils import length
 from nezzle.utils import internal_division
 from nezzle.utils import solve_cubic
+from nezzle.utils import solve_cubic_batch
 from nezzle.utils import rotate
 
 
@@ -270,4 +273,329 @@ def identify_dp(ap, p1, p2, width, angle_sign):
     m2 = rotate(ap, p2, -angle_sign*90, 1.0) - ap
     m = m1 + m2
     k = m*width/dot(m, m)
-    return ap + k
\ No newline at end of file
+    return ap + k
+
+"""
+Batched versions of the above functions for many curves at once.
+
+The control points of E curves are given as an (E, 3, 2) array,
+where cps[i] = [p0, pc, p2] of the i-th curve, and the results
+are returned as NumPy arrays instead of QPointF objects.
+"""
+
+def _arc_length_coeff_batch(cps: np.ndarray) -> np.ndarray:
+    p = cps[:, 1, 0] - cps[:, 0, 0]
+    q = cps[:, 2, 0] - cps[:, 1, 0]
+    r = cps[:, 1, 1] - cps[:, 0, 1]
+    s = cps[:, 2, 1] - cps[:, 1, 1]
+
+    return np.array([(p - q) ** 2 + (r - s) ** 2,
+                     -2 * ((p - q) * p + (r - s) * r),
+                     p ** 2 + r ** 2])
+
+
+def arc_length_batch(cps: np.ndarray,
+                     lower: Union[np.ndarray, float],
+                     upper: Union[np.ndarray, float]) -> np.ndarray:
+    """
+    The arc lengths of quadratic Bezier curves, given the bounds of t.
+
+    Args:
+        cps: (E, 3, 2) array of the control points.
+        lower: The lower bounds, broadcastable to (E,) or (E, T).
+        upper: The upper bounds, broadcastable to (E,) or (E, T).
+    """
+    coeff = _arc_length_coeff_batch(cps)
+    ndim = max(np.ndim(lower), np.ndim(upper), 1)
+    coeff = coeff.reshape(coeff.shape + (1,) * (ndim - 1))
+
+    return 2 * _integrate_sqrt_quad(coeff, lower, upper)
+
+
+def point_at_batch(cps: np.ndarray, t: np.ndarray) -> np.ndarray:
+    """
+    The points of quadratic Bezier curves at the parameters, t (E,).
+    """
+    t = t[:, None]
+    return (1-t)**2*cps[:, 0] + 2*(1-t)*t*cps[:, 1] + t**2*cps[:, 2]
+
+
+def nearest_point_batch(cps: np.ndarray, pa: np.ndarray):
+    """
+    Find the nearest points of quadratic Bezier curves
+    from the arbitrary points, pa (E, 2).
+
+    Returns:
+        (pt, t): The nearest points (E, 2) and their parameters (E,).
+            The parameter is NaN or out of [0, 1] for a degenerate curve,
+            for which nearest_point() raises FloatingPointError.
+    """
+    coords = 1e8*np.stack([cps[:, 0], cps[:, 2], cps[:, 1], pa], axis=1)
+    mean = coords.mean(axis=1, keepdims=True)
+    sv = coords.std(axis=1, keepdims=True)
+    sv[sv == 0] = 1.0
+
+    p1_scaled, p2_scaled, pc_scaled, pa_scaled = \
+        np.moveaxis((coords - mean) / sv, 1, 0)
+
+    v0 = pc_scaled - p1_scaled
+    v1 = p2_scaled - pc_scaled
+    v3 = pa_scaled - p1_scaled
+    diff_v1v0 = v1 - v0
+
+    sq_v0 = (v0 * v0).sum(axis=1)
+    a = (diff_v1v0 * diff_v1v0).sum(axis=1)
+    b = 3*((v1 * v0).sum(axis=1) - sq_v0)
+    c = 2*sq_v0 - (v3 * diff_v1v0).sum(axis=1)
+    d = -(v3 * v0).sum(axis=1)
+
+    t = solve_cubic_batch(a, b, c, d)
+    return point_at_batch(cps, t), t
+
+
+def _internal_division_batch(p1, p2, t):
+    t = t[:, None]
+    return (1 - t)*p1 + t*p2
+
+
+def identify_sps_batch(cps: np.ndarray):
+    """
+    Identify the sub-control points of quadratic Bezier curves.
+
+    Returns:
+        (sps, valid): The sub-control points (E, 9, 2) and
+            a boolean array (E,) indicating whether the subdivision
+            of each curve is valid.
+    """
+    pt0 = cps[:, 0]
+    pc = cps[:, 1]
+    pt4 = cps[:, 2]
+
+    with np.errstate(all='ignore'):
+        pt2, t2 = nearest_point_batch(cps, pc)
+
+        # Control points of subdivision
+        p11 = _internal_division_batch(pt0, pc, t2)
+        p12 = _internal_division_batch(pc, pt4, t2)
+
+        pt1, t1 = nearest_point_batch(np.stack([pt0, p11, pt2], axis=1), p11)
+        pt3, t3 = nearest_point_batch(np.stack([pt2, p12, pt4], axis=1), p12)
+
+        c01 = _internal_division_batch(pt0, p11, t1)
+        c12 = _internal_division_batch(p11, pt2, t1)
+        c23 = _internal_division_batch(pt2, p12, t3)
+        c34 = _internal_division_batch(p12, pt4, t3)
+
+        sps = np.stack([pt0, c01, pt1, c12, pt2, c23, pt3, c34, pt4], axis=1)
+
+    ts = np.stack([t1, t2, t3], axis=1)
+    valid = ((ts >= 0) & (ts <= 1)).all(axis=1) \
+            & np.isfinite(sps).all(axis=(1, 2))
+
+    return sps, valid
+
+
+def _rotate_batch(ap, rp, sign, tlen):
+    """Rotate points by 90 degrees (sign=1) or -90 degrees (sign=-1)
+    with respect to the axis points, and scale them to the target length.
+    """
+    v = rp - ap
+    len_v = np.sqrt((v * v).sum(axis=-1, keepdims=True))
+    v_rotated = sign * np.stack([-v[..., 1], v[..., 0]], axis=-1)
+    with np.errstate(all='ignore'):
+        tp = ap + v_rotated * (tlen / len_v)
+
+    return np.where(len_v == 0, rp, tp)
+
+
+def identify_qps_batch(sps: np.ndarray, width: Union[np.ndarray, float]):
+    """
+    Identify Q points of quadratic Bezier curves with the widths.
+
+    Returns:
+        (qps_top, qps_bottom): (E, 5, 2) arrays.
+    """
+    half_width = np.reshape(np.asarray(width, dtype=np.float64) / 2, (-1, 1, 1))
+
+    p = sps[:, 0:-1:2]
+    cp = sps[:, 1::2]
+    qps_top = _rotate_batch(p, cp, -1, half_width)
+    qps_bottom = _rotate_batch(p, cp, 1, half_width)
+
+    q_top = _rotate_batch(sps[:, -1:], sps[:, -2:-1], 1, half_width)
+    q_bottom = _rotate_batch(sps[:, -1:], sps[:, -2:-1], -1, half_width)
+
+    return (np.concatenate([qps_top, q_top], axis=1),
+            np.concatenate([qps_bottom, q_bottom], axis=1))
+
+
+def identify_dps_batch(sps: np.ndarray, width: Union[np.ndarray, float]):
+    """
+    Identify D points of quadratic Bezier curves with the widths.
+
+    Returns:
+        (dps_top, dps_bottom): (E, 4, 2) arrays.
+    """
+    width = np.reshape(np.asarray(width, dtype=np.float64), (-1, 1, 1))
+
+    p1 = sps[:, 0:-1:2]
+    cp = sps[:, 1::2]
+    p2 = sps[:, 2::2]
+
+    dps = []
+    for sign in (1, -1):
+        m = _rotate_batch(cp, p1, sign, 1.0) + _rotate_batch(cp, p2, -sign, 1.0) - 2*cp
+        with np.errstate(all='ignore'):
+            k = m*width/(m * m).sum(axis=-1, keepdims=True)
+        dps.append(cp + k)
+
+    return dps[0], dps[1]
+
+
+def solve_arc_length_batch(cps: np.ndarray,
+                           arc_len: np.ndarray,
+                           lower: float = 0.5,
+                           rtol: float = 1e-6,
+                           max_iter: int = 30) -> np.ndarray:
+    """
+    Find the parameters, t, where the arc lengths from t to the ends
+    of quadratic Bezier curves are the given lengths.
+
+    The arc length, L(t), is monotonically decreasing in [lower, 1],
+    and L(t) = arc_len is solved by Newton's method on the analytic
+    integral, safeguarded by bisection in the bracket [lower, 1].
+    It converges in a few iterations for most curves.
+
+    Args:
+        cps: (E, 3, 2) array of the control points.
+        arc_len: The arc lengths from t to the ends of curves (E,).
+        lower: The lower bound of t.
+        rtol: The tolerance of the arc length relative to the length.
+        max_iter: The maximum number of iterations.
+
+    Returns:
+        t: The parameters (E,). If a curve is shorter than the length
+            in [lower, 1], t is lower when the shortage is within 5%,
+            otherwise t is 1. t is NaN for a degenerate curve
+            whose arc length cannot be calculated.
+    """
+    arc_len = np.asarray(arc_len, dtype=np.float64)
+    a, b, c = _arc_length_coeff_batch(cps)
+
+    def arc_length_to_end(t):
+        return 2 * _integrate_sqrt_quad((a, b, c), t, 1.0)
+
+    with np.errstate(all='ignore'):
+        lo = np.full(arc_len.shape, lower, dtype=np.float64)
+        hi = np.ones(arc_len.shape, dtype=np.float64)
+
+        len_lo = arc_length_to_end(lo)
+        t = hi - (hi - lo) * arc_len / len_lo  # Linear initial guess
+        t = np.clip(t, lo, hi)
+
+        done = ~(len_lo >= arc_len)
+        for _ in range(max_iter):
+            g = arc_length_to_end(t) - arc_len
+            done |= np.abs(g) <= rtol * arc_len
+            if done.all():
+                break
+
+            # g(t) is decreasing, so the root is above t if g(t) > 0.
+            above = g > 0
+            lo = np.where(above, t, lo)
+            hi = np.where(above, hi, t)
+
+            speed = 2 * np.sqrt(a*t**2 + b*t + c)
+            t_newton = t + g / speed
+            inside = (t_newton > lo) & (t_newton < hi)
+            t_next = np.where(inside, t_newton, 0.5 * (lo + hi))
+            t = np.where(done, t, t_next)
+        # end of for
+
+        short = len_lo < arc_len
+        t = np.where(short & (len_lo >= (1 - 5e-2) * arc_len), lower, t)
+        t = np.where(short & (len_lo < (1 - 5e-2) * arc_len), 1.0, t)
+        t[~np.isfinite(len_lo)] = np.nan
+
+    return t
+
+
+def solve_arc_length(x: np.ndarray,
+                     y: np.ndarray,
+                     arc_len: float,
+                     lower: float = 0.5,
+                     rtol: float = 1e-6,
+                     max_iter: int = 30) -> float:
+    """
+    Find the parameter, t, where the arc length from t to the end
+    of quadratic Bezier curve is the given length.
+
+    This is a single curve version of solve_arc_length_batch(),
+    which is written with scalar operations to avoid
+    the overhead of NumPy for a single curve.
+
+    Raises:
+        FloatingPointError: The arc length of the curve
+            cannot be calculated.
+    """
+    p = float(x[1] - x[0])
+    q = float(x[2] - x[1])
+    r = float(y[1] - y[0])
+    s = float(y[2] - y[1])
+
+    a = (p - q) ** 2 + (r - s) ** 2
+    b = -2 * ((p - q) * p + (r - s) * r)
+    c = p ** 2 + r ** 2
+
+    try:
+        sqrt_a = math.sqrt(a)
+        k1 = b / (4. * a)
+        k2 = (4 * a * c - b ** 2) / (8 * a * sqrt_a)
+
+        def antiderivative(t):
+            f = math.sqrt(max(a*t**2 + b*t + c, 0.0))
+            return (k1 + 0.5*t)*f + k2*math.log((2*a*t + b) / sqrt_a + 2*f)
+
+        F_end = antiderivative(1.0)
+
+        def arc_length_to_end(t):
+            return 2 * (F_end - antiderivative(t))
+
+        lo, hi = lower, 1.0
+        len_lo = arc_length_to_end(lo)
+        if len_lo < arc_len:
+            return lower if len_lo >= (1 - 5e-2) * arc_len else 1.0
+
+        t = hi - (hi - lo) * arc_len / len_lo  # Linear initial guess
+        for _ in range(max_iter):
+            g = arc_length_to_end(t) - arc_len
+            if abs(g) <= rtol * arc_len:
+                break
+
+            # g(t) is decreasing, so the root is above t if g(t) > 0.
+            if g > 0:
+                lo = t
+            else:
+                hi = t
+
+            t_newton = t + g / (2 * math.sqrt(a*t**2 + b*t + c))
+            t = t_newton if lo < t_newton < hi else 0.5 * (lo + hi)
+        # end of for
+    except (ValueError, ZeroDivisionError) as err:
+        raise FloatingPointError("Arc length of a degenerate curve.") from err
+
+    return t
+
+
+def identify_head_batch(cps: np.ndarray, offset: np.ndarray):
+    """
+    Identify the positions of heads in quadratic Bezier curves,
+    where the arc length from the position to the end of curve
+    is the offset.
+
+    Returns:
+        (pos, t): The positions (E, 2) and their parameters (E,).
+            The parameter is NaN if the arc length cannot be calculated.
+    """
+    t = solve_arc_length_batch(cps, offset)
+    return point_at_batch(cps, t), t
@@ -1,3 +1,6 @@
+import time
+from contextlib import contextmanager
+
 import numpy as np
 
 from qtpy.QtCore import Qt
@@ -16,6 +19,8 @@ from qtpy.QtGui import QTransform
 
 from nezzle.history import History
 from nezzle.graphics.nodes.basenode import BaseNode
+from nezzle.graphics.edges.baseedge import BaseEdge
+from nezzle.graphics.edges.curvededge import CurvedEdge
 
 
 class GraphicsView(QGraphicsView):
@@ -49,6 +54,15 @@ class GraphicsView(QGraphicsView):
         self._is_dragged = False
         self._item_clicked = None
         self._moved_by_key = False
+        self._index_suspended = False
+
+        # Levels of detail (i.e., the scale of this view) below which
+        # the items are painted in simplified forms. 0 means full fidelity,
+        # and None follows the thresholds of system state (off by default).
+        # Rendering the scene for exporting images is always full fidelity.
+        self.lod_label = None
+        self.lod_edge = None
+        self.lod_node = None
 
     @Slot()
     def on_context_menu(self, event):
@@ -102,12 +116,21 @@ class GraphicsView(QGraphicsView):
         if (event.pos() - self._pos_drag_start).manhattanLength() < 0.1: #QApplication.startDragDistance():
             return super().mouseMoveEvent(event)
 
+        if self._item_clicked and not self._index_suspended:
+            # The selected items are moved in every event of dragging.
+            self.scene().suspend_index()
+            self._index_suspended = True
+
         self._is_dragged = True
 
         self.scene().update()
         return super().mouseMoveEvent(event)
 
     def mouseReleaseEvent(self, event):
+        if self._index_suspended:
+            self.scene().resume_index()
+            self._index_suspended = False
+
         if self._item_clicked and self._is_dragged:
             items = self.scene().selected_movable_items()
             num_items = len(items)
@@ -124,6 +147,15 @@ class GraphicsView(QGraphicsView):
         self.scene().update()
         return super().mouseReleaseEvent(event)
 
+    def paintEvent(self, event):
+        scene = self.scene()
+        if scene is None or not scene.profiling:
+            return super().paintEvent(event)
+
+        t_beg = time.perf_counter()
+        super().paintEvent(event)
+        scene.record_time('paint', time.perf_counter() - t_beg)
+
     def wheelEvent(self, event):
         ad = -event.angleDelta().y()
         # factor = 1.41 ** (-ad / 240.0)
@@ -151,18 +183,21 @@ class GraphicsView(QGraphicsView):
                 items = self.scene().selected_movable_items()
                 if len(items) <= 0:
                     return
-                if event.key() == Qt.Key_Up:
-                    for item in items:
-                        item.setY(item.y() - 1)
-                elif event.key() == Qt.Key_Down:
-                    for item in items:
-                        item.setY(item.y() + 1)
-                elif event.key() == Qt.Key_Left:
-                    for item in items:
-                        item.setX(item.x() - 1)
-                elif event.key() == Qt.Key_Right:
-                    for item in items:
-                        item.setX(item.x() + 1)
+
+                # The edges shared by the moved items are updated only once.
+                with self.scene().batch():
+                    if event.key() == Qt.Key_Up:
+                        for item in items:
+                            item.setY(item.y() - 1)
+                    elif event.key() == Qt.Key_Down:
+                        for item in items:
+                            item.setY(item.y() + 1)
+                    elif event.key() == Qt.Key_Left:
+                        for item in items:
+                            item.setX(item.x() - 1)
+                    elif event.key() == Qt.Key_Right:
+                        for item in items:
+                            item.setX(item.x() + 1)
 
                 self._moved_by_key = True
             # end of if
@@ -191,13 +226,15 @@ class GraphicsView(QGraphicsView):
 
     def _set_items_pos_x(self, items, aggfunc):
         pos_x = aggfunc(self._list_pos_x(items))
-        for item in items:
-            item.setX(pos_x)
+        with self.scene().batch():
+            for item in items:
+                item.setX(pos_x)
 
     def _set_items_pos_y(self, items, aggfunc):
         pos_y = aggfunc(self._list_pos_y(items))
-        for item in items:
-            item.setY(pos_y)
+        with self.scene().batch():
+            for item in items:
+                item.setY(pos_y)
 
     def align_objects(self, direction):
         items = self.scene().selected_movable_items()
@@ -251,10 +288,28 @@ class GraphicsScene(QGraphicsScene):
     def __init__(self, *args, parent=None, **kwargs):
         super().__init__(*args, parent, **kwargs)
         self.setBackgroundBrush(Qt.transparent)
-        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+
+        # Index policy: the items are indexed by a BSP tree while the scene
+        # is static, and the index is suspended while many items are moved
+        # (e.g., dragging a selection or animating a layout).
+        # The tree is rebuilt lazily by the first query after resuming.
+        self._static_index_method = QGraphicsScene.BspTreeIndex
+        self._index_suspension = 0
+        self.setItemIndexMethod(self._static_index_method)
+
+        # Elapsed times of the queries and the painting of views.
+        self._profiling = False
+        self._index_stats = {}
 
         self._history = History(self)
 
+        # Batch mode: invalidations and geometry updates are queued
+        # and processed once when the outermost batch is finished.
+        self._batch_depth = 0
+        self._deferred_items = {}
+        self._invalidation_pending = False
+        self._flushing = False
+
     @property
     def view(self):
         return self.views()[0]
@@ -263,6 +318,192 @@ class GraphicsScene(QGraphicsScene):
     def history(self):
         return self._history
 
+    @property
+    def is_batching(self):
+        return self._batch_depth > 0
+
+    def begin_batch(self):
+        self._batch_depth += 1
+
+    def end_batch(self):
+        if self._batch_depth <= 0:
+            raise RuntimeError("end_batch() is called without begin_batch().")
+
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush_updates()
+
+    @contextmanager
+    def batch(self):
+        """Suspend the invalidation of the scene and the geometry updates
+        of items until the end of the context.
+
+        Each queued item is updated only once, and the scene is invalidated
+        only once when the outermost batch is finished.
+        """
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
+
+    @property
+    def static_index_method(self):
+        return self._static_index_method
+
+    @static_index_method.setter
+    def static_index_method(self, method):
+        """Set the index method used while the scene is static.
+
+        QGraphicsScene.BspTreeIndex (default) or QGraphicsScene.NoIndex.
+        """
+        self._static_index_method = method
+        if self._index_suspension == 0:
+            self.setItemIndexMethod(method)
+
+    @property
+    def is_index_suspended(self):
+        return self._index_suspension > 0
+
+    def suspend_index(self):
+        if self._index_suspension == 0:
+            self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self._index_suspension += 1
+
+    def resume_index(self):
+        if self._index_suspension <= 0:
+            raise RuntimeError("resume_index() is called without suspend_index().")
+
+        self._index_suspension -= 1
+        if self._index_suspension == 0:
+            self.setItemIndexMethod(self._static_index_method)
+
+    @contextmanager
+    def index_suspended(self):
+        """Suspend the spatial index of items until the end of the context.
+
+        Moving an indexed item updates the index for every move,
+        so the index is suspended while moving many items and rebuilt once
+        at the first query after the outermost context is finished.
+        """
+        self.suspend_index()
+        try:
+            yield self
+        finally:
+            self.resume_index()
+
+    @property
+    def profiling(self):
+        return self._profiling
+
+    @profiling.setter
+    def profiling(self, val):
+        """Turn on/off recording the elapsed times of itemAt(), items()
+        and the painting of views, where the items are culled by the index.
+        """
+        self._profiling = bool(val)
+
+    def record_time(self, name, elapsed):
+        stats = self._index_stats.get(name)
+        if stats is None:
+            stats = self._index_stats[name] = [0, 0.0, 0.0]
+
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+
+    def index_stats(self):
+        """Statistics of the recorded times in seconds.
+
+        Returns:
+            stats : dict
+                Dict of names (e.g., 'itemAt', 'items' and 'paint')
+                to dicts of 'count', 'total', 'mean' and 'max'.
+        """
+        return {name: {'count': count,
+                       'total': total,
+                       'mean': total / count,
+                       'max': t_max}
+                for name, (count, total, t_max) in self._index_stats.items()}
+
+    def reset_index_stats(self):
+        self._index_stats.clear()
+
+    def itemAt(self, *args, **kwargs):
+        if not self._profiling:
+            return super().itemAt(*args, **kwargs)
+
+        t_beg = time.perf_counter()
+        item = super().itemAt(*args, **kwargs)
+        self.record_time('itemAt', time.perf_counter() - t_beg)
+        return item
+
+    def items(self, *args, **kwargs):
+        if not self._profiling:
+            return super().items(*args, **kwargs)
+
+        t_beg = time.perf_counter()
+        items = super().items(*args, **kwargs)
+        self.record_time('items', time.perf_counter() - t_beg)
+        return items
+
+    def add_items(self, items):
+        """Add multiple items with the item index and the signals paused.
+        """
+        blocked = self.blockSignals(True)
+        try:
+            with self.index_suspended(), self.batch():
+                for item in items:
+                    self.addItem(item)
+        finally:
+            self.blockSignals(blocked)
+
+    def defer_update(self, item):
+        """Queue the update of an item if the scene is in the batch mode.
+
+        Returns:
+            deferred : bool
+                True if the update has been queued, otherwise False.
+        """
+        if self._batch_depth == 0:
+            return False
+
+        self._deferred_items[id(item)] = item
+        return True
+
+    def flush_updates(self):
+        items = list(self._deferred_items.values())
+        self._deferred_items.clear()
+
+        # The scene is invalidated once after updating all items.
+        self._flushing = True
+        try:
+            edges = [item for item in items if isinstance(item, BaseEdge)]
+            CurvedEdge.update_edges(edges)
+            for item in items:
+                if not isinstance(item, BaseEdge):
+                    item.update()
+        finally:
+            self._flushing = False
+
+        if self._invalidation_pending:
+            self._invalidation_pending = False
+            super().invalidate()
+
+    def invalidate(self, *args, **kwargs):
+        if self._batch_depth > 0 or self._flushing:
+            self._invalidation_pending = True
+            return
+
+        return super().invalidate(*args, **kwargs)
+
+    def mouseMoveEvent(self, event):
+        # Dragging a selection moves every selected item in this event.
+        # The edges touched by the items are queued and each of them is
+        # recomputed once at the end of the event, before the next paint.
+        with self.batch():
+            return super().mouseMoveEvent(event)
+
     def selected_movable_items(self):
         items_selected = self.selectedItems()
         return [item for item in items_selected if item.is_movable()]
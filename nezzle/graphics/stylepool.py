@@ -0,0 +1,121 @@
+"""Pools of the style objects shared by graphics items.
+
+Most items of a network share a few styles, so the pens, colors and fonts
+are interned by their values and items refer to the pooled objects
+instead of owning copies. A pooled object should never be modified
+in place. Restyling an item takes another object from the pool
+(i.e., copy-on-write), and the other items are not affected.
+
+Each pool is cleared when it is full, for example, by the continuous
+colors of an animation, so the memory of pools is bounded.
+"""
+
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QColor
+from qtpy.QtGui import QFont
+from qtpy.QtGui import QPen
+
+
+_colors = {}
+_pens = {}
+_fonts = {}
+_MAX_POOLED = 4096
+
+
+def _intern(pool, key, obj):
+    if len(pool) >= _MAX_POOLED:
+        pool.clear()
+
+    pool[key] = obj
+    return obj
+
+
+def get_color(value=None):
+    """Get the pooled QColor of a value.
+
+    Args:
+        value : QColor, Qt.GlobalColor, str or int, optional
+            Any value that QColor accepts.
+            The invalid color, QColor(), is returned if it is None.
+    """
+    if value is None:
+        key = None
+        color = _colors.get(key)
+        if color is None:
+            color = _intern(_colors, key, QColor())
+        return color
+
+    color = QColor(value)
+    key = color.rgba()
+    pooled = _colors.get(key)
+    if pooled is None:
+        pooled = _intern(_colors, key, color)
+    return pooled
+
+
+def get_pen(width=1, color=Qt.transparent,
+            join=Qt.MiterJoin, style=Qt.SolidLine):
+    """Get the pooled QPen of the options.
+    """
+    color = get_color(color)
+    key = (width, color.rgba(), int(join), int(style))
+    pen = _pens.get(key)
+    if pen is None:
+        pen = QPen(color)
+        pen.setWidth(width)
+        pen.setJoinStyle(join)
+        pen.setStyle(style)
+        _intern(_pens, key, pen)
+
+    return pen
+
+
+def restyle_pen(pen, width=None, color=None, join=None, style=None):
+    """Get the pooled QPen with some options of the pen changed.
+    """
+    return get_pen(pen.width() if width is None else width,
+                   pen.color() if color is None else color,
+                   pen.joinStyle() if join is None else join,
+                   pen.style() if style is None else style)
+
+
+def get_font(font):
+    """Get the pooled QFont equal to a font.
+
+    Args:
+        font : QFont or str
+            QFont object or the string from QFont.toString().
+    """
+    if isinstance(font, str):
+        key = font
+    else:
+        key = font.toString()
+
+    pooled = _fonts.get(key)
+    if pooled is None:
+        if isinstance(font, str):
+            pooled = QFont()
+            pooled.fromString(font)
+        else:
+            pooled = QFont(font)
+        _intern(_fonts, key, pooled)
+
+    return pooled
+
+
+def clear():
+    """Clear the pools.
+
+    The items keep referring to their objects.
+    """
+    _colors.clear()
+    _pens.clear()
+    _fonts.clear()
+
+
+def count():
+    """Count the pooled objects of each type.
+    """
+    return {'COLOR': len(_colors),
+            'PEN': len(_pens),
+            'FONT': len(_fonts)}
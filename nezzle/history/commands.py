@@ -23,15 +23,10 @@ class MoveByMouseCommand(QUndoCommand):
             self._new_positions.append((item, QPointF(item.pos())))
             self._old_positions.append((item, QPointF(item["_OLD_POS"])))
 
-            children = item.childItems()
-            if not children:
-                children = []
-
             if isinstance(item, BaseNode):
-                for edge in item.edges:
-                    for child in edge.childItems():
-                        if child not in children:
-                            children.append(child)
+                children = item.gather_children()
+            else:
+                children = item.childItems()
 
             if children:
                 for child in children:
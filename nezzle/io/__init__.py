@@ -8,6 +8,11 @@ from nezzle.io.sif import write_sif
 from nezzle.io.nzj import read_metadata_from_nzj
 from nezzle.io.nzj import read_nzj
 from nezzle.io.nzj import write_nzj
+from nezzle.io.nzj import is_nzj
+
+from nezzle.io.nzb import read_metadata_from_nzb
+from nezzle.io.nzb import read_nzb
+from nezzle.io.nzb import write_nzb
 
 # from nezzle.io.cytoscape import read_metadata_from_cx
 # from nezzle.io.cytoscape import read_cx
@@ -15,6 +20,12 @@ from nezzle.io.nzj import write_nzj
 
 
 from nezzle.io.image import write_image
+from nezzle.io.image import render_image
+
+from nezzle.io.vector import write_svg
+from nezzle.io.vector import write_pdf
+
+from nezzle.io.animation import write_animation
 
 
 def read_metadata(fpath):
@@ -26,23 +37,42 @@ def read_metadata(fpath):
 
     if file_name_ext.endswith('.sif'):
         return read_metadata_from_sif(fpath)
-    elif file_name_ext.endswith('.nzj') or file_name_ext.endswith('.json'):
+    elif is_nzj(file_name_ext):
         return read_metadata_from_nzj(fpath)
+    elif file_name_ext.endswith('.nzb'):
+        return read_metadata_from_nzb(fpath)
 
     else:
         raise ValueError("Unsupported file type: %s"%(fext))
 
 
-def read_network(fpath, edge_map=None):
+def read_network(fpath, edge_map=None, headless=False, progress=None):
+    """Read a network from a file of the supported types.
+
+    Args:
+        fpath : str
+            Path of network file.
+        edge_map : dict, optional
+            Dict of the head types in the file to those of network.
+        headless : bool
+            Create the network without the scene.
+        progress : callable, optional
+            Callback of progress(stage, num_done, total), which is called
+            with the bytes of file read (stage "read") and
+            the items built (stage "build").
+            Reading is aborted by an exception raised from the callback.
+    """
     if not fpath:
         raise ValueError("Invalid file path: %s"%(fpath))
     file_name_ext = os.path.basename(fpath)
     fname, fext = os.path.splitext(file_name_ext)
 
     if file_name_ext.endswith('.sif'):
-        return read_sif(fpath, edge_map)
-    elif file_name_ext.endswith('.nzj') or file_name_ext.endswith('.json'):
-        return read_nzj(fpath, edge_map)
+        return read_sif(fpath, edge_map, headless=headless, progress=progress)
+    elif is_nzj(file_name_ext):
+        return read_nzj(fpath, edge_map, headless=headless, progress=progress)
+    elif file_name_ext.endswith('.nzb'):
+        return read_nzb(fpath, edge_map, headless=headless, progress=progress)
 
     else:
         raise ValueError("Unsupported file type: %s"%(fext))
@@ -55,7 +85,13 @@ def write_network(net, fpath):
 
     if file_name_ext.endswith('.sif'):
         write_sif(net, fpath)
-    elif file_name_ext.endswith('.nzj') or file_name_ext.endswith('.json'):
+    elif is_nzj(file_name_ext):
         write_nzj(net, fpath)
+    elif file_name_ext.endswith('.nzb'):
+        write_nzb(net, fpath)
+    elif file_name_ext.endswith('.svg'):
+        write_svg(net, fpath)
+    elif file_name_ext.endswith('.pdf'):
+        write_pdf(net, fpath)
     else:
         raise ValueError("Unsupported file type: %s" % (file_name_ext))
\ No newline at end of file
@@ -0,0 +1,599 @@
+"""Animation of a network from the time series of attributes.
+
+The scene is kept for all frames, and each frame only assigns the
+attributes changed from the previous frame. The regions of the changed
+items are rendered again into an image that is reused across frames,
+and the frames are piped to an encoder without writing images.
+
+[Frames]
+    The time series are given as a dict of tables (NODES, EDGES, LABELS),
+    each of which is a dict of attributes. The first axis of arrays is
+    the frames, and the second axis is the items in the order of
+    the network (e.g., net.nodes).
+
+    frames = {"NODES": {"FILL_COLOR": rgba,  # (num_frames, num_nodes, 4)
+                        "WIDTH": widths},    # (num_frames, num_nodes)
+              "LABELS": {"TEXT": texts}}     # (num_frames, num_labels)
+
+[Encoders]
+    .png, .apng : Animated PNG (APNG)
+    .gif : GIF (Pillow is required)
+    others (e.g., .mp4, .webm) : Raw frames piped to ffmpeg
+"""
+
+import os
+import shutil
+import struct
+import subprocess
+import zlib
+import multiprocessing
+from abc import ABC
+from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from qtpy.QtCore import QRect
+from qtpy.QtGui import QImage
+
+from nezzle.graphics import Network
+from nezzle.io.image import SceneRenderer
+from nezzle.io.image import PngStreamWriter
+from nezzle.io.image import to_rgba_array
+from nezzle.utils import extract_name_and_ext
+
+
+_TABLES = ("NODES", "EDGES", "LABELS")
+
+# Attributes of labels changing the size of text
+_LABEL_LAYOUT_KEYS = ("TEXT", "FONT", "FONT_SIZE", "FONT_FAMILY",
+                      "FONT_BOLD", "FONT_ITALIC")
+
+
+def _count_frames(frames):
+    num_frames = None
+    for table, attrs in frames.items():
+        if table not in _TABLES:
+            raise KeyError("Unknown table of items: %s" % (table))
+
+        for key, values in attrs.items():
+            if num_frames is None:
+                num_frames = len(values)
+            elif len(values) != num_frames:
+                raise ValueError("The number of frames of %s-%s (%d) is not %d."
+                                 % (table, key, len(values), num_frames))
+
+    return num_frames or 0
+
+
+def _get_dirty_rect(item):
+    """Get the rect of the scene painted by an item and its dependents.
+    """
+    rect = item.sceneBoundingRect()
+    for child in item.childItems():
+        rect = rect.united(child.sceneBoundingRect())
+
+    # The edges of a node are changed with the size of node.
+    for edge in getattr(item, "edges", ()):
+        rect = rect.united(_get_dirty_rect(edge))
+
+    return rect
+
+
+class FrameRenderer(object):
+    """Render the frames of a network into an image reused across frames.
+
+    Args:
+        net : Network
+            Network of the first frame.
+        frames : dict
+            Time series of attributes (see the docstring of module).
+        source_rect : QRectF, optional
+            Region of the scene to render, which is fixed for all frames.
+            The bounding rect of the items over all frames
+            with the paddings is used if it is not given.
+        idens : dict, optional
+            Identities of the items of each table in the order of frames.
+            The order of items in the network is used if it is not given.
+        The other arguments are the same as write_image().
+
+    Example:
+        renderer = FrameRenderer(net, frames)
+        for i in range(renderer.num_frames):
+            image, rect = renderer.render(i)
+    """
+
+    def __init__(self, net, frames,
+                 image_width=None, image_height=None,
+                 transparent=True,
+                 scale_width=100, scale_height=100,
+                 pad_width=10, pad_height=10,
+                 source_rect=None,
+                 idens=None):
+        self._net = net
+        self._frames = {table: {key: np.asarray(values) for key, values in attrs.items()}
+                        for table, attrs in frames.items()}
+        self.num_frames = _count_frames(frames)
+
+        tables = {"NODES": net.nodes, "EDGES": net.edges, "LABELS": net.labels}
+        if idens:
+            self._items = {table: [tables[table][iden] for iden in idens[table]]
+                           for table in _TABLES}
+        else:
+            self._items = {table: list(items.values())
+                           for table, items in tables.items()}
+
+        # Apply the first frame before deciding the region of scene.
+        self._index = None
+        if self.num_frames > 0:
+            self._apply(0)
+            if source_rect is None:
+                source_rect = self._fit_frames(pad_width, pad_height)
+
+        self._renderer = SceneRenderer(net, "png",
+                                       image_width, image_height,
+                                       transparent,
+                                       scale_width, scale_height,
+                                       pad_width, pad_height,
+                                       source_rect)
+
+        self._image = QImage(self._renderer.width, self._renderer.height,
+                             QImage.Format_ARGB32_Premultiplied)
+        self._dirty = [self._image.rect()]
+
+    @property
+    def width(self):
+        return self._renderer.width
+
+    @property
+    def height(self):
+        return self._renderer.height
+
+    @property
+    def image(self):
+        return self._image
+
+    @property
+    def source_rect(self):
+        return self._renderer.source_rect
+
+    @property
+    def idens(self):
+        """Identities of the items of each table in the order of frames.
+        """
+        return {table: [item.iden for item in items]
+                for table, items in self._items.items()}
+
+    def _apply(self, index):
+        """Assign the attributes of a frame, which are changed
+           from the current frame.
+
+        Returns:
+            The rects of the scene painted by the changed items
+            before and after the change.
+        """
+        changed_items = {}
+        resized_labels = {}
+        updates = []
+        for table, attrs in self._frames.items():
+            items = self._items[table]
+            for key, values in attrs.items():
+                values_new = values[index]
+                if self._index is None:
+                    changed = np.ones(len(items), dtype=bool)
+                else:
+                    changed = values_new != values[self._index]
+                    if changed.ndim > 1:
+                        changed = changed.reshape(len(items), -1).any(axis=1)
+
+                ixs = np.flatnonzero(changed)
+                if len(ixs) == 0:
+                    continue
+
+                dict_values = {items[ix].iden: values_new[ix] for ix in ixs}
+                updates.append((table, key, dict_values))
+                for ix in ixs:
+                    changed_items[id(items[ix])] = items[ix]
+                    if table == "LABELS" and key in _LABEL_LAYOUT_KEYS:
+                        resized_labels[id(items[ix])] = items[ix]
+
+        self._index = index
+        if not updates:
+            return []
+
+        rects = [_get_dirty_rect(item) for item in changed_items.values()]
+
+        # The labels are aligned again at their centers if resized.
+        centers = [(label, label.pos() + label.boundingRect().center())
+                   for label in resized_labels.values()]
+
+        net = self._net
+        set_attr = {"NODES": net.set_node_attr,
+                    "EDGES": net.set_edge_attr,
+                    "LABELS": net.set_label_attr}
+
+        with net.batch():
+            for table, key, dict_values in updates:
+                set_attr[table](key, dict_values)
+
+            for label, center in centers:
+                pos = center - label.boundingRect().center()
+                label["POS_X"] = pos.x()
+                label["POS_Y"] = pos.y()
+
+        # The geometry of edges is updated at the end of batch.
+        rects.extend(_get_dirty_rect(item) for item in changed_items.values())
+        return rects
+
+    def _fit_frames(self, pad_width, pad_height):
+        """Get the bounding rect of the items over all frames.
+        """
+        scene = self._net.scene
+        rect = scene.itemsBoundingRect()
+        for index in range(1, self.num_frames):
+            if self._apply(index):
+                rect = rect.united(scene.itemsBoundingRect())
+
+        self._apply(0)
+        rect.adjust(-pad_width, -pad_height, +2*pad_width, +2*pad_height)
+        return rect
+
+    def invalidate(self):
+        """Render the whole image at the next frame.
+        """
+        self._dirty = [self._image.rect()]
+
+    def seek(self, index):
+        """Assign the attributes of a frame without rendering it.
+        """
+        rects = self._apply(index)
+        self._dirty.extend(self._renderer.to_image_rect(rect) for rect in rects)
+
+    def render(self, index):
+        """Render a frame.
+
+        Returns:
+            The image of the frame and the rect of image rendered again
+            from the previous frame, which is empty if nothing is changed.
+            The image is reused for the next frame.
+        """
+        if index != self._index:
+            self.seek(index)
+
+        rect = QRect()
+        for dirty in self._dirty:
+            if dirty.isEmpty():
+                continue
+
+            self._renderer.render_region(self._image, dirty)
+            rect = rect.united(dirty)
+
+        self._dirty = []
+        return self._image, rect
+# end of class
+
+
+class ApngWriter(object):
+    """Encode frames into an animated PNG (APNG) file.
+
+    A frame can be a region of the image changed from the previous frame.
+    The pixels of the region replace those of the previous frame
+    (blend_op SOURCE), and the rest of the image is kept.
+
+    Args:
+        fpath : str
+            Path of APNG file.
+        width, height : int
+            Size of image.
+        num_frames : int
+            Number of frames, which should be known in advance.
+        fps : float
+            Frames per second.
+        num_plays : int
+            Number of plays, where 0 is an infinite loop.
+    """
+
+    def __init__(self, fpath, width, height, num_frames, fps=10, num_plays=0):
+        self._fout = open(fpath, "wb")
+        self._width = width
+        self._height = height
+        self._num_frames = num_frames
+        self._delay = (int(round(1000 / fps)), 1000)
+        self._index = 0
+        self._sequence = 0
+
+        self._fout.write(PngStreamWriter.SIGNATURE)
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height,
+                                               8, 6, 0, 0, 0))
+        self._write_chunk(b"acTL", struct.pack(">II", num_frames, num_plays))
+
+    def _write_chunk(self, tag, data):
+        self._fout.write(struct.pack(">I", len(data)))
+        self._fout.write(tag)
+        self._fout.write(data)
+        self._fout.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+    def _next_sequence(self):
+        sequence = self._sequence
+        self._sequence += 1
+        return sequence
+
+    def write_frame(self, rgba, x=0, y=0):
+        """Write a frame.
+
+        Args:
+            rgba : numpy.ndarray
+                Non-premultiplied RGBA pixels of (height, width, 4) in uint8.
+            x, y : int
+                Position of the pixels in the image.
+        """
+        if self._index >= self._num_frames:
+            raise ValueError("The number of frames exceeds %d." % (self._num_frames))
+
+        height, width = rgba.shape[:2]
+        if self._index == 0 and (x, y, width, height) != (0, 0, self._width, self._height):
+            raise ValueError("The first frame should cover the whole image.")
+
+        # dispose_op: 0 (NONE), blend_op: 0 (SOURCE)
+        self._write_chunk(b"fcTL", struct.pack(">IIIIIHHBB", self._next_sequence(),
+                                               width, height, x, y,
+                                               *self._delay, 0, 0))
+
+        scanlines = np.zeros((height, 1 + 4*width), dtype=np.uint8)
+        scanlines[:, 1:] = rgba.reshape(height, -1)
+        data = zlib.compress(scanlines.tobytes())
+        if self._index == 0:
+            self._write_chunk(b"IDAT", data)
+        else:
+            self._write_chunk(b"fdAT", struct.pack(">I", self._next_sequence()) + data)
+
+        self._index += 1
+
+    def close(self):
+        try:
+            if self._index != self._num_frames:
+                raise ValueError("%d frames are written for %d frames."
+                                 % (self._index, self._num_frames))
+            self._write_chunk(b"IEND", b"")
+        finally:
+            self._fout.close()
+
+
+class _CanvasWriter(ABC):
+    """Base of the encoders of whole frames, where the regions of frames
+       are drawn on a canvas.
+    """
+
+    def __init__(self, width, height):
+        self._canvas = np.zeros((height, width, 4), dtype=np.uint8)
+
+    def write_frame(self, rgba, x=0, y=0):
+        height, width = rgba.shape[:2]
+        self._canvas[y:y + height, x:x + width] = rgba
+        self._encode(self._canvas)
+
+    @abstractmethod
+    def _encode(self, canvas):
+        pass
+
+    @abstractmethod
+    def close(self):
+        pass
+
+
+class GifWriter(_CanvasWriter):
+    """Encode frames into a GIF file using Pillow.
+
+    Pillow keeps all frames in memory until the file is closed.
+    """
+
+    def __init__(self, fpath, width, height, num_frames=None, fps=10, num_plays=0):
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError("Pillow is required for writing GIF: %s" % (fpath))
+
+        super().__init__(width, height)
+        self._image_module = Image
+        self._fpath = fpath
+        self._duration = int(round(1000 / fps))
+        self._num_plays = num_plays
+        self._frames = []
+
+    def _encode(self, canvas):
+        # GIF has no partial transparency, so the frame is blended over white.
+        alpha = canvas[..., 3:].astype(np.float32) / 255
+        rgb = canvas[..., :3] * alpha + 255 * (1 - alpha)
+        image = self._image_module.fromarray(rgb.round().astype(np.uint8), "RGB")
+        self._frames.append(image.quantize())
+
+    def close(self):
+        if not self._frames:
+            raise ValueError("No frame is written: %s" % (self._fpath))
+
+        self._frames[0].save(self._fpath, save_all=True,
+                             append_images=self._frames[1:],
+                             duration=self._duration,
+                             loop=self._num_plays)
+        self._frames = []
+
+
+class FfmpegWriter(_CanvasWriter):
+    """Pipe raw frames to an ffmpeg process, which encodes a video.
+
+    Args:
+        output_args : list of str, optional
+            Arguments of ffmpeg for the output. The frames are encoded in
+            the yuv420p pixel format, whose size should be even, by default.
+    """
+
+    DEFAULT_OUTPUT_ARGS = ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                           "-pix_fmt", "yuv420p"]
+
+    def __init__(self, fpath, width, height, num_frames=None, fps=10,
+                 num_plays=0, output_args=None, ffmpeg=None):
+        ffmpeg = ffmpeg or shutil.which("ffmpeg")
+        if not ffmpeg:
+            raise FileNotFoundError("ffmpeg is required for writing video: %s" % (fpath))
+
+        super().__init__(width, height)
+        if output_args is None:
+            output_args = self.DEFAULT_OUTPUT_ARGS
+
+        cmd = [ffmpeg, "-y", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", "rgba",
+               "-s", "%dx%d" % (width, height), "-r", str(fps),
+               "-i", "-"] + list(output_args) + [fpath]
+
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def _encode(self, canvas):
+        self._proc.stdin.write(canvas.tobytes())
+
+    def close(self):
+        self._proc.stdin.close()
+        if self._proc.wait() != 0:
+            raise RuntimeError("ffmpeg exited with the code of %d." % (self._proc.returncode))
+
+
+def create_frame_writer(fpath, width, height, num_frames, fps=10, num_plays=0):
+    """Create the encoder of frames according to the extension of file.
+    """
+    fname, fext = extract_name_and_ext(fpath)
+    fext = fext.lower()
+    if fext in ("png", "apng"):
+        return ApngWriter(fpath, width, height, num_frames, fps, num_plays)
+    elif fext == "gif":
+        return GifWriter(fpath, width, height, num_frames, fps, num_plays)
+
+    return FfmpegWriter(fpath, width, height, num_frames, fps, num_plays)
+
+
+def _render_frames(renderer, beg, end):
+    """Render the frames in [beg, end) into the regions of RGBA pixels.
+    """
+    for index in range(beg, end):
+        image, rect = renderer.render(index)
+        if rect.isEmpty():
+            # The frame is the same as the previous one.
+            rect = QRect(0, 0, 1, 1)
+        yield to_rgba_array(image, rect), rect.x(), rect.y()
+
+
+# The renderer of each worker process.
+_worker_renderer = None
+
+
+def _init_worker(dict_net, frames, idens, options):
+    global _worker_renderer
+
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+    from qtpy.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    net = Network.from_dict(dict_net)
+    _worker_renderer = (app, FrameRenderer(net, frames, idens=idens, **options))
+
+
+def _render_frames_in_worker(beg, end):
+    app, renderer = _worker_renderer
+    # The first frame of a range is written as a whole.
+    renderer.seek(beg)
+    renderer.invalidate()
+    return list(_render_frames(renderer, beg, end))
+
+
+def _write_frames_in_parallel(net, renderer, writer, frames, options,
+                              num_workers, frames_per_task):
+    num_frames = renderer.num_frames
+
+    # The workers render the same region of the network from its copy.
+    options = dict(options, source_rect=renderer.source_rect)
+    idens = renderer.idens
+
+    # The network at the first frame, whose changes are applied by workers.
+    renderer.seek(0)
+    dict_net = net.to_dict()
+
+    ranges = [(beg, min(beg + frames_per_task, num_frames))
+              for beg in range(0, num_frames, frames_per_task)]
+
+    # Qt does not survive fork, so the workers are spawned.
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(num_workers, mp_context=mp_context,
+                             initializer=_init_worker,
+                             initargs=(dict_net, frames, idens, options)) as executor:
+        for results in executor.map(_render_frames_in_worker, *zip(*ranges)):
+            for rgba, x, y in results:
+                writer.write_frame(rgba, x, y)
+
+
+def write_animation(net, fpath, frames,
+                    fps=10,
+                    num_plays=0,
+                    image_width=None, image_height=None,
+                    transparent=True,
+                    scale_width=100, scale_height=100,
+                    pad_width=10, pad_height=10,
+                    source_rect=None,
+                    num_workers=1,
+                    frames_per_task=16):
+    """Write an animation of the network from the time series of attributes.
+
+    Args:
+        net : Network
+            Network whose attributes are changed with frames.
+        fpath : str
+            Path of animation file. The encoder is chosen by the extension
+            (see the docstring of module).
+        frames : dict
+            Time series of attributes (see the docstring of module).
+        fps : float
+            Frames per second.
+        num_plays : int
+            Number of plays, where 0 is an infinite loop (APNG and GIF).
+        source_rect : QRectF, optional
+            Region of the scene to render (see FrameRenderer).
+        num_workers : int
+            Number of processes rendering the ranges of frames.
+            The network is rendered in this process if it is 1.
+        frames_per_task : int
+            Number of frames rendered by a task of a worker process.
+        The other arguments are the same as write_image().
+
+    Examples:
+        >>> s = sol / sol.max()  # (num_frames, num_nodes)
+        >>> rgba = np.zeros(s.shape + (4,), dtype=np.uint8)
+        >>> rgba[..., 0] = 255 * s
+        >>> rgba[..., 3] = 255
+        >>> frames = {"NODES": {"FILL_COLOR": rgba, "WIDTH": 20 + 50*s}}
+        >>> write_animation(net, "dynamics.png", frames, fps=5)
+    """
+    options = dict(image_width=image_width, image_height=image_height,
+                   transparent=transparent,
+                   scale_width=scale_width, scale_height=scale_height,
+                   pad_width=pad_width, pad_height=pad_height,
+                   source_rect=source_rect)
+
+    renderer = FrameRenderer(net, frames, **options)
+    num_frames = renderer.num_frames
+    writer = create_frame_writer(fpath, renderer.width, renderer.height,
+                                 num_frames, fps, num_plays)
+
+    try:
+        if num_workers <= 1 or num_frames <= frames_per_task:
+            for rgba, x, y in _render_frames(renderer, 0, num_frames):
+                writer.write_frame(rgba, x, y)
+        else:
+            _write_frames_in_parallel(net, renderer, writer, frames, options,
+                                      num_workers, frames_per_task)
+    except BaseException:
+        try:
+            writer.close()
+        except Exception:
+            pass  # The original error is more informative.
+        raise
+
+    writer.close()
+# end of def
@@ -1,10 +1,308 @@
+import math
+import struct
+import zlib
+
+import numpy as np
+
 from qtpy.QtCore import Qt
+from qtpy.QtCore import QRect
+from qtpy.QtCore import QRectF
+from qtpy.QtGui import QColor
 from qtpy.QtGui import QImage
 from qtpy.QtGui import QPainter
+from qtpy.QtGui import QTransform
 
 from nezzle.utils import extract_name_and_ext
 
 
+# Size of a tile rendered at once in pixels.
+TILE_SIZE = 1024
+
+# Upper bound of the memory of a band of tiles streamed into PNG.
+MAX_BAND_BYTES = 64 * 2**20
+
+
+class PngStreamWriter(object):
+    """Encode a RGBA PNG image, whose rows are written band by band.
+
+    Only the band being written is held in memory,
+    and the compressed data are written to the file as they are produced.
+
+    Example:
+        with open(fpath, "wb") as fout:
+            writer = PngStreamWriter(fout, width, height)
+            writer.write_rows(rows)  # uint8 array of (num_rows, width, 4)
+            ...
+            writer.close()
+    """
+
+    SIGNATURE = b"\x89PNG\r\n\x1a\n"
+    MAX_CHUNK_SIZE = 2**16
+
+    def __init__(self, fout, width, height,
+                 dpm_width=None, dpm_height=None, level=6):
+        self._fout = fout
+        self._width = width
+        self._height = height
+        self._num_rows = 0
+        self._compressor = zlib.compressobj(level)
+        self._pending = []
+        self._pending_size = 0
+
+        fout.write(self.SIGNATURE)
+        # 8-bit depth, color type 6 (RGBA), no interlace
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height,
+                                               8, 6, 0, 0, 0))
+        if dpm_width and dpm_height:
+            self._write_chunk(b"pHYs", struct.pack(">IIB", dpm_width,
+                                                   dpm_height, 1))
+
+    def _write_chunk(self, tag, data):
+        self._fout.write(struct.pack(">I", len(data)))
+        self._fout.write(tag)
+        self._fout.write(data)
+        self._fout.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(tag))))
+
+    def _write_compressed(self, data, flush=False):
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+
+        if self._pending_size >= self.MAX_CHUNK_SIZE or (flush and self._pending):
+            self._write_chunk(b"IDAT", b"".join(self._pending))
+            self._pending = []
+            self._pending_size = 0
+
+    def write_rows(self, rows):
+        """Write the rows of pixels.
+
+        Args:
+            rows : numpy.ndarray
+                Non-premultiplied RGBA pixels of (num_rows, width, 4) in uint8.
+        """
+        num_rows = rows.shape[0]
+        if rows.shape[1:] != (self._width, 4):
+            raise ValueError("Invalid shape of rows: %s" % (rows.shape,))
+
+        if self._num_rows + num_rows > self._height:
+            raise ValueError("The number of rows exceeds the height of image.")
+
+        # Each row starts with the filter type (0: None).
+        scanlines = np.zeros((num_rows, 1 + 4*self._width), dtype=np.uint8)
+        scanlines[:, 1:] = rows.reshape(num_rows, -1)
+        self._write_compressed(self._compressor.compress(scanlines.tobytes()))
+        self._num_rows += num_rows
+
+    def close(self):
+        if self._num_rows != self._height:
+            raise ValueError("%d rows are written for the height of %d."
+                             % (self._num_rows, self._height))
+
+        self._write_compressed(self._compressor.flush(), flush=True)
+        self._write_chunk(b"IEND", b"")
+
+
+class SceneRenderer(object):
+    """Render the regions of an image of the scene of network,
+       which is rendered tile by tile or region by region.
+
+    Args:
+        net : Network
+            Network to render.
+        fext : str
+            Extension of image file, which decides the background.
+        source_rect : QRectF, optional
+            Region of the scene to render. The bounding rect of items
+            with the paddings is used if it is not given.
+    """
+
+    def __init__(self, net, fext,
+                 image_width=None, image_height=None,
+                 transparent=True,
+                 scale_width=200, scale_height=200,
+                 pad_width=10, pad_height=10,
+                 source_rect=None):
+
+        scene = net.scene
+        scene.clearSelection()
+        scene.clearFocus()
+        if source_rect is None:
+            brect = scene.itemsBoundingRect()
+            brect.adjust(-pad_width, -pad_height, +2*pad_width, +2*pad_height)
+        else:
+            brect = QRectF(source_rect)
+
+        if image_width and image_height:
+            # Fit the items in the image keeping the aspect ratio.
+            scale = min(image_width / brect.width(), image_height / brect.height())
+            self._sx = self._sy = scale
+            self._ox = (image_width - scale*brect.width()) / 2
+            self._oy = (image_height - scale*brect.height()) / 2
+            self.width = int(image_width)
+            self.height = int(image_height)
+        else:
+            self._sx = scale_width / 100.0
+            self._sy = scale_height / 100.0
+            self._ox = self._oy = 0
+            self.width = int(self._sx * brect.width())
+            self.height = int(self._sy * brect.height())
+
+        self._scene = scene
+        self._brect = brect
+
+        bg_color = scene.backgroundBrush().color()
+        if not transparent or fext in ["jpeg", "jpg"]:
+            self._fill_color = QColor(Qt.white)
+            self._bg_color = bg_color
+        elif fext in ['png']:
+            self._fill_color = bg_color
+            self._bg_color = None
+        else:
+            self._fill_color = QColor(Qt.transparent)
+            self._bg_color = None
+
+    @property
+    def source_rect(self):
+        return QRectF(self._brect)
+
+    @property
+    def transform(self):
+        """QTransform from the scene to the image.
+        """
+        return QTransform(self._sx, 0, 0, self._sy,
+                          self._ox - self._brect.left()*self._sx,
+                          self._oy - self._brect.top()*self._sy)
+
+    def _source_rect(self, x, y, width, height):
+        """Get the rect of the scene for a rect of the image.
+        """
+        return QRectF(self._brect.left() + (x - self._ox)/self._sx,
+                      self._brect.top() + (y - self._oy)/self._sy,
+                      width/self._sx, height/self._sy)
+
+    def to_image_rect(self, rect, margin=2):
+        """Get the rect of the image covering a rect of the scene,
+           which is clipped by the image.
+        """
+        x = self._ox + (rect.left() - self._brect.left())*self._sx
+        y = self._oy + (rect.top() - self._brect.top())*self._sy
+        x_beg = max(0, int(math.floor(x)) - margin)
+        y_beg = max(0, int(math.floor(y)) - margin)
+        x_end = min(self.width, int(math.ceil(x + rect.width()*self._sx)) + margin)
+        y_end = min(self.height, int(math.ceil(y + rect.height()*self._sy)) + margin)
+        return QRect(x_beg, y_beg, max(0, x_end - x_beg), max(0, y_end - y_beg))
+
+    def _render(self, painter, target, source):
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(target, self._fill_color)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        if self._bg_color is not None:
+            painter.fillRect(target, self._bg_color)
+
+        painter.setRenderHints(QPainter.TextAntialiasing
+                               | QPainter.Antialiasing
+                               | QPainter.SmoothPixmapTransform
+                               | QPainter.HighQualityAntialiasing)
+
+        self._scene.render(painter, target, source, Qt.IgnoreAspectRatio)
+
+    def render(self, image, x, y):
+        """Render the region of the image at (x, y) into a tile image.
+        """
+        tw, th = image.width(), image.height()
+        painter = QPainter(image)
+        self._render(painter, QRectF(0, 0, tw, th), self._source_rect(x, y, tw, th))
+        painter.end()
+
+    def render_region(self, image, rect):
+        """Render a rect of the image in place.
+
+        Args:
+            image : QImage
+                Image of the whole size, which is partially updated.
+            rect : QRect
+                Rect of the image to render.
+        """
+        painter = QPainter(image)
+        painter.setClipRect(rect)
+        self._render(painter, QRectF(rect),
+                     self._source_rect(rect.x(), rect.y(), rect.width(), rect.height()))
+        painter.end()
+
+
+def to_rgba_array(image, rect=None):
+    """Convert a QImage into a (height, width, 4) array of
+       non-premultiplied RGBA pixels.
+
+    Args:
+        image : QImage
+            Image to convert.
+        rect : QRect, optional
+            Rect of the image to convert. The whole image is converted
+            if it is not given.
+    """
+    if rect is not None:
+        image = image.copy(rect)
+    image = image.convertToFormat(QImage.Format_RGBA8888)
+    ptr = image.constBits()
+    ptr.setsize(image.bytesPerLine() * image.height())
+    arr = np.frombuffer(ptr, dtype=np.uint8).reshape(image.height(), -1)
+
+    # Copy the pixels, which are freed with the converted image.
+    arr = arr[:, :4*image.width()].reshape(image.height(), image.width(), 4)
+    return arr.copy()
+
+
+def _quality_to_level(quality):
+    """Convert the quality of image into the compression level of PNG
+       in the same manner as Qt.
+    """
+    if quality < 0:
+        quality = 50
+    return 9 - min(quality, 100)*9//91
+
+
+def render_image(net,
+                 image_width=None, image_height=None,
+                 transparent=True,
+                 scale_width=200, scale_height=200,
+                 dpi_width=350, dpi_height=350,
+                 pad_width=10, pad_height=10,
+                 fext="png"):
+    """Render the network into a QImage, which is rendered tile by tile.
+
+    The memory of the image is proportional to its size,
+    so write_image() should be used for a large PNG image.
+    """
+    renderer = SceneRenderer(net, fext,
+                             image_width, image_height,
+                             transparent,
+                             scale_width, scale_height,
+                             pad_width, pad_height)
+
+    image = QImage(renderer.width, renderer.height,
+                   QImage.Format_ARGB32_Premultiplied)
+
+    # [REF] http://stackoverflow.com/a/13425280/4136588
+    # dpm = 300 / 0.0254 # ~300 DPI
+    image.setDotsPerMeterX(int(dpi_width / 0.0254))
+    image.setDotsPerMeterY(int(dpi_height / 0.0254))
+
+    tile = QImage(min(TILE_SIZE, renderer.width),
+                  min(TILE_SIZE, renderer.height),
+                  QImage.Format_ARGB32_Premultiplied)
+
+    painter = QPainter(image)
+    painter.setCompositionMode(QPainter.CompositionMode_Source)
+    for y in range(0, renderer.height, tile.height()):
+        for x in range(0, renderer.width, tile.width()):
+            renderer.render(tile, x, y)
+            painter.drawImage(x, y, tile)
+    painter.end()
+
+    return image
+
+
 def write_image(net,
                 fpath,
                 image_width=None, image_height=None,
@@ -13,49 +311,73 @@ def write_image(net,
                 scale_width=200, scale_height=200,
                 dpi_width=350, dpi_height=350,
                 pad_width=10, pad_height=10):
+    """Write an image of the network.
 
+    A PNG image is rendered in tiles and encoded band by band,
+    so the memory is bounded regardless of the size of image.
+    SVG and PDF images are written as vector primitives of the items.
+    The other formats are encoded by Qt from the whole image.
+    """
     fname, fext = extract_name_and_ext(fpath)
+    fext = fext.lower()
 
-    scene = net.scene
-    scene.clearSelection()
-    scene.clearFocus()
-    brect = scene.itemsBoundingRect()
-    brect.adjust(-pad_width, -pad_height, +2*pad_width, +2*pad_height)
-
-    if image_width and image_height:
-        image = QImage(image_width,
-                       image_height,
-                       QImage.Format_ARGB32_Premultiplied)
-    else:
-        image = QImage(int((scale_width/100.0) * brect.width()),
-                       int((scale_height/100.0) * brect.height()),
-                       QImage.Format_ARGB32_Premultiplied)
+    if fext in ("svg", "pdf"):
+        # The vector module depends on this module.
+        from nezzle.io.vector import write_svg
+        from nezzle.io.vector import write_pdf
 
-    # [REF] http://stackoverflow.com/a/13425280/4136588
-    # dpm = 300 / 0.0254 # ~300 DPI
-    dpm_width = int(dpi_width / 0.0254)
-    dpm_height = int(dpi_height / 0.0254)
-    image.setDotsPerMeterX(dpm_width)
-    image.setDotsPerMeterY(dpm_height)
+        if fext == "svg":
+            write_svg(net, fpath,
+                      image_width, image_height,
+                      transparent,
+                      scale_width, scale_height,
+                      pad_width, pad_height)
+        else:
+            write_pdf(net, fpath,
+                      image_width, image_height,
+                      transparent,
+                      scale_width, scale_height,
+                      dpi_width, dpi_height,
+                      pad_width, pad_height)
+        return
 
-    bbrush = scene.backgroundBrush()
+    if fext != "png":
+        image = render_image(net,
+                             image_width, image_height,
+                             transparent,
+                             scale_width, scale_height,
+                             dpi_width, dpi_height,
+                             pad_width, pad_height,
+                             fext=fext)
+        image.save(fpath, fext.upper(), quality)
+        return
 
-    painter = QPainter(image)
-    if not transparent or fext in ["jpeg", "jpg"]:
-        image.fill(Qt.white)
-        painter.setPen(Qt.NoPen)
-        painter.setBrush(bbrush.color())
-        painter.drawRect(0, 0, image.width(), image.height())
-    elif fext in ['png']:
-        image.fill(bbrush.color())
-
-    painter.setRenderHints(QPainter.TextAntialiasing
-                           | QPainter.Antialiasing
-                           | QPainter.SmoothPixmapTransform
-                           | QPainter.HighQualityAntialiasing)
-
-    scene.render(painter)
-    image.save(fpath, fext.upper(), quality)
-    painter.end()
-# end of def
+    renderer = SceneRenderer(net, fext,
+                             image_width, image_height,
+                             transparent,
+                             scale_width, scale_height,
+                             pad_width, pad_height)
+
+    width, height = renderer.width, renderer.height
+    band_height = max(1, min(TILE_SIZE, MAX_BAND_BYTES // (4*width)))
+    tile_width = min(TILE_SIZE, width)
 
+    with open(fpath, "wb") as fout:
+        writer = PngStreamWriter(fout, width, height,
+                                 int(dpi_width / 0.0254),
+                                 int(dpi_height / 0.0254),
+                                 level=_quality_to_level(quality))
+
+        band = np.empty((band_height, width, 4), dtype=np.uint8)
+        tile = QImage(tile_width, band_height, QImage.Format_ARGB32_Premultiplied)
+        for y in range(0, height, band_height):
+            th = min(band_height, height - y)
+            for x in range(0, width, tile_width):
+                tw = min(tile_width, width - x)
+                renderer.render(tile, x, y)
+                band[:th, x:x + tw] = to_rgba_array(tile)[:th, :tw]
+
+            writer.write_rows(band[:th])
+
+        writer.close()
+# end of def
@@ -0,0 +1,167 @@
+"""Loading a network in the background of GUI.
+
+The file is parsed and the headless network is built in a worker thread,
+and only the insertion of items into the scene happens in the GUI thread,
+chunk by chunk in the time slices of the event loop.
+
+Example:
+    loader = NetworkLoader(parent)
+    loader.progressed.connect(on_progressed)  # (stage, num_done, total)
+    loader.loaded.connect(on_loaded)  # (net)
+    loader.load(fpath, edge_map)
+    ...
+    loader.cancel()
+"""
+
+import time
+from traceback import format_exc
+
+from qtpy.QtCore import QObject
+from qtpy.QtCore import QThread
+from qtpy.QtCore import QTimer
+from qtpy.QtCore import Signal
+from qtpy.QtCore import Slot
+
+from nezzle.io import read_network
+
+
+class LoadingCanceled(Exception):
+    """Raised from the progress callback to abort reading a file.
+    """
+
+
+class _ReadWorker(QObject):
+    # The numbers of bytes can exceed the range of int in C++.
+    progressed = Signal(str, object, object)
+    finished = Signal(object, str)
+
+    def __init__(self, fpath, edge_map, is_canceled):
+        super().__init__()
+        self._fpath = fpath
+        self._edge_map = edge_map
+        self._is_canceled = is_canceled
+
+    def _report_progress(self, stage, num_done, total):
+        if self._is_canceled():
+            raise LoadingCanceled()
+        self.progressed.emit(stage, num_done, total)
+
+    @Slot()
+    def run(self):
+        try:
+            net = read_network(self._fpath, self._edge_map, headless=True,
+                               progress=self._report_progress)
+        except LoadingCanceled:
+            self.finished.emit(None, "")
+            return
+        except Exception:
+            self.finished.emit(None, format_exc())
+            return
+
+        self.finished.emit(net, "")
+# end of class _ReadWorker
+
+
+class NetworkLoader(QObject):
+    """Load a network file without blocking the event loop of GUI.
+
+    Signals:
+        progressed(stage, num_done, total) : the progress of the stages,
+            "read" (bytes of file), "build" (items) and "insert" (items).
+        loaded(net) : the network with the scene of all items.
+        failed(err_msg) : the traceback of an error.
+        canceled() : loading has been canceled.
+    """
+
+    progressed = Signal(str, object, object)
+    loaded = Signal(object)
+    failed = Signal(str)
+    canceled = Signal()
+
+    # Seconds of inserting the items in a turn of the event loop
+    TIME_SLICE = 0.02
+
+    def __init__(self, parent=None, chunk_size=256):
+        super().__init__(parent)
+        self._chunk_size = chunk_size
+        self._is_canceled = False
+        self._thread = None
+        self._worker = None
+        self._net = None
+        self._steps = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._insert_items)
+
+    @property
+    def is_loading(self):
+        return self._thread is not None or self._steps is not None
+
+    def load(self, fpath, edge_map=None):
+        if self.is_loading:
+            raise RuntimeError("Another network is being loaded.")
+
+        self._is_canceled = False
+        self._thread = QThread()
+        self._worker = _ReadWorker(fpath, edge_map, lambda: self._is_canceled)
+        self._worker.moveToThread(self._thread)
+        self._worker.progressed.connect(self.progressed)
+        self._worker.finished.connect(self._on_read_finished)
+        self._thread.started.connect(self._worker.run)
+        self._thread.start()
+
+    @Slot()
+    def cancel(self):
+        """Cancel loading. The worker thread stops at its next progress,
+           and the insertion stops before the next chunk.
+        """
+        self._is_canceled = True
+        if self._steps is not None:
+            self._stop_inserting()
+            self.canceled.emit()
+
+    @Slot(object, str)
+    def _on_read_finished(self, net, err_msg):
+        self._thread.quit()
+        self._thread.wait()
+        self._thread = None
+        self._worker = None
+
+        if err_msg:
+            self.failed.emit(err_msg)
+        elif net is None or self._is_canceled:
+            self.canceled.emit()
+        else:
+            self._net = net
+            self._steps = net.iter_materialize_scene(self._chunk_size)
+            self._timer.start()
+
+    def _stop_inserting(self):
+        self._timer.stop()
+        # The partial scene is not attached to the network.
+        self._steps.close()
+        self._steps = None
+        self._net = None
+
+    @Slot()
+    def _insert_items(self):
+        t_beg = time.perf_counter()
+
+        # Loading can be canceled by the slots of progressed.
+        while self._steps is not None \
+                and time.perf_counter() - t_beg < self.TIME_SLICE:
+            try:
+                num_added, total = next(self._steps)
+            except StopIteration:
+                net = self._net
+                self._stop_inserting()
+                self.loaded.emit(net)
+                return
+            except Exception:
+                self._stop_inserting()
+                self.failed.emit(format_exc())
+                return
+
+            self.progressed.emit("insert", num_added, total)
+# end of class NetworkLoader
@@ -0,0 +1,420 @@
+"""Binary columnar format of network (NZB).
+
+The nodes, edges and labels are stored as tables whose attributes are
+typed columns, and the strings are stored once in a string table.
+The file is memory-mapped for reading, and the columns are numpy arrays
+viewing the mapped file without copying.
+
+[Layout]
+    MAGIC (4 bytes), VERSION (uint32), size of header (uint64)
+    Header: JSON document describing the network attributes,
+            the string table and the columns of tables
+    Data: columns, each of which is aligned to 8 bytes
+
+[Column types]
+    f8   : float64
+    i8   : int64
+    b1   : bool
+    str  : int32 index of the string table
+    json : int32 index of the string table, which is a JSON-encoded value
+           (e.g., dict of the edge head)
+
+A column has a mask of uint8 if some rows do not have the attribute.
+"""
+
+import json
+import mmap
+import struct
+from collections import defaultdict
+
+import numpy as np
+
+from nezzle.graphics import Network
+from nezzle.io.nzj import NpEncoder
+from nezzle.io.nzj import count_interactions
+from nezzle.io.nzj import map_edge_heads
+
+
+MAGIC = b"NZB\x00"
+VERSION = 1
+
+_struct_prefix = struct.Struct("<4sIQ")
+_ALIGNMENT = 8
+_TABLES = ("NODES", "EDGES", "LABELS")
+
+
+def _infer_dtype(values):
+    """Infer the column type of the present values of an attribute.
+    """
+    dtypes = set()
+    for value in values:
+        if isinstance(value, (bool, np.bool_)):
+            dtypes.add("b1")
+        elif isinstance(value, (int, np.integer)):
+            dtypes.add("i8")
+        elif isinstance(value, (float, np.floating)):
+            dtypes.add("f8")
+        elif isinstance(value, str):
+            dtypes.add("str")
+        else:
+            return "json"
+
+        if len(dtypes) > 1:
+            return "json"
+
+    return dtypes.pop() if dtypes else "json"
+
+
+class _StringTable(object):
+    def __init__(self):
+        self._indices = {}
+        self._strings = []
+
+    def index(self, s):
+        ix = self._indices.get(s)
+        if ix is None:
+            ix = self._indices[s] = len(self._strings)
+            self._strings.append(s)
+        return ix
+
+    def to_arrays(self):
+        encoded = [s.encode("utf-8") for s in self._strings]
+        offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _encode_column(values, dtype, strings):
+    if dtype == "f8":
+        return np.array(values, dtype="<f8")
+    elif dtype == "i8":
+        return np.array(values, dtype="<i8")
+    elif dtype == "b1":
+        return np.array(values, dtype=np.bool_)
+    elif dtype == "str":
+        return np.array([strings.index(v) for v in values], dtype="<i4")
+
+    return np.array([strings.index(json.dumps(v, cls=NpEncoder))
+                     for v in values], dtype="<i4")
+
+
+def _encode_table(rows, strings):
+    """Convert the dicts of items into the columns of a table.
+    """
+    keys = {}
+    for row in rows:
+        for key in row:
+            keys.setdefault(key, None)
+
+    columns = []
+    for key in keys:
+        mask = np.array([key in row for row in rows], dtype=np.uint8)
+        present = [row[key] for row in rows if key in row]
+        dtype = _infer_dtype(present)
+
+        # Fill the missing values to keep the rows aligned.
+        if not mask.all():
+            fill = {"f8": 0.0, "i8": 0, "b1": False}.get(dtype, "")
+            if dtype == "json":
+                fill = None
+            values = [row.get(key, fill) for row in rows]
+        else:
+            values = present
+            mask = None
+
+        columns.append((key, dtype, _encode_column(values, dtype, strings), mask))
+
+    return columns
+
+
+def write_nzb(net, fpath):
+    """Write a network to a NZB file.
+    """
+    dict_net = net.to_dict()
+    strings = _StringTable()
+
+    heads = (edge.get("HEAD") for edge in dict_net["EDGES"])
+    metadata = {"NETWORK_NAME": dict_net["NAME"],
+                "INTERACTIONS": count_interactions(heads)}
+
+    tables = {name: _encode_table(dict_net.pop(name), strings)
+              for name in _TABLES}
+
+    offsets, data = strings.to_arrays()
+
+    # Lay out the arrays in the data region.
+    arrays = []
+    pos = 0
+
+    def place(arr):
+        nonlocal pos
+        desc = {"OFFSET": pos, "SIZE": arr.nbytes}
+        arrays.append((pos, arr))
+        pos += arr.nbytes
+        pos += -pos % _ALIGNMENT
+        return desc
+
+    header = {"METADATA": metadata,
+              "NETWORK": dict_net,
+              "STRINGS": {"OFFSETS": place(offsets), "DATA": place(data)},
+              "TABLES": {}}
+
+    for name, columns in tables.items():
+        desc_columns = []
+        for key, dtype, arr, mask in columns:
+            desc = {"NAME": key, "DTYPE": dtype, "DATA": place(arr)}
+            if mask is not None:
+                desc["MASK"] = place(mask)
+            desc_columns.append(desc)
+
+        num_rows = len(columns[0][2]) if columns else 0
+        header["TABLES"][name] = {"NUM_ROWS": num_rows,
+                                  "COLUMNS": desc_columns}
+
+    bytes_header = json.dumps(header, cls=NpEncoder).encode("utf-8")
+    bytes_header += b" " * (-(_struct_prefix.size + len(bytes_header)) % _ALIGNMENT)
+
+    with open(fpath, "wb") as fout:
+        fout.write(_struct_prefix.pack(MAGIC, VERSION, len(bytes_header)))
+        fout.write(bytes_header)
+        written = 0
+        for offset, arr in arrays:
+            fout.write(b"\x00" * (offset - written))
+            fout.write(arr.tobytes())
+            written = offset + arr.nbytes
+
+
+class NzbFile(object):
+    """Memory-mapped NZB file.
+
+    The columns are numpy arrays viewing the mapped file,
+    so they are valid only while the file is open.
+
+    Example:
+        with NzbFile(fpath) as nzb:
+            pos_x = nzb.column("NODES", "POS_X")
+    """
+
+    def __init__(self, fpath):
+        self._buffer = None
+        self._str_offsets = None
+        self._str_data = None
+        self._strings = {}
+
+        self._file = open(fpath, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # An empty file cannot be mapped.
+            self._file.close()
+            raise ValueError("Invalid NZB file: %s" % (fpath))
+
+        if len(self._mmap) < _struct_prefix.size:
+            self.close()
+            raise ValueError("Invalid NZB file: %s" % (fpath))
+
+        magic, version, size_header = _struct_prefix.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("Invalid NZB file: %s" % (fpath))
+
+        if version > VERSION:
+            self.close()
+            raise ValueError("Unsupported NZB version: %d" % (version))
+
+        beg = _struct_prefix.size
+        self._header = json.loads(self._mmap[beg:beg + size_header].decode("utf-8"))
+        self._buffer = memoryview(self._mmap)[beg + size_header:]
+
+        desc = self._header["STRINGS"]
+        self._str_offsets = self._view(desc["OFFSETS"], "<i8")
+        self._str_data = self._view(desc["DATA"], np.uint8)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._mmap is None:
+            return
+
+        # The views should be released before closing the map.
+        self._str_offsets = None
+        self._str_data = None
+        self._strings = {}
+        try:
+            if self._buffer is not None:
+                self._buffer.release()
+            self._mmap.close()
+        except BufferError:
+            # Some columns are still referred to by the caller,
+            # so the map is closed when they are garbage collected.
+            pass
+
+        self._buffer = None
+        self._mmap = None
+        self._file.close()
+
+    @property
+    def header(self):
+        return self._header
+
+    @property
+    def metadata(self):
+        return self._header["METADATA"]
+
+    def _view(self, desc, dtype):
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self._buffer, dtype=dtype,
+                             count=desc["SIZE"] // dtype.itemsize,
+                             offset=desc["OFFSET"])
+
+    def string(self, ix):
+        """Get a string of the string table.
+        """
+        s = self._strings.get(ix)
+        if s is None:
+            beg, end = self._str_offsets[ix:ix + 2]
+            s = self._str_data[beg:end].tobytes().decode("utf-8")
+            self._strings[ix] = s
+        return s
+
+    def num_rows(self, table):
+        return self._header["TABLES"][table]["NUM_ROWS"]
+
+    def column_names(self, table):
+        return [desc["NAME"] for desc in self._header["TABLES"][table]["COLUMNS"]]
+
+    def _column_desc(self, table, name):
+        for desc in self._header["TABLES"][table]["COLUMNS"]:
+            if desc["NAME"] == name:
+                return desc
+
+        raise KeyError("%s does not have a column: %s" % (table, name))
+
+    def column(self, table, name):
+        """Get the raw column of a table without copying.
+
+        The string and JSON columns are the indices of the string table.
+        """
+        desc = self._column_desc(table, name)
+        dtype = {"f8": "<f8", "i8": "<i8", "b1": np.bool_}.get(desc["DTYPE"], "<i4")
+        return self._view(desc["DATA"], dtype)
+
+    def mask(self, table, name):
+        """Get the mask of present values of a column,
+           which is None if all rows have the value.
+        """
+        desc = self._column_desc(table, name)
+        if "MASK" not in desc:
+            return None
+        return self._view(desc["MASK"], np.uint8).astype(np.bool_)
+
+    def values(self, table, name):
+        """Get the Python values of a column.
+        """
+        dtype = self._column_desc(table, name)["DTYPE"]
+        indices = self.column(table, name).tolist()
+        if dtype == "str":
+            return [self.string(ix) for ix in indices]
+        elif dtype == "json":
+            decoded = {}
+            values = []
+            for ix in indices:
+                if ix not in decoded:
+                    decoded[ix] = self.string(ix)
+                # Each row gets its own object, which can be modified.
+                values.append(json.loads(decoded[ix]))
+            return values
+
+        return indices
+
+    def _column_size(self, desc):
+        size = desc["DATA"]["SIZE"]
+        if "MASK" in desc:
+            size += desc["MASK"]["SIZE"]
+        return size
+
+    def rows(self, table, on_column=None):
+        """Get the dicts of the items of a table.
+
+        Args:
+            on_column : callable, optional
+                Callback of on_column(num_bytes), which is called
+                with the bytes of each column after it is decoded.
+        """
+        num_rows = self.num_rows(table)
+        rows = [{} for _ in range(num_rows)]
+        for desc in self._header["TABLES"][table]["COLUMNS"]:
+            name = desc["NAME"]
+            values = self.values(table, name)
+            mask = self.mask(table, name)
+            if mask is None:
+                for row, value in zip(rows, values):
+                    row[name] = value
+            else:
+                for row, value, present in zip(rows, values, mask.tolist()):
+                    if present:
+                        row[name] = value
+
+            if on_column:
+                on_column(self._column_size(desc))
+        return rows
+
+    def _create_column_reporter(self, progress):
+        """Create the callback of rows() reporting the bytes of file
+           decoded so far as progress("read", num_read, total).
+        """
+        total = len(self._mmap)
+        num_read = total - sum(self._column_size(desc)
+                               for table in _TABLES
+                               for desc in self._header["TABLES"][table]["COLUMNS"])
+
+        def on_column(num_bytes):
+            nonlocal num_read
+            num_read += num_bytes
+            progress("read", num_read, total)
+
+        return on_column
+
+    def to_dict(self, progress=None):
+        """Get the dict of network, which is the same as Network.to_dict().
+
+        Args:
+            progress : callable, optional
+                Callback of progress("read", num_read, total), which is
+                called with the bytes of file decoded after each column.
+                The header and the string table are counted as read first.
+        """
+        on_column = self._create_column_reporter(progress) if progress else None
+
+        dict_net = dict(self._header["NETWORK"])
+        for table in _TABLES:
+            dict_net[table] = self.rows(table, on_column)
+        return dict_net
+# end of class
+
+
+def read_metadata_from_nzb(fpath):
+    with NzbFile(fpath) as nzb:
+        metadata = dict(nzb.metadata)
+
+    metadata["INTERACTIONS"] = defaultdict(int, metadata["INTERACTIONS"])
+    return metadata
+
+
+def read_nzb(fpath, edge_map, headless=False, progress=None):
+    """Read a network from a NZB file.
+
+    Args:
+        progress : callable, optional
+            Callback of progress(stage, num_done, total). See read_nzj().
+            The file is mapped in memory, so the bytes are reported
+            as the columns are decoded.
+    """
+    with NzbFile(fpath) as nzb:
+        dict_net = nzb.to_dict(progress=progress)
+
+    map_edge_heads(dict_net["EDGES"], edge_map)
+    return Network.from_dict(dict_net, headless=headless, progress=progress)
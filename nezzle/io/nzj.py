@@ -1,4 +1,8 @@
+import os
+import io
+import re
 import json
+import gzip
 import codecs
 from collections import defaultdict
 
@@ -22,52 +26,366 @@ class NpEncoder(json.JSONEncoder):
         return super(NpEncoder, self).default(obj)
 # end of class
 
-def read_metadata_from_nzj(fpath):
-    metadata = {}
+# Extensions of the compressed NZJ files (e.g., network.nzj.gz).
+COMPRESSED_EXTENSIONS = ('.gz', '.zst')
+
+
+def is_nzj(fpath):
+    """Check whether a file is a NZJ file, which can be compressed.
+    """
+    file_name_ext = os.path.basename(fpath).casefold()
+    for ext in COMPRESSED_EXTENSIONS:
+        if file_name_ext.endswith(ext):
+            file_name_ext = file_name_ext[:-len(ext)]
+            break
+
+    return file_name_ext.endswith('.nzj') or file_name_ext.endswith('.json')
+
+
+class ProgressReader(io.RawIOBase):
+    """Binary file reporting the number of bytes read so far
+       as progress("read", num_read, total).
+
+    The progress is reported for every report_size bytes.
+    """
+
+    def __init__(self, fin, total, progress, report_size=1 << 20):
+        super().__init__()
+        self._fin = fin
+        self._total = total
+        self._progress = progress
+        self._report_size = report_size
+        self._num_read = 0
+        self._num_reported = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        num_read = self._fin.readinto(buffer)
+        if num_read:
+            self._num_read += num_read
+            if self._num_read - self._num_reported >= self._report_size:
+                self._num_reported = self._num_read
+                self._progress("read", self._num_read, self._total)
+        return num_read
+
+    def close(self):
+        if not self.closed:
+            self._fin.close()
+            if self._num_read != self._num_reported:
+                self._progress("read", self._num_read, self._total)
+        super().close()
+# end of class
+
+
+def open_nzj(fpath, mode="r", fileobj=None):
+    """Open a NZJ file as a text file, which is compressed
+       according to its extension.
+
+    Args:
+        fpath : str
+            Path of NZJ file. The file is compressed with gzip for '.gz'
+            and zstd for '.zst' (the zstandard package is required).
+        mode : str
+            'r' for reading and 'w' for writing.
+        fileobj : binary file, optional
+            File from which the NZJ file is read instead of opening the path
+            (e.g., ProgressReader). It is closed by the caller.
+    """
+    source = fpath if fileobj is None else fileobj
+    file_name_ext = os.path.basename(fpath).casefold()
+    if file_name_ext.endswith('.gz'):
+        return gzip.open(source, mode + "t", encoding="utf-8")
+    elif file_name_ext.endswith('.zst'):
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("zstandard is required for the zstd compressed "
+                              "NZJ file: %s" % (fpath))
+
+        return zstandard.open(source, mode + "t", encoding="utf-8",
+                              closefd=fileobj is None)
+
+    if fileobj is not None:
+        return io.TextIOWrapper(io.BufferedReader(fileobj), encoding="utf-8")
+
+    return codecs.open(fpath, mode, encoding="utf-8")
+
+
+class JsonStreamReader(object):
+    """Pull parser that walks a JSON document in a file
+    without materializing the whole document.
+
+    Only the values requested with read_value() are decoded,
+    and the others are skipped by scanning their brackets and strings.
+    The size of buffer is bounded by the chunk size and
+    the largest value read at once.
+    """
+
+    _regex_token = re.compile(r'[\[\]{}"]')
+    _regex_string = re.compile(r'"(?:[^"\\]|\\.)*"')
+    _regex_space = re.compile(r'\s*')
+
+    def __init__(self, fin, chunk_size=1 << 20):
+        self._fin = fin
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _read_chunk(self):
+        if self._eof:
+            return False
+
+        chunk = self._fin.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+
+        # Discard the consumed part of buffer.
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """Get the next non-whitespace character without consuming it.
+        """
+        while True:
+            self._pos = self._regex_space.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._read_chunk():
+                return ''
+
+    def expect(self, chars):
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError("Expected one of '%s', but got '%s'." % (chars, ch))
+
+        self._pos += 1
+        return ch
+
+    def read_value(self):
+        """Decode the next value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number at the end of buffer may be continued.
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            if not self._read_chunk():
+                value, self._pos = self._decoder.raw_decode(self._buffer, self._pos)
+                return value
+
+    def skip_value(self):
+        """Skip the next value without decoding it.
+        """
+        if self.peek() not in '[{':
+            self.read_value()
+            return
+
+        depth = 0
+        while True:
+            match = self._regex_token.search(self._buffer, self._pos)
+            if not match:
+                self._pos = len(self._buffer)
+                if not self._read_chunk():
+                    raise ValueError("Unexpected end of JSON document.")
+                continue
+
+            ch = match.group()
+            if ch == '"':
+                match_str = self._regex_string.match(self._buffer, match.start())
+                if not match_str:  # The string continues in the next chunk.
+                    self._pos = match.start()
+                    if not self._read_chunk():
+                        raise ValueError("Unterminated string in JSON document.")
+                    continue
+
+                self._pos = match_str.end()
+                continue
+
+            self._pos = match.end()
+            if ch in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def iter_object(self):
+        """Iterate the keys of the next object.
+
+        The value of each key should be read or skipped by the caller
+        before the next iteration.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            if self.expect(',}') == '}':
+                return
+
+    def iter_array(self):
+        """Iterate the values of the next array.
+        """
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+
+        while True:
+            yield self.read_value()
+            if self.expect(',]') == ']':
+                return
+
+
+def count_interactions(heads):
     interactions = defaultdict(int)
-    with codecs.open(fpath, "r", encoding="utf-8") as fin:
-        dict_net = json.loads(fin.read())
+    for head in heads:
+        if head:
+            interactions[head["ITEM_TYPE"].title()] += 1
 
-    for edge in dict_net["EDGES"]:
-        if edge["HEAD"]:
-            str_head_type = edge["HEAD"]["ITEM_TYPE"].title()
-            interactions[str_head_type] += 1
-        else:
-            interactions["None"] += 1
+    return interactions
+
+
+def read_metadata_from_nzj(fpath):
+    """Read the metadata of network from a NZJ file.
+
+    The metadata header written by write_nzj() is returned immediately
+    if it exists. Otherwise, the edges are scanned one by one
+    without loading the whole document.
+    """
+    metadata = {}
+    with open_nzj(fpath, "r") as fin:
+        reader = JsonStreamReader(fin)
+        for key in reader.iter_object():
+            if key == "METADATA":
+                metadata = reader.read_value()
+                metadata["INTERACTIONS"] = defaultdict(int, metadata["INTERACTIONS"])
+                return metadata
+            elif key == "NAME":
+                metadata["NETWORK_NAME"] = reader.read_value()
+            elif key == "EDGES":
+                heads = (edge["HEAD"] for edge in reader.iter_array())
+                metadata["INTERACTIONS"] = count_interactions(heads)
+            else:
+                reader.skip_value()
 
-    metadata["NETWORK_NAME"] = dict_net["NAME"]
-    metadata["INTERACTIONS"] = interactions
     return metadata
 # end of def
 
 
-def read_nzj(fpath, edge_map):
-    with codecs.open(fpath, "r", encoding="utf-8") as fin:
-        dict_net = json.loads(fin.read())
+def map_edge_heads(list_edges, edge_map):
+    """Change the head types of edge dicts according to the edge map,
+       which maps the head types in a file (e.g., "Triangle" or "None")
+       to the head types of network.
+       The head types are kept if the edge map is None.
+    """
+    if edge_map is None:
+        return
 
-        for edge in dict_net["EDGES"]:
-            if not edge["HEAD"]:
-                edge["HEAD"] = {}
-                head_type_new = edge_map["None"]
-                ArrowClass = ArrowClassFactory.create(head_type_new)
-                if ArrowClass:
-                    edge["HEAD"]["ITEM_TYPE"] = edge_map["None"].upper()
-                    edge["HEAD"]["WIDTH"] = ArrowClass.DEFAULT_WIDTH
-                    edge["HEAD"]["HEIGHT"] = ArrowClass.DEFAULT_HEIGHT
-                    edge["HEAD"]["OFFSET"] = ArrowClass.DEFAULT_OFFSET
+    for edge in list_edges:
+        if not edge["HEAD"]:
+            edge["HEAD"] = {}
+            head_type_new = edge_map["None"]
+            ArrowClass = ArrowClassFactory.create(head_type_new)
+            if ArrowClass:
+                edge["HEAD"]["ITEM_TYPE"] = edge_map["None"].upper()
+                edge["HEAD"]["WIDTH"] = ArrowClass.DEFAULT_WIDTH
+                edge["HEAD"]["HEIGHT"] = ArrowClass.DEFAULT_HEIGHT
+                edge["HEAD"]["OFFSET"] = ArrowClass.DEFAULT_OFFSET
 
-            else:
-                head_type_ori = edge["HEAD"]["ITEM_TYPE"].title()
-                head_type_new = edge_map[head_type_ori]
-                edge["HEAD"]["ITEM_TYPE"] = head_type_new.upper()
+        else:
+            head_type_ori = edge["HEAD"]["ITEM_TYPE"].title()
+            head_type_new = edge_map[head_type_ori]
+            edge["HEAD"]["ITEM_TYPE"] = head_type_new.upper()
+# end of def
 
 
+def read_nzj(fpath, edge_map, headless=False, progress=None):
+    """Read a network from a NZJ file.
+
+    Args:
+        progress : callable, optional
+            Callback of progress(stage, num_done, total), which is called
+            with the bytes of file read ("read") and the items built ("build").
+            Reading is aborted by an exception raised from the callback.
+    """
+    if progress is None:
+        with open_nzj(fpath, "r") as fin:
+            dict_net = json.loads(fin.read())
+    else:
+        fraw = ProgressReader(open(fpath, "rb"), os.path.getsize(fpath), progress)
+        with fraw, open_nzj(fpath, "r", fileobj=fraw) as fin:
+            dict_net = json.loads(fin.read())
 
-    return Network.from_dict(dict_net)
+    map_edge_heads(dict_net["EDGES"], edge_map)
+    return Network.from_dict(dict_net, headless=headless, progress=progress)
 # end of def
 
 
-def write_nzj(net, fpath):
-    with codecs.open(fpath, "w", encoding="utf-8") as fout:
-        fout.write(json.dumps(net.to_dict(), cls=NpEncoder))
+def write_nzj(net, fpath, metadata=True):
+    """Write a network to a NZJ file.
+
+    The items are serialized and written one at a time,
+    so the whole document is not built in memory.
+
+    Args:
+        net : Network
+            Network to write.
+        fpath : str
+            Path of NZJ file, which is compressed according to
+            its extension (e.g., '.nzj.gz'). See open_nzj().
+        metadata : bool
+            If True, the metadata of network is written as the first item
+            of the document, which makes read_metadata_from_nzj() respond
+            without scanning the edges.
+    """
+    encoder = NpEncoder()
+    dict_net = net.to_header_dict()
+
+    with open_nzj(fpath, "w") as fout:
+        fout.write("{")
+        if metadata:
+            heads = (edge.head.to_dict() if edge.head else None
+                     for edge in net.edges.values())
+            dict_metadata = {"NETWORK_NAME": dict_net["NAME"],
+                             "INTERACTIONS": count_interactions(heads)}
+            fout.write('"METADATA": %s, ' % (encoder.encode(dict_metadata)))
+
+        for key, value in dict_net.items():
+            fout.write('%s: %s, ' % (encoder.encode(key), encoder.encode(value)))
+
+        tables = (("NODES", net.iter_node_dicts()),
+                  ("EDGES", net.iter_edge_dicts()),
+                  ("LABELS", net.iter_label_dicts()))
+
+        for i, (key, dicts) in enumerate(tables):
+            if i > 0:
+                fout.write(", ")
+
+            fout.write('"%s": [' % (key))
+            for j, dict_item in enumerate(dicts):
+                if j > 0:
+                    fout.write(", ")
+                fout.write(encoder.encode(dict_item))
+            fout.write("]")
+
+        fout.write("}")
 # end of def
@@ -1,12 +1,16 @@
 import os
 import codecs
 from collections import defaultdict
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
 import math
-import random
+
+import numpy as np
 
 from qtpy.QtCore import Qt
 from qtpy.QtCore import QPointF
 from qtpy.QtGui import QColor
+from qtpy.QtGui import QFont
 
 from nezzle.graphics import NodeClassFactory
 from nezzle.graphics import EdgeClassFactory
@@ -15,6 +19,7 @@ from nezzle.graphics import ArrowClassFactory
 from nezzle.graphics import Network
 from nezzle.utils.math import rotate, dist, internal_division
 from nezzle.constants import DEFAULT_SCENE_WIDTH, DEFAULT_SCENE_HEIGHT
+from nezzle.constants import PROGRESS_INTERVAL
 
 
 def read_metadata_from_sif(fpath):
@@ -35,119 +40,265 @@ def read_metadata_from_sif(fpath):
 # end of def
 
 
-def read_sif(fpath, edge_map=None):
-
-    scene_width = DEFAULT_SCENE_WIDTH
-    scene_height = DEFAULT_SCENE_HEIGHT
-
-    fname = os.path.basename(fpath)
-    net = Network(fname)
-    net.scene.setBackgroundBrush(Qt.transparent)
-
-    with codecs.open(fpath, "r", encoding="utf-8-sig") as fin:
-        NodeClass = NodeClassFactory.create("ELLIPSE_NODE")
-        nodes = {}
-        counter_node = 0
-        counter_edge = 0
-        for i, line in enumerate(fin):
-            if line.isspace():
+def _parse_sif_chunk(fpath, beg=0, end=None):
+    """Tokenize the lines of a SIF file in the byte range [beg, end).
+
+    The identifiers of nodes and edge types are interned in the order
+    of their first appearance within the chunk.
+    """
+    with open(fpath, "rb") as fin:
+        fin.seek(beg)
+        data = fin.read() if end is None else fin.read(end - beg)
+
+    text = data.decode("utf-8-sig" if beg == 0 else "utf-8")
+
+    nodes = {}
+    edge_types = {}
+    edges = []
+    for line in text.splitlines():
+        items = line.split()
+        if not items:
+            continue
+
+        str_src, str_edge_type, str_trg = items[:3]
+        edges.append(nodes.setdefault(str_src, len(nodes)))
+        edges.append(edge_types.setdefault(str_edge_type, len(edge_types)))
+        edges.append(nodes.setdefault(str_trg, len(nodes)))
+
+    return list(nodes), list(edge_types), np.array(edges, dtype=np.int64)
+
+
+def _split_file(fpath, num_chunks):
+    """Split a file into byte ranges at the line boundaries.
+    """
+    size = os.path.getsize(fpath)
+    bounds = [0]
+    with open(fpath, "rb") as fin:
+        for i in range(1, num_chunks):
+            fin.seek(max(size * i // num_chunks, bounds[-1]))
+            fin.readline()
+            pos = fin.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+
+    bounds.append(size)
+    return bounds[:-1], bounds[1:]
+
+
+def _iter_chunks(fpath, begs, ends, num_workers):
+    """Tokenize the chunks of file in order, across processes if needed.
+    """
+    if num_workers <= 1:
+        for beg, end in zip(begs, ends):
+            yield _parse_sif_chunk(fpath, beg, end)
+        return
+
+    with ProcessPoolExecutor(num_workers) as executor:
+        futures = [executor.submit(_parse_sif_chunk, fpath, beg, end)
+                   for beg, end in zip(begs, ends)]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # Do not wait for the pending chunks if it has been aborted.
+            for future in futures:
+                future.cancel()
+
+
+def parse_sif(fpath, num_workers=1, progress=None, chunk_size=1 << 20):
+    """Tokenize a SIF file into the arrays of interned identifiers.
+
+    This is the first phase of read_sif(), which creates no graphics item.
+    Very large files can be tokenized in parallel chunks across processes.
+
+    Args:
+        fpath : str
+            Path of SIF file.
+        num_workers : int
+            The number of processes to tokenize the chunks of file.
+        progress : callable, optional
+            Callback of progress("read", num_read, total), which is called
+            with the bytes of file tokenized after each chunk.
+            Parsing is aborted by an exception raised from the callback.
+        chunk_size : int
+            Approximate number of bytes in a chunk.
+
+    Returns:
+        nodes : list
+            Identifiers of nodes in the order of their first appearance.
+        edge_types : list
+            Edge types in the order of their first appearance.
+        edges : numpy.ndarray
+            (M, 3) array of the indices of source, edge type and target
+            in the order of lines.
+    """
+    size = os.path.getsize(fpath)
+    num_chunks = max(num_workers, math.ceil(size / chunk_size), 1)
+    begs, ends = _split_file(fpath, num_chunks)
+
+    # Merge the identifiers interned in each chunk.
+    nodes = {}
+    edge_types = {}
+    arrays = []
+    with closing(_iter_chunks(fpath, begs, ends, num_workers)) as chunks:
+        for end, chunk in zip(ends, chunks):
+            chunk_nodes, chunk_edge_types, chunk_edges = chunk
+            map_nodes = np.array([nodes.setdefault(iden, len(nodes))
+                                  for iden in chunk_nodes], dtype=np.int64)
+            map_edge_types = np.array([edge_types.setdefault(iden, len(edge_types))
+                                       for iden in chunk_edge_types],
+                                      dtype=np.int64)
+            if progress:
+                progress("read", end, size)
+
+            if chunk_edges.size == 0:
                 continue
 
-            items = line.split()
-            str_src, str_edge_type, str_trg = items[:3]
-
-            if edge_map and (str_edge_type not in edge_map):
+            chunk_edges = chunk_edges.reshape(-1, 3)
+            arrays.append(np.column_stack([map_nodes[chunk_edges[:, 0]],
+                                           map_edge_types[chunk_edges[:, 1]],
+                                           map_nodes[chunk_edges[:, 2]]]))
+
+    if arrays:
+        edges = np.concatenate(arrays)
+    else:
+        edges = np.empty((0, 3), dtype=np.int64)
+
+    return list(nodes), list(edge_types), edges
+
+
+def read_sif(fpath, edge_map=None, headless=False, num_workers=1,
+             progress=None):
+    """Read a network from a SIF file.
+
+    The file is tokenized first (see parse_sif), and then the graphics
+    items are created in a single pass.
+
+    Args:
+        fpath : str
+            Path of SIF file.
+        edge_map : dict, optional
+            Dict of edge types to the types of heads (e.g., 'TRIANGLE').
+        headless : bool
+            Create the network without the scene.
+        num_workers : int
+            The number of processes to tokenize the file.
+        progress : callable, optional
+            Callback of progress(stage, num_done, total), which is called
+            with the bytes of file tokenized ("read") and
+            the items built ("build").
+            Reading is aborted by an exception raised from the callback.
+    """
+    str_nodes, str_edge_types, edges = parse_sif(fpath, num_workers,
+                                                 progress=progress)
+
+    if edge_map:
+        for str_edge_type in str_edge_types:
+            if str_edge_type not in edge_map:
                 raise ValueError("Undefined edge type: %s"%(str_edge_type))
 
-            color = Qt.white
-            half_width = scene_width/2
-            half_height = scene_height/2
-
-            range_x = (-scene_width/4, scene_width/4)
-            range_y = (-scene_height/4, scene_height/4)
-
-            sx = half_width + random.uniform(*range_x)
-            sy = half_height + random.uniform(*range_y)
-
-            tx = half_width + random.uniform(*range_x)
-            ty = half_height + random.uniform(*range_y)
-
-            width = 50
-            height = 35
-
-            if str_src in nodes:
-                src = nodes[str_src]
-            else:
-                counter_node += 1
-                src = NodeClass(str_src, width=width, height=height,
-                                pos=QPointF(sx, sy))
-
-                src["FILL_COLOR"] = color
-                src['BORDER_COLOR'] = Qt.darkGray
-                nodes[str_src] = src
-            # end of else
-
-            if str_trg in nodes:
-                trg = nodes[str_trg]
-            else:
-                counter_node += 1
-                trg = NodeClass(str_trg, width=width, height=height,
-                                pos=QPointF(tx, ty))
-
-                trg["FILL_COLOR"] = color
-                trg['BORDER_COLOR'] = Qt.darkGray
-                nodes[str_trg] = trg
-            # end of else
-
-            counter_edge += 1
-
-            head = None
-            ArrowClass = None
-
-            if edge_map:
-                head_type = edge_map[str_edge_type]
-                ArrowClass = ArrowClassFactory.create(head_type)
-
-            if ArrowClass:
-                head = ArrowClass()
-
-            if str_src == str_trg: # Self-loop edge
-                EdgeClass = EdgeClassFactory.create('SELFLOOP_EDGE')
-                iden = "%s%s%s" % (str_src, str_edge_type, str_src)
-                edge = EdgeClass(iden=iden,
-                                 name=str_edge_type,
-                                 node=src,
-                                 head=head)
-
-                edge["FILL_COLOR"] = QColor(100, 100, 100, 100)
+    scene_width = DEFAULT_SCENE_WIDTH
+    scene_height = DEFAULT_SCENE_HEIGHT
 
-            else:
-                EdgeClass = EdgeClassFactory.create('CURVED_EDGE')
-                iden = "%s%s%s" % (str_src, str_edge_type, str_trg)
-                edge = EdgeClass(iden=iden,
-                                 name= str_edge_type,
-                                 source=src, target=trg,
-                                 head=head)
-
-                edge["FILL_COLOR"] = Qt.black
-
-            src.add_edge(edge)
-            trg.add_edge(edge)
-            net.add_edge(edge)
-        # end of for: reading each line of SIF file
-
-        # Add nodes and labels in network
-        LabelClass = LabelClassFactory.create("TEXT_LABEL")
-        for str_name, node in nodes.items():
-            net.add_node(node)
-            label = LabelClass(node, str_name)
-            label["FONT_FAMILY"] = "Tahoma"
-            label["FONT_SIZE"] = 10
-            rect = label.boundingRect()
-            label.setPos(-rect.width()/2, -rect.height()/2)
-            net.add_label(label)
-            nodes[str_name] = node
-    # end of with
+    fname = os.path.basename(fpath)
+    net = Network(fname, headless=headless)
+    net.background_color = Qt.transparent
+
+    # Create the nodes at random positions.
+    half_width = scene_width/2
+    half_height = scene_height/2
+
+    range_x = (-scene_width/4, scene_width/4)
+    range_y = (-scene_height/4, scene_height/4)
+
+    num_nodes = len(str_nodes)
+    num_items = 2*num_nodes + len(edges)  # Nodes, their labels and edges
+    num_built = 0
+
+    xs = half_width + np.random.uniform(*range_x, size=num_nodes)
+    ys = half_height + np.random.uniform(*range_y, size=num_nodes)
+
+    width = 50
+    height = 35
+    NodeClass = NodeClassFactory.create("ELLIPSE_NODE")
+    nodes = []
+    for str_name, x, y in zip(str_nodes, xs.tolist(), ys.tolist()):
+        node = NodeClass(str_name, width=width, height=height,
+                         pos=QPointF(x, y))
+        node["FILL_COLOR"] = Qt.white
+        node['BORDER_COLOR'] = Qt.darkGray
+        nodes.append(node)
+
+        num_built += 1
+        if progress and num_built % PROGRESS_INTERVAL == 0:
+            progress("build", num_built, num_items)
+
+    # The heads of the same type share their attributes.
+    heads = []
+    for str_edge_type in str_edge_types:
+        ArrowClass = None
+        if edge_map:
+            ArrowClass = ArrowClassFactory.create(edge_map[str_edge_type])
+        heads.append(ArrowClass() if ArrowClass else None)
+
+    # Create the edges.
+    SelfloopEdgeClass = EdgeClassFactory.create('SELFLOOP_EDGE')
+    CurvedEdgeClass = EdgeClassFactory.create('CURVED_EDGE')
+    color_selfloop = QColor(100, 100, 100, 100)
+    items = []
+    for ix_src, ix_edge_type, ix_trg in edges.tolist():
+        src = nodes[ix_src]
+        trg = nodes[ix_trg]
+        str_edge_type = str_edge_types[ix_edge_type]
+        head = heads[ix_edge_type]
+        if head:
+            head = head.copy(cow=True)
+
+        iden = "%s%s%s" % (src.iden, str_edge_type, trg.iden)
+        if ix_src == ix_trg:  # Self-loop edge
+            edge = SelfloopEdgeClass(iden=iden,
+                                     name=str_edge_type,
+                                     node=src,
+                                     head=head)
+
+            edge["FILL_COLOR"] = color_selfloop
+        else:
+            edge = CurvedEdgeClass(iden=iden,
+                                   name=str_edge_type,
+                                   source=src, target=trg,
+                                   head=head)
+
+            edge["FILL_COLOR"] = Qt.black
+
+        items.append(edge)
+
+        num_built += 1
+        if progress and num_built % PROGRESS_INTERVAL == 0:
+            progress("build", num_built, num_items)
+    # end of for: creating each edge
+
+    net.add_edges(items)
+
+    # Add nodes and labels in network
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+    font = QFont()
+    font.setFamily("Tahoma")
+    font.setPixelSize(10)
+    labels = []
+    for node in nodes:
+        label = LabelClass(node, node.iden, font)
+        rect = label.boundingRect()
+        label.setPos(-rect.width()/2, -rect.height()/2)
+        labels.append(label)
+
+        num_built += 1
+        if progress and num_built % PROGRESS_INTERVAL == 0:
+            progress("build", num_built, num_items)
+
+    net.add_nodes(nodes)
+    net.add_labels(labels)
 
     for src, trg, attr in net.nxgraph.edges(data=True):
         if net.nxgraph.has_edge(trg, src):
@@ -160,6 +311,9 @@ def read_sif(fpath, edge_map=None):
             cp = rotate(edge.pos_src, mid, -30, d)
             edge.ctrl_point.setPos(cp)
 
+    if progress:
+        progress("build", num_items, num_items)
+
     return net
 # end of def
 
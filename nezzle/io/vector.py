@@ -0,0 +1,378 @@
+"""Vector images (SVG and PDF) of the scene of network.
+
+The items are walked in the stacking order of the scene, and each item
+is written as a vector primitive: a path of its shape (the cached path
+of an edge), an ellipse or rect of a node, or a text of a label.
+Thus, the size of file is proportional to the number of items,
+not to the area of image in pixels.
+"""
+
+from xml.sax.saxutils import escape
+
+from qtpy.QtCore import Qt
+from qtpy.QtCore import QPointF
+from qtpy.QtCore import QRectF
+from qtpy.QtCore import QSizeF
+from qtpy.QtCore import QMarginsF
+from qtpy.QtGui import QColor
+from qtpy.QtGui import QFontInfo
+from qtpy.QtGui import QFontMetricsF
+from qtpy.QtGui import QPageSize
+from qtpy.QtGui import QPainter
+from qtpy.QtGui import QPainterPath
+from qtpy.QtGui import QPdfWriter
+from qtpy.QtGui import QTransform
+
+from nezzle.graphics import BaseNode
+from nezzle.graphics import EllipseNode
+from nezzle.graphics import RectangleNode
+from nezzle.graphics import BaseEdge
+from nezzle.graphics import TextLabel
+from nezzle.graphics.labels.textlabel import TEXT_MARGIN
+from nezzle.io.image import SceneRenderer
+
+
+_SVG_JOINS = {Qt.MiterJoin: "miter",
+              Qt.SvgMiterJoin: "miter",
+              Qt.RoundJoin: "round",
+              Qt.BevelJoin: "bevel"}
+
+_SVG_CAPS = {Qt.SquareCap: "square",
+             Qt.FlatCap: "butt",
+             Qt.RoundCap: "round"}
+
+# Dash patterns of Qt in the units of pen width
+_SVG_DASHES = {Qt.DashLine: (4, 2),
+               Qt.DotLine: (1, 2),
+               Qt.DashDotLine: (4, 2, 1, 2),
+               Qt.DashDotDotLine: (4, 2, 1, 2, 1, 2)}
+
+
+def _num(value):
+    """Format a coordinate with two decimal places at most.
+    """
+    text = ("%.2f" % value).rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _is_visible_color(color):
+    return color.isValid() and color.alpha() > 0
+
+
+def iter_primitives(net):
+    """Iterate the vector primitives of the items in the stacking order.
+
+    Yields:
+        (kind, item, geometry) where kind is one of "ellipse", "rect",
+        "path" and "text". The geometry is a QRectF of the scene for
+        "ellipse" and "rect", a QPainterPath of the scene for "path",
+        and a QPointF of the top-left of text for "text".
+    """
+    for item in net.scene.items(Qt.AscendingOrder):
+        if not item.isVisible():
+            continue
+
+        if isinstance(item, TextLabel):
+            if item.text:
+                yield "text", item, item.mapToScene(QPointF(TEXT_MARGIN,
+                                                            TEXT_MARGIN))
+            continue
+        elif not isinstance(item, (BaseNode, BaseEdge)):
+            continue  # Control points and the others are not exported.
+
+        transform = item.sceneTransform()
+        is_translated = transform.type() <= QTransform.TxTranslate
+        if is_translated and isinstance(item, (EllipseNode, RectangleNode)):
+            kind = "ellipse" if isinstance(item, EllipseNode) else "rect"
+            rect = item.shape().boundingRect()
+            yield kind, item, rect.translated(transform.dx(), transform.dy())
+        else:
+            # The path of an edge is cached until its geometry is changed.
+            yield "path", item, transform.map(item.shape())
+# end of def iter_primitives
+
+
+class SvgStyleSheet(object):
+    """Deduplicate the styles of items into the classes of CSS.
+
+    Most items share a few pooled pens, colors and fonts,
+    so the number of classes is much smaller than that of items.
+    """
+
+    def __init__(self):
+        self._classes = {}
+        self._rules = []
+
+    def __len__(self):
+        return len(self._classes)
+
+    def _get_class(self, key, create_rule):
+        name = self._classes.get(key)
+        if name is None:
+            name = "s%d" % (len(self._classes))
+            self._classes[key] = name
+            self._rules.append(".%s{%s}" % (name, create_rule()))
+        return name
+
+    def get_shape_class(self, item, fill_rule=Qt.OddEvenFill):
+        pen, color = item.pen, item.fill_color
+        key = ("shape", pen.widthF(), pen.color().rgba(), int(pen.style()),
+               int(pen.joinStyle()), int(pen.capStyle()),
+               color.rgba() if color.isValid() else None, int(fill_rule))
+
+        return self._get_class(key, lambda: self._shape_rule(pen, color, fill_rule))
+
+    def get_text_class(self, item):
+        font, color = item.font, item.text_color
+        key = ("text", font.key(), color.rgba())
+        return self._get_class(key, lambda: self._text_rule(font, color))
+
+    @staticmethod
+    def _paint_rule(prop, color):
+        if not _is_visible_color(color):
+            return ["%s:none" % (prop)]
+
+        rule = ["%s:%s" % (prop, color.name(QColor.HexRgb))]
+        if color.alpha() < 255:
+            rule.append("%s-opacity:%s" % (prop, _num(color.alphaF())))
+        return rule
+
+    def _shape_rule(self, pen, color, fill_rule):
+        rule = self._paint_rule("fill", color)
+        if fill_rule == Qt.WindingFill:
+            rule.append("fill-rule:nonzero")
+        else:
+            rule.append("fill-rule:evenodd")
+
+        if pen.style() == Qt.NoPen or not _is_visible_color(pen.color()):
+            rule.append("stroke:none")
+            return ";".join(rule)
+
+        rule.extend(self._paint_rule("stroke", pen.color()))
+        width = pen.widthF()
+        if width > 0:
+            rule.append("stroke-width:%s" % (_num(width)))
+        else:
+            # A pen of zero width is cosmetic in Qt.
+            rule.append("stroke-width:1;vector-effect:non-scaling-stroke")
+            width = 1
+
+        rule.append("stroke-linejoin:%s" % _SVG_JOINS.get(pen.joinStyle(), "miter"))
+        rule.append("stroke-linecap:%s" % _SVG_CAPS.get(pen.capStyle(), "square"))
+        dashes = _SVG_DASHES.get(pen.style())
+        if dashes:
+            rule.append("stroke-dasharray:%s"
+                        % ",".join(_num(width*d) for d in dashes))
+        return ";".join(rule)
+
+    def _text_rule(self, font, color):
+        rule = ["font-family:'%s'" % (font.family().replace("'", "\\'"))]
+        # The size in points is resolved in pixels as the scene lays out the text.
+        rule.append("font-size:%dpx" % (QFontInfo(font).pixelSize()))
+        if font.bold():
+            rule.append("font-weight:bold")
+        if font.italic():
+            rule.append("font-style:italic")
+        rule.extend(self._paint_rule("fill", color))
+        return ";".join(rule)
+
+    def to_css(self):
+        return "\n".join(self._rules)
+# end of class SvgStyleSheet
+
+
+def _to_svg_path_data(path):
+    """Convert a QPainterPath into the path data of SVG.
+    """
+    cmds = []
+    i = 0
+    num_elements = path.elementCount()
+    while i < num_elements:
+        elem = path.elementAt(i)
+        if elem.type == QPainterPath.MoveToElement:
+            cmds.append("M%s %s" % (_num(elem.x), _num(elem.y)))
+        elif elem.type == QPainterPath.LineToElement:
+            cmds.append("L%s %s" % (_num(elem.x), _num(elem.y)))
+        elif elem.type == QPainterPath.CurveToElement:
+            # A curve is followed by the data of second control and end points.
+            c2 = path.elementAt(i + 1)
+            end = path.elementAt(i + 2)
+            cmds.append("C%s %s %s %s %s %s" % (_num(elem.x), _num(elem.y),
+                                               _num(c2.x), _num(c2.y),
+                                               _num(end.x), _num(end.y)))
+            i += 2
+        i += 1
+
+    return "".join(cmds)
+
+
+def _to_svg_element(kind, item, geometry, styles):
+    if kind == "text":
+        cls = styles.get_text_class(item)
+        metrics = QFontMetricsF(item.font)
+        x = _num(geometry.x())
+        y = geometry.y() + metrics.ascent()
+        lines = item.text.split("\n")
+        if len(lines) == 1:
+            return '<text class="%s" x="%s" y="%s">%s</text>\n' \
+                   % (cls, x, _num(y), escape(lines[0]))
+
+        spans = ['<tspan x="%s" y="%s">%s</tspan>'
+                 % (x, _num(y + i*metrics.lineSpacing()), escape(line))
+                 for i, line in enumerate(lines)]
+        return '<text class="%s">%s</text>\n' % (cls, "".join(spans))
+
+    elif kind == "ellipse":
+        cls = styles.get_shape_class(item)
+        center = geometry.center()
+        return '<ellipse class="%s" cx="%s" cy="%s" rx="%s" ry="%s"/>\n' \
+               % (cls, _num(center.x()), _num(center.y()),
+                  _num(geometry.width()/2), _num(geometry.height()/2))
+
+    elif kind == "rect":
+        cls = styles.get_shape_class(item)
+        return '<rect class="%s" x="%s" y="%s" width="%s" height="%s"/>\n' \
+               % (cls, _num(geometry.x()), _num(geometry.y()),
+                  _num(geometry.width()), _num(geometry.height()))
+
+    cls = styles.get_shape_class(item, geometry.fillRule())
+    return '<path class="%s" d="%s"/>\n' % (cls, _to_svg_path_data(geometry))
+
+
+def _svg_rect(rect, color):
+    return '<rect x="%s" y="%s" width="%s" height="%s" fill="%s"%s/>\n' \
+           % (_num(rect.x()), _num(rect.y()), _num(rect.width()), _num(rect.height()),
+              color.name(QColor.HexRgb),
+              ' fill-opacity="%s"' % _num(color.alphaF()) if color.alpha() < 255 else "")
+
+
+def _image_rect_in_scene(renderer):
+    """Get the rect of the scene covered by the whole image,
+       whose size is rounded in pixels.
+    """
+    transform, _ = renderer.transform.inverted()
+    return transform.mapRect(QRectF(0, 0, renderer.width, renderer.height))
+
+
+def write_svg(net,
+              fpath,
+              image_width=None, image_height=None,
+              transparent=True,
+              scale_width=200, scale_height=200,
+              pad_width=10, pad_height=10):
+    """Write an SVG image of the network.
+
+    The styles are collected into the classes of a style sheet at first,
+    and then the elements of items are streamed into the file.
+    """
+    renderer = SceneRenderer(net, "svg",
+                             image_width, image_height,
+                             transparent,
+                             scale_width, scale_height,
+                             pad_width, pad_height)
+    brect = _image_rect_in_scene(renderer)
+
+    styles = SvgStyleSheet()
+    for kind, item, geometry in iter_primitives(net):
+        if kind == "text":
+            styles.get_text_class(item)
+        elif kind == "path":
+            styles.get_shape_class(item, geometry.fillRule())
+        else:
+            styles.get_shape_class(item)
+
+    with open(fpath, "w", encoding="utf-8") as fout:
+        fout.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        fout.write('<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+                   'width="%d" height="%d" viewBox="%s %s %s %s" '
+                   'preserveAspectRatio="none">\n'
+                   % (renderer.width, renderer.height,
+                      _num(brect.x()), _num(brect.y()),
+                      _num(brect.width()), _num(brect.height())))
+        fout.write("<title>%s</title>\n" % (escape(str(net.name))))
+        fout.write("<style>\n%s\n</style>\n" % (styles.to_css()))
+
+        bg_color = net.scene.backgroundBrush().color()
+        if not transparent:
+            fout.write(_svg_rect(brect, QColor(Qt.white)))
+        if _is_visible_color(bg_color):
+            fout.write(_svg_rect(brect, bg_color))
+
+        for kind, item, geometry in iter_primitives(net):
+            fout.write(_to_svg_element(kind, item, geometry, styles))
+
+        fout.write("</svg>\n")
+# end of def write_svg
+
+
+def _paint_primitive(painter, kind, item, geometry):
+    if kind == "text":
+        painter.setFont(item.font)
+        painter.setPen(item.text_color)
+        metrics = QFontMetricsF(item.font)
+        y = geometry.y() + metrics.ascent()
+        for i, line in enumerate(item.text.split("\n")):
+            painter.drawText(QPointF(geometry.x(), y + i*metrics.lineSpacing()), line)
+        return
+
+    painter.setPen(item.pen)
+    if _is_visible_color(item.fill_color):
+        painter.setBrush(item.fill_color)
+    else:
+        painter.setBrush(Qt.NoBrush)
+
+    if kind == "ellipse":
+        painter.drawEllipse(geometry)
+    elif kind == "rect":
+        painter.drawRect(geometry)
+    else:
+        painter.drawPath(geometry)
+
+
+def write_pdf(net,
+              fpath,
+              image_width=None, image_height=None,
+              transparent=True,
+              scale_width=200, scale_height=200,
+              dpi_width=350, dpi_height=350,
+              pad_width=10, pad_height=10):
+    """Write a PDF document of a page of the network.
+
+    The primitives are painted directly with the PDF engine of Qt,
+    which shares the fonts and the graphics states in the document.
+    The page has the physical size of the image in the resolution.
+    """
+    renderer = SceneRenderer(net, "pdf",
+                             image_width, image_height,
+                             transparent,
+                             scale_width, scale_height,
+                             pad_width, pad_height)
+
+    writer = QPdfWriter(fpath)
+    writer.setTitle(str(net.name))
+    writer.setResolution(dpi_width)
+    # The size of page in points (1/72 inch)
+    writer.setPageSize(QPageSize(QSizeF(72 * renderer.width / dpi_width,
+                                        72 * renderer.height / dpi_height),
+                                 QPageSize.Point))
+    writer.setPageMargins(QMarginsF(0, 0, 0, 0))
+
+    painter = QPainter(writer)
+    painter.setRenderHints(QPainter.TextAntialiasing | QPainter.Antialiasing)
+
+    # The device pixels are scaled to the height in its own resolution.
+    painter.scale(1, dpi_width / dpi_height)
+    painter.setTransform(renderer.transform, True)
+
+    brect = _image_rect_in_scene(renderer)
+    bg_color = net.scene.backgroundBrush().color()
+    if not transparent:
+        painter.fillRect(brect, Qt.white)
+    if _is_visible_color(bg_color):
+        painter.fillRect(brect, bg_color)
+
+    for kind, item, geometry in iter_primitives(net):
+        _paint_primitive(painter, kind, item, geometry)
+
+    painter.end()
+# end of def write_pdf
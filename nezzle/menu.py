@@ -2,7 +2,6 @@ import os
 import sys
 from traceback import format_exc
 
-from qtpy.QtCore import Qt
 from qtpy.QtCore import QMimeData
 from qtpy.QtCore import QBuffer
 from qtpy.QtCore import QByteArray
@@ -10,21 +9,22 @@ from qtpy.QtCore import QIODevice
 from qtpy.QtCore import Slot
 
 from qtpy.QtWidgets import QWidget
+from qtpy.QtWidgets import QAction
 from qtpy.QtWidgets import QMessageBox
 from qtpy.QtWidgets import QDialog, QFileDialog
 from qtpy.QtWidgets import QApplication
 
 from qtpy.QtGui import QKeySequence
-from qtpy.QtGui import QImage
-from qtpy.QtGui import QPainter
 from qtpy.QtGui import QClipboard
 
 from nezzle.dialogs.opennetworkdialog import OpenNetworkDialog
 from nezzle.dialogs.exportimagedialog import ExportImageDialog
+from nezzle.dialogs.progressdialog import ProgressDialog
 
-from nezzle.io import read_network
 from nezzle.io import write_network
 from nezzle.io import write_image
+from nezzle.io import render_image
+from nezzle.io.loader import NetworkLoader
 
 from nezzle.systemstate import get_system_state
 from nezzle.constants import Lock
@@ -55,6 +55,18 @@ class MenuActionHandler(QWidget):
         self.openNetworkDialog = OpenNetworkDialog(parent=self.mw)
         self.exportImageDialog = ExportImageDialog(parent=self.mw)
 
+        # The network file is read in a worker thread,
+        # and the items are added to the scene in the time slices.
+        self.progressDialog = ProgressDialog(parent=self.mw)
+        self.networkLoader = NetworkLoader(self)
+        self.networkLoader.progressed.connect(self.on_loading_progressed)
+        self.networkLoader.loaded.connect(self.on_network_loaded)
+        self.networkLoader.failed.connect(self.on_loading_failed)
+        self.networkLoader.canceled.connect(self.progressDialog.close)
+        self.progressDialog.canceled.connect(self.networkLoader.cancel)
+        self._loading_fpath = None
+        self._loading_name = None
+
     def initialize_actions(self):
         # File
         self.mw.ui_actionOpenNetwork.triggered.connect(
@@ -102,6 +114,17 @@ class MenuActionHandler(QWidget):
              self.process_view_history_dock
         )
 
+        # View -> Level of Detail (off by default)
+        self.actionViewLevelOfDetail = QAction("Level of Detail", self.mw)
+        self.actionViewLevelOfDetail.setCheckable(True)
+        self.actionViewLevelOfDetail.setStatusTip(
+            "Paint the zoomed-out items in simplified forms.")
+        self.actionViewLevelOfDetail.triggered.connect(
+            self.process_view_level_of_detail
+        )
+        self.mw.ui_menuView.addSeparator()
+        self.mw.ui_menuView.addAction(self.actionViewLevelOfDetail)
+
         # Select -> Lock -> Lock Nodes, Lock Edges, Lock Labels
         self.mw.ui_actionLockNodes.triggered.connect(
             self.process_lock_nodes
@@ -189,44 +212,16 @@ class MenuActionHandler(QWidget):
             return
 
         net = item.data()
-        scene = net.scene
-        scene.clearSelection()
-        scene.clearFocus()
-        brect = scene.itemsBoundingRect()
-        brect.adjust(-5, -5, +10, +10)
 
         # Create a buffer
         data = QByteArray()
         buffer = QBuffer(data)
         buffer.open(QIODevice.WriteOnly)
 
-        scale_width = 200
-        scale_height = 200
-        dpi_width = 300
-        dpi_height = 300
-        image = QImage(int((scale_width / 100.0) * brect.width()),
-                       int((scale_height / 100.0) * brect.height()),
-                       QImage.Format_ARGB32_Premultiplied)
-
-        # dpm = 300 / 0.0254 # ~300 DPI
-        dpm_width = int(dpi_width / 0.0254)
-        dpm_height = int(dpi_height / 0.0254)
-        image.setDotsPerMeterX(dpm_width)
-        image.setDotsPerMeterY(dpm_height)
-        # bbrush = scene.backgroundBrush()
-        # image.fill(bbrush.color())
-        image.fill(Qt.transparent)
-
-        painter = QPainter()
-        painter.begin(image)
-        painter.setOpacity(0.0)
-        painter.setRenderHints(QPainter.TextAntialiasing
-                               | QPainter.Antialiasing
-                               | QPainter.SmoothPixmapTransform
-                               | QPainter.HighQualityAntialiasing)
-
-        scene.render(painter, source=brect)
-        painter.end()
+        image = render_image(net,
+                             scale_width=200, scale_height=200,
+                             dpi_width=300, dpi_height=300,
+                             pad_width=5, pad_height=5)
         image.save(buffer, "PNG")
 
         cb = QApplication.clipboard()
@@ -247,6 +242,10 @@ class MenuActionHandler(QWidget):
 
     @Slot(bool)
     def process_open_network(self):
+        if self.networkLoader.is_loading:
+            self.show_error("Open a network file",
+                            "Another network file is being opened.")
+            return
 
         while True:
             self.openNetworkDialog.exec()
@@ -261,26 +260,52 @@ class MenuActionHandler(QWidget):
             elif choice == QDialog.Accepted:
                 fpath = fpath.strip()
                 try:
-                    net = read_network(fpath, self.openNetworkDialog.edge_map)
+                    self.networkLoader.load(fpath, self.openNetworkDialog.edge_map)
                 except Exception as err:
                     err_msg = "An error has occurred during opening the file.\n%s"
                     self.show_error("Open a network file", err_msg % format_exc())
                     continue
 
-                network_name = self.openNetworkDialog.network_name
-                if network_name:
-                    net.name = network_name
-                else:
-                    net.name = os.path.basename(fpath)
-
-                self.mw.sv_manager.set_current_view_scene(net.scene, net.name)
-                self.mw.nt_manager.append_item(net)
-                # self.mw.ct_manager.update_console_variables()
+                self._loading_fpath = fpath
+                self._loading_name = self.openNetworkDialog.network_name
+                self.progressDialog.set_message("Reading %s" % os.path.basename(fpath))
+                self.progressDialog.show()
 
             # end of if
             break
         # end of while
 
+    @Slot(str, object, object)
+    def on_loading_progressed(self, stage, num_done, total):
+        if stage == "read":
+            message = "Reading %s" % os.path.basename(self._loading_fpath)
+        elif stage == "build":
+            message = "Building the items of network"
+        else:
+            message = "Adding the items to the scene"
+
+        self.progressDialog.set_message(message)
+        self.progressDialog.set_progress(num_done, total)
+
+    @Slot(object)
+    def on_network_loaded(self, net):
+        self.progressDialog.close()
+
+        if self._loading_name:
+            net.name = self._loading_name
+        else:
+            net.name = os.path.basename(self._loading_fpath)
+
+        self.mw.sv_manager.set_current_view_scene(net.scene, net.name)
+        self.mw.nt_manager.append_item(net)
+        # self.mw.ct_manager.update_console_variables()
+
+    @Slot(str)
+    def on_loading_failed(self, err_msg):
+        self.progressDialog.close()
+        err_msg = "An error has occurred during opening the file.\n%s" % err_msg
+        self.show_error("Open a network file", err_msg)
+
 
     @Slot(bool)
     def process_save_network(self):
@@ -288,7 +313,7 @@ class MenuActionHandler(QWidget):
             fpath = QFileDialog.getSaveFileName(self.mw,
                                                 self.tr("Save a network file"),
                                                 "",
-                                                self.tr("Network files (*.sif *.nzj *.json)"))
+                                                self.tr("Network files (*.sif *.nzj *.json *.nzj.gz *.nzb)"))
             fpath = fpath[0]
             if fpath:
                 net = self.mw.nt_manager.current_item.data()
@@ -369,6 +394,12 @@ class MenuActionHandler(QWidget):
 
         self.mw.ui_actionViewHistoryDock.setChecked(checked)
 
+    @Slot(bool)
+    def process_view_level_of_detail(self, checked):
+        ss = get_system_state()
+        ss.set_lod_enabled(checked)
+        self.mw.sv_manager.view.viewport().update()
+
     @Slot(bool)
     def process_lock_nodes(self, checked):
         ss = get_system_state()
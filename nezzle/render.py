@@ -0,0 +1,223 @@
+"""Headless batch rendering of network files into images.
+
+Usage:
+    nezzle render [options] PATH [PATH ...]
+
+Each PATH is a network file (e.g., .nzj, .sif) or a directory
+containing network files. The files are rendered with the offscreen
+platform of Qt in a pool of processes.
+
+Example:
+    nezzle render -f png -o figures -j 8 pathways/
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+
+NETWORK_EXTENSIONS = ('.sif', '.nzj', '.json', '.nzb',
+                      '.nzj.gz', '.json.gz', '.nzj.zst', '.json.zst')
+
+IMAGE_FORMATS = ('png', 'jpg', 'jpeg', 'bmp', 'tif', 'tiff', 'svg', 'pdf')
+
+_app = None
+
+
+def _init_qt():
+    """Create the QApplication of the offscreen platform
+       for rendering without a display.
+    """
+    global _app
+
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+    from qtpy.QtWidgets import QApplication
+    _app = QApplication.instance() or QApplication([])
+
+
+def _is_network_file(fpath):
+    return fpath.casefold().endswith(NETWORK_EXTENSIONS)
+
+
+def _strip_network_ext(fname):
+    for ext in sorted(NETWORK_EXTENSIONS, key=len, reverse=True):
+        if fname.casefold().endswith(ext):
+            return fname[:-len(ext)]
+    return fname
+
+
+def collect_files(paths):
+    """Collect the network files in the paths of files or directories.
+    """
+    fpaths = []
+    for path in paths:
+        if os.path.isdir(path):
+            for fname in sorted(os.listdir(path)):
+                fpath = os.path.join(path, fname)
+                if os.path.isfile(fpath) and _is_network_file(fpath):
+                    fpaths.append(fpath)
+        elif os.path.isfile(path):
+            fpaths.append(path)
+        else:
+            raise FileNotFoundError("No such file or directory: %s" % (path))
+
+    return fpaths
+
+
+def render_file(fpath, fpath_out, **options):
+    """Render a network file into an image file.
+
+    Args:
+        fpath : str
+            Path of network file.
+        fpath_out : str
+            Path of image file.
+        options : dict
+            Options of write_image().
+
+    Returns:
+        The elapsed times of reading and rendering in seconds.
+    """
+    from nezzle.io import read_network
+    from nezzle.io import write_image
+
+    if _app is None:
+        _init_qt()
+
+    t_beg = time.perf_counter()
+    net = read_network(fpath)
+    t_read = time.perf_counter() - t_beg
+
+    t_beg = time.perf_counter()
+    write_image(net, fpath_out, **options)
+    t_render = time.perf_counter() - t_beg
+
+    return t_read, t_render
+
+
+def _render_file_safely(fpath, fpath_out, options):
+    try:
+        return render_file(fpath, fpath_out, **options), None
+    except Exception as err:
+        return None, "%s: %s" % (type(err).__name__, err)
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(
+        prog="nezzle render",
+        description="Render network files into images without GUI.")
+
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help="Network files or directories of network files.")
+    parser.add_argument('-o', '--output-dir', dest='output_dir', default=None,
+                        help="Directory of images. "
+                             "The directory of each network file is used by default.")
+    parser.add_argument('-f', '--format', dest='format', default='png',
+                        choices=IMAGE_FORMATS,
+                        help="Format of images (default: png).")
+    parser.add_argument('-j', '--jobs', dest='jobs', type=int, default=None,
+                        help="Number of processes (default: number of CPUs).")
+    parser.add_argument('--width', dest='image_width', type=int, default=None,
+                        help="Width of image in pixels, used with --height.")
+    parser.add_argument('--height', dest='image_height', type=int, default=None,
+                        help="Height of image in pixels, used with --width.")
+    parser.add_argument('--scale', dest='scale', type=float, default=200,
+                        help="Scale of image in percent (default: 200).")
+    parser.add_argument('--dpi', dest='dpi', type=int, default=350,
+                        help="Resolution of image (default: 350).")
+    parser.add_argument('--quality', dest='quality', type=int, default=100,
+                        help="Quality of image from 0 to 100 (default: 100).")
+    parser.add_argument('--pad', dest='pad', type=int, default=10,
+                        help="Padding around the network (default: 10).")
+    parser.add_argument('--opaque', dest='transparent', action='store_false',
+                        help="Fill the background instead of leaving it transparent.")
+    return parser
+
+
+def main(argv=None, cwd=None):
+    """Run the render subcommand.
+
+    Args:
+        argv : list of str, optional
+            Arguments after the subcommand. sys.argv is used if it is None.
+        cwd : str, optional
+            Directory against which the relative paths are resolved.
+
+    Returns:
+        The exit code, which is 1 if any file has failed.
+    """
+    args = create_parser().parse_args(argv)
+    cwd = cwd or os.getcwd()
+
+    paths = [os.path.join(cwd, path) for path in args.paths]
+    fpaths = collect_files(paths)
+    if not fpaths:
+        sys.stderr.write("There is no network file to render.\n")
+        return 1
+
+    output_dir = None
+    if args.output_dir:
+        output_dir = os.path.join(cwd, args.output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+
+    options = dict(image_width=args.image_width,
+                   image_height=args.image_height,
+                   transparent=args.transparent,
+                   quality=args.quality,
+                   scale_width=args.scale, scale_height=args.scale,
+                   dpi_width=args.dpi, dpi_height=args.dpi,
+                   pad_width=args.pad, pad_height=args.pad)
+
+    tasks = []
+    for fpath in fpaths:
+        dpath, fname = os.path.split(fpath)
+        fname_out = "%s.%s" % (_strip_network_ext(fname), args.format)
+        tasks.append((fpath, os.path.join(output_dir or dpath, fname_out)))
+
+    num_jobs = args.jobs or os.cpu_count() or 1
+    num_jobs = min(num_jobs, len(tasks))
+
+    # The variable is inherited by the worker processes.
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+
+    t_beg = time.perf_counter()
+    num_failed = 0
+
+    def report(fpath, fpath_out, times, err):
+        nonlocal num_failed
+        if err:
+            num_failed += 1
+            sys.stderr.write("[FAILED] %s: %s\n" % (fpath, err))
+        else:
+            sys.stdout.write("%s -> %s (read: %.3f s, render: %.3f s)\n"
+                             % (fpath, fpath_out, *times))
+
+    if num_jobs <= 1:
+        for fpath, fpath_out in tasks:
+            report(fpath, fpath_out, *_render_file_safely(fpath, fpath_out, options))
+    else:
+        # Qt does not survive fork, so the workers are spawned.
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(num_jobs, mp_context=mp_context,
+                                 initializer=_init_qt) as executor:
+            futures = {executor.submit(_render_file_safely, fpath, fpath_out, options):
+                       (fpath, fpath_out) for fpath, fpath_out in tasks}
+
+            for future in as_completed(futures):
+                fpath, fpath_out = futures[future]
+                report(fpath, fpath_out, *future.result())
+
+    sys.stdout.write("Rendered %d of %d files with %d processes in %.3f s\n"
+                     % (len(tasks) - num_failed, len(tasks), num_jobs,
+                        time.perf_counter() - t_beg))
+
+    return 1 if num_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from qtpy.QtCore import QObject
 from nezzle.constants import Lock
+from nezzle.constants import LOD_THRESHOLDS
 
 
 class SystemState(QObject):
@@ -8,6 +9,9 @@ class SystemState(QObject):
 
         self._lock_state = 0
 
+        # 0 means full fidelity for all levels of detail.
+        self._lod_thresholds = {name: 0 for name in LOD_THRESHOLDS}
+
     @property
     def lock_state(self):
         return self._lock_state
@@ -36,6 +40,26 @@ class SystemState(QObject):
         else:
             self._lock_state &= (~lock)
 
+    @property
+    def lod_thresholds(self):
+        return dict(self._lod_thresholds)
+
+    def lod_threshold(self, name):
+        return self._lod_thresholds.get(name, 0)
+
+    def set_lod_threshold(self, name, value):
+        if name not in self._lod_thresholds:
+            raise KeyError("Unknown kind of items for level of detail: %s"
+                           % (name))
+        self._lod_thresholds[name] = value
+
+    def set_lod_enabled(self, b):
+        """Turn on/off painting the zoomed-out items in simplified forms
+           with the thresholds of LOD_THRESHOLDS.
+        """
+        for name, value in LOD_THRESHOLDS.items():
+            self.set_lod_threshold(name, value if b else 0)
+
 # end of class SystemState
 
 
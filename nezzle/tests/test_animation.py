@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+from qtpy import QtWidgets
+from qtpy.QtCore import Qt
+from qtpy.QtCore import QPointF
+
+from nezzle.graphics import EllipseNode
+from nezzle.graphics import TextLabel
+from nezzle.graphics import CurvedEdge
+from nezzle.graphics import Triangle, Hammer
+from nezzle.graphics import Network
+from nezzle.io import write_animation
+from nezzle.io.animation import FrameRenderer
+from nezzle.io.image import to_rgba_array
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+num_frames = 12
+
+
+def create_network():
+    net = Network('2NNFL')
+    src = EllipseNode('A', 40, 40, pos=QPointF(-80, 0))
+    trg = EllipseNode('B', 40, 40, pos=QPointF(80, 0))
+    net.add_node(src)
+    net.add_node(trg)
+
+    edge1 = CurvedEdge("EDGE1", src, trg, width=4, head=Triangle())
+    edge2 = CurvedEdge("EDGE2", trg, src, width=4, head=Hammer())
+    edge1["FILL_COLOR"] = edge2["FILL_COLOR"] = Qt.black
+    net.add_edge(edge1)
+    net.add_edge(edge2)
+
+    for node in [src, trg]:
+        label = TextLabel(node, node.iden)
+        label.align()
+        net.add_label(label)
+
+    return net
+
+
+def create_frames():
+    t = np.linspace(0, 1, num_frames)
+    s = np.stack([t, t[::-1]], axis=1)
+    s[num_frames // 2] = s[num_frames // 2 - 1]  # A frame without change
+    rgba = np.zeros((num_frames, 2, 4), dtype=np.uint8)
+    rgba[..., 0] = 255 * s
+    rgba[..., 3] = 255
+    texts = np.array([["A%d" % i, "B"] for i in range(num_frames)])
+    texts[num_frames // 2] = texts[num_frames // 2 - 1]
+    return {"NODES": {"FILL_COLOR": rgba, "WIDTH": 20 + 30 * s},
+            "LABELS": {"TEXT": texts}}
+
+
+def read_apng(fpath):
+    """Decode the frames of APNG, whose regions replace
+       those of the previous ones.
+    """
+    with open(fpath, "rb") as fin:
+        data = fin.read()
+
+    pos = 8
+    canvas, frames, region, compressed = None, [], None, b""
+
+    def flush():
+        if region is None:
+            return
+        w, h, x, y = region
+        raw = np.frombuffer(zlib.decompress(compressed), dtype=np.uint8)
+        canvas[y:y + h, x:x + w] = raw.reshape(h, 1 + 4*w)[:, 1:].reshape(h, w, 4)
+        frames.append(canvas.copy())
+
+    while pos < len(data):
+        size, tag = struct.unpack(">I4s", data[pos:pos + 8])
+        chunk = data[pos + 8:pos + 8 + size]
+        pos += 12 + size
+        if tag == b"IHDR":
+            width, height = struct.unpack(">II", chunk[:8])
+            canvas = np.zeros((height, width, 4), dtype=np.uint8)
+        elif tag == b"acTL":
+            assert struct.unpack(">I", chunk[:4])[0] == num_frames
+        elif tag == b"fcTL":
+            flush()
+            region, compressed = struct.unpack(">IIII", chunk[4:20]), b""
+        elif tag == b"IDAT":
+            compressed += chunk
+        elif tag == b"fdAT":
+            compressed += chunk[4:]
+        elif tag == b"IEND":
+            flush()
+
+    return frames
+
+
+def render_full(index):
+    net = create_network()
+    renderer = FrameRenderer(net, create_frames())
+    renderer.seek(index)
+    renderer.invalidate()
+    image, rect = renderer.render(index)
+    return renderer, to_rgba_array(image).astype(int)
+
+
+def test_frame_renderer():
+    net = create_network()
+    renderer = FrameRenderer(net, create_frames())
+
+    image, rect = renderer.render(0)
+    assert rect == image.rect()
+
+    for i in range(1, num_frames):
+        image, rect = renderer.render(i)
+        if i == num_frames // 2:
+            assert rect.isEmpty()
+        else:
+            assert not rect.isEmpty()
+            assert rect.width() * rect.height() <= image.width() * image.height()
+
+    assert net.nodes["A"]["WIDTH"] == pytest.approx(50)
+    assert [label.text for label in net.labels.values()] == ["A%d" % (num_frames - 1), "B"]
+
+    _, arr_full = render_full(num_frames - 1)
+    arr = to_rgba_array(image).astype(int)
+    assert np.array_equal(arr, arr_full)
+
+
+def test_frame_renderer_aligns_labels():
+    net = create_network()
+    frames = {"LABELS": {"FONT_SIZE": [[10, 10], [40, 20], [10, 10]],
+                         "TEXT": [["A", "B"], ["A", "Long B"], ["A", "B"]]}}
+    renderer = FrameRenderer(net, frames)
+
+    def get_geometry(label):
+        rect = label.boundingRect()
+        return label.pos() + rect.center(), rect.width()
+
+    geometries = [get_geometry(label) for label in net.labels.values()]
+    renderer.render(1)
+
+    # The resized labels stay at their centers.
+    for label, (center, width) in zip(net.labels.values(), geometries):
+        center_new, width_new = get_geometry(label)
+        assert width_new > width
+        assert center_new.x() == pytest.approx(center.x())
+        assert center_new.y() == pytest.approx(center.y())
+
+    renderer.render(2)
+    assert [get_geometry(label) for label in net.labels.values()] == geometries
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_write_apng(tmpdir, num_workers):
+    fpath = str(tmpdir.join("dynamics.png"))
+    write_animation(create_network(), fpath, create_frames(), fps=5,
+                    num_workers=num_workers, frames_per_task=4)
+
+    frames = read_apng(fpath)
+    assert len(frames) == num_frames
+
+    _, arr_full = render_full(num_frames - 1)
+    assert np.array_equal(frames[-1], arr_full)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+from qtpy import QtWidgets
+from qtpy.QtGui import QImage
+
+from nezzle.io import read_network
+from nezzle.io import write_image
+from nezzle.io import render_image
+from nezzle.io import image as nzimage
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+dpath = os.path.dirname(__file__)
+fpath_nzj = os.path.join(dpath, "korkut_2015.json")
+edge_map = {"Triangle": "Triangle", "Hammer": "Hammer"}
+
+
+def to_array(image):
+    return nzimage.to_rgba_array(image).astype(int)
+
+
+def test_write_image_in_tiles(tmpdir, monkeypatch):
+    net = read_network(fpath_nzj, edge_map=edge_map)
+    image_ref = render_image(net, scale_width=50, scale_height=50)
+    arr_ref = to_array(image_ref)
+
+    # Render small tiles and bands of a few rows.
+    monkeypatch.setattr(nzimage, "TILE_SIZE", 64)
+    monkeypatch.setattr(nzimage, "MAX_BAND_BYTES", 4 * image_ref.width() * 16)
+
+    fpath = str(tmpdir.join("network.png"))
+    write_image(net, fpath, transparent=False, quality=50,
+                scale_width=50, scale_height=50)
+
+    image = QImage(fpath)
+    assert not image.isNull()
+    assert (image.width(), image.height()) == (image_ref.width(), image_ref.height())
+    assert image.dotsPerMeterX() == int(350 / 0.0254)
+
+    # The transparent background of reference is white in the written image.
+    arr = to_array(image)
+    alpha = arr_ref[..., 3:] / 255
+    arr_ref = np.round(arr_ref[..., :3] * alpha + 255 * (1 - alpha))
+    assert np.abs(arr[..., :3] - arr_ref).mean() < 1
+
+
+def test_write_image_size(tmpdir):
+    net = read_network(fpath_nzj, edge_map=edge_map)
+    fpath = str(tmpdir.join("network.jpg"))
+    write_image(net, fpath, image_width=300, image_height=200)
+
+    image = QImage(fpath)
+    assert (image.width(), image.height()) == (300, 200)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+from qtpy import QtWidgets
+from qtpy.QtCore import QEventLoop
+from qtpy.QtCore import QTimer
+
+from nezzle.io import read_network
+from nezzle.io.loader import NetworkLoader
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+dpath = os.path.dirname(__file__)
+fpath_nzj = os.path.join(dpath, "korkut_2015.json")
+fpath_sif = os.path.join(dpath, "jkwon_egfr_pathway.sif")
+edge_map = {"Triangle": "Triangle", "Hammer": "Hammer"}
+
+
+class StopReading(Exception):
+    pass
+
+
+@pytest.mark.parametrize("fpath, edge_map", [
+    (fpath_nzj, edge_map),
+    (fpath_sif, None)
+])
+def test_read_network_progress(fpath, edge_map):
+    reports = []
+    net = read_network(fpath, edge_map, headless=True,
+                       progress=lambda *args: reports.append(args))
+
+    stages = [stage for stage, num_done, total in reports]
+    assert stages[0] == "read" and stages[-1] == "build"
+    assert stages.index("build") > max(i for i, s in enumerate(stages) if s == "read")
+
+    size = os.path.getsize(fpath)
+    assert ("read", size, size) in reports
+
+    num_items = len(net.nodes) + len(net.edges) + len(net.labels)
+    assert reports[-1] == ("build", num_items, num_items)
+
+    def stop(stage, num_done, total):
+        if stage == "build":
+            raise StopReading()
+
+    with pytest.raises(StopReading):
+        read_network(fpath, edge_map, headless=True, progress=stop)
+
+
+def test_iter_materialize_scene():
+    net = read_network(fpath_nzj, edge_map, headless=True)
+    num_items = len(net.nodes) + len(net.edges)
+
+    steps = net.iter_materialize_scene(chunk_size=100)
+    next(steps)
+    steps.close()
+    assert net.is_headless  # The partial scene is not attached.
+
+    steps = list(net.iter_materialize_scene(chunk_size=100))
+    assert steps[-1] == (num_items, num_items)
+    assert len(steps) == (num_items + 99) // 100
+    assert not net.is_headless
+
+    net_ref = read_network(fpath_nzj, edge_map)
+    assert len(net.scene.items()) == len(net_ref.scene.items())
+
+
+def test_iter_materialize_scene_error(monkeypatch):
+    from nezzle.graphics.screen import GraphicsScene
+
+    net = read_network(fpath_nzj, edge_map, headless=True)
+    items = list(net.edges.values()) + list(net.nodes.values())
+    num_added = []
+
+    # Fail in the middle of the second chunk.
+    def add_item(scene, item):
+        if len(num_added) == 150:
+            raise RuntimeError("Failed to add an item.")
+        num_added.append(item)
+        QtWidgets.QGraphicsScene.addItem(scene, item)
+
+    monkeypatch.setattr(GraphicsScene, "addItem", add_item)
+    with pytest.raises(RuntimeError):
+        list(net.iter_materialize_scene(chunk_size=100))
+
+    assert net.is_headless
+    assert all(item.scene() is None for item in items)
+
+
+def run_loader(loader, fpath, edge_map, on_progressed=None):
+    results = {}
+    loop = QEventLoop()
+
+    def finish(key):
+        def slot(*args):
+            results[key] = args
+            loop.quit()
+        return slot
+
+    loader.loaded.connect(finish("loaded"))
+    loader.failed.connect(finish("failed"))
+    loader.canceled.connect(finish("canceled"))
+    if on_progressed:
+        loader.progressed.connect(on_progressed)
+
+    loader.load(fpath, edge_map)
+    QTimer.singleShot(10000, loop.quit)
+    loop.exec_()
+    return results
+
+
+def test_network_loader():
+    loader = NetworkLoader(chunk_size=50)
+    stages = []
+    results = run_loader(loader, fpath_nzj, edge_map,
+                         lambda stage, num_done, total: stages.append(stage))
+
+    net, = results["loaded"]
+    assert not net.is_headless
+    assert not loader.is_loading
+    assert stages[0] == "read" and stages[-1] == "insert"
+    assert stages.count("insert") == (len(net.nodes) + len(net.edges) + 49) // 50
+
+    net_ref = read_network(fpath_nzj, edge_map)
+    assert len(net.scene.items()) == len(net_ref.scene.items())
+
+
+@pytest.mark.parametrize("stage", ["read", "build", "insert"])
+def test_network_loader_cancel(stage):
+    loader = NetworkLoader(chunk_size=50)
+
+    def cancel(stage_progressed, num_done, total):
+        if stage_progressed == stage:
+            loader.cancel()
+
+    results = run_loader(loader, fpath_nzj, edge_map, cancel)
+    assert set(results) == {"canceled"}
+    assert not loader.is_loading
+
+
+def test_network_loader_error(tmpdir):
+    fpath = str(tmpdir.join("broken.nzj"))
+    with open(fpath, "w") as fout:
+        fout.write("{")
+
+    loader = NetworkLoader()
+    results = run_loader(loader, fpath, edge_map)
+    err_msg, = results["failed"]
+    assert "JSONDecodeError" in err_msg
@@ -0,0 +1,645 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from qtpy import QtWidgets
+from qtpy.QtCore import Qt
+from qtpy.QtCore import QEvent
+from qtpy.QtCore import QPoint
+from qtpy.QtCore import QPointF
+from qtpy.QtCore import QRectF
+from qtpy.QtGui import QColor
+from qtpy.QtGui import QFont
+from qtpy.QtGui import QImage
+from qtpy.QtGui import QMouseEvent
+from qtpy.QtGui import QPainter
+from qtpy.QtGui import QTransform
+from qtpy.QtTest import QTest
+
+from nezzle.graphics import EdgeClassFactory
+from nezzle.graphics import ArrowClassFactory
+from nezzle.graphics import NodeClassFactory
+from nezzle.graphics import LabelClassFactory
+from nezzle.graphics import Network
+from nezzle.systemstate import get_system_state
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def create_network(num_nodes=5):
+    net = Network("ID_NETWORK")
+
+    NodeClass = NodeClassFactory.create("ELLIPSE_NODE")
+    EdgeClass = EdgeClassFactory.create("CURVED_EDGE")
+    ArrowClass = ArrowClassFactory.create("TRIANGLE")
+
+    nodes = []
+    for i in range(num_nodes):
+        node = NodeClass("N%d" % i, 40, 30, pos=QPointF(100*i, 50*(i % 2)))
+        net.add_node(node)
+        nodes.append(node)
+
+    for i in range(num_nodes - 1):
+        edge = EdgeClass("E%d" % i, nodes[i], nodes[i + 1], head=ArrowClass())
+        net.add_edge(edge)
+
+    return net
+
+
+def test_batch():
+    net = create_network()
+    edge = net.edges["E0"]
+    pos_old = QPointF(edge.pos())
+
+    with net.batch():
+        assert net.scene.is_batching
+        for node in net.nodes.values():
+            node["FILL_COLOR"] = QColor(10, 20, 30)
+            node["BORDER_COLOR"] = Qt.red
+
+        net.nodes["N0"]["POS_X"] = -500
+
+        # The geometry of edges is updated at the end of the batch.
+        assert edge.pos() == pos_old
+
+    assert not net.scene.is_batching
+    assert edge.pos() != pos_old
+    assert edge.pos() == (net.nodes["N0"].pos() + net.nodes["N1"].pos()) / 2
+    for node in net.nodes.values():
+        assert node["FILL_COLOR"] == QColor(10, 20, 30).name(QColor.HexArgb)
+
+
+def test_nested_batch():
+    net = create_network()
+    edge = net.edges["E0"]
+    pos_old = QPointF(edge.pos())
+
+    with net.batch():
+        with net.batch():
+            net.nodes["N0"]["POS_Y"] = 300
+
+        assert net.scene.is_batching
+        assert edge.pos() == pos_old
+
+    assert edge.pos() != pos_old
+
+
+def test_add_items_in_bulk():
+    NodeClass = NodeClassFactory.create("ELLIPSE_NODE")
+    EdgeClass = EdgeClassFactory.create("STRAIGHT_EDGE")
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+
+    nodes = [NodeClass("N%d" % i, 40, 30, pos=QPointF(50*i, 0))
+             for i in range(10)]
+    edges = [EdgeClass("E%d" % i, nodes[i], nodes[i + 1])
+             for i in range(9)]
+    labels = [LabelClass(node, node.iden) for node in nodes]
+
+    net = Network("ID_NETWORK")
+    net.add_edges(edges)
+    net.add_labels(labels)
+    net.add_nodes(nodes)
+
+    assert list(net.nodes) == ["N%d" % i for i in range(10)]
+    assert list(net.edges) == ["E%d" % i for i in range(9)]
+    assert len(net.labels) == 10
+
+    assert net.nxgraph.number_of_nodes() == 10
+    assert net.nxgraph.number_of_edges() == 9
+    assert net.nxgraph.nodes["N3"]['GRAPHICS'] is nodes[3]
+    assert net.nxgraph.edges["N3", "N4"]['GRAPHICS'] is edges[3]
+
+    for item in nodes + edges + labels:
+        assert item.scene() is net.scene
+
+    assert nodes[0].zValue() == 0
+    assert edges[0].zValue() == -1
+
+
+def test_headless_network():
+    net = Network("ID_NETWORK", headless=True)
+    NodeClass = NodeClassFactory.create("ELLIPSE_NODE")
+    EdgeClass = EdgeClassFactory.create("CURVED_EDGE")
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+
+    n1 = NodeClass("N1", 40, 30, pos=QPointF(0, 0))
+    n2 = NodeClass("N2", 40, 30, pos=QPointF(100, 0))
+    net.add_nodes([n1, n2])
+    net.add_edge(EdgeClass("E1", n1, n2))
+    net.add_label(LabelClass(n1, "N1"))
+    net["BACKGROUND_COLOR"] = Qt.white
+
+    with net.batch():
+        n1["FILL_COLOR"] = Qt.red
+
+    assert net.is_headless
+    assert n1.scene() is None
+
+    dict_net = net.to_dict()
+    assert net.is_headless
+    assert dict_net["BACKGROUND_COLOR"] == QColor(Qt.white).name(QColor.HexArgb)
+
+    net2 = net.copy()
+    assert net2.is_headless
+    assert net2.to_dict() == dict_net
+
+    # The scene is created when it is accessed for the first time.
+    scene = net.scene
+    assert not net.is_headless
+    assert n1.scene() is scene
+    assert net.edges["E1"].scene() is scene
+    assert scene.backgroundBrush().color() == QColor(Qt.white)
+    assert len(scene.items()) == len(net2.scene.items())
+
+
+def test_structural_copy():
+    net = create_network()
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+    SelfloopClass = EdgeClassFactory.create("SELFLOOP_EDGE")
+    ArrowClass = ArrowClassFactory.create("HAMMER")
+
+    n0 = net.nodes["N0"]
+    net.add_edge(SelfloopClass("E_SELF", n0, head=ArrowClass()))
+    for node in net.nodes.values():
+        net.add_label(LabelClass(node, node.iden))
+
+    n0["FILL_COLOR"] = Qt.green
+    net.edges["E0"].ctrl_point.setPos(QPointF(30, -60))
+    net.nxgraph.nodes["N0"]["WEIGHT"] = 3.0
+    dict_net = net.to_dict()
+
+    for cow in (False, True):
+        net2 = net.copy(cow=cow)
+        assert net2.to_dict() == dict_net
+        assert net2.nxgraph.nodes["N0"]["WEIGHT"] == 3.0
+
+        for iden, node in net.nodes.items():
+            node2 = net2.nodes[iden]
+            assert node2 is not node
+            assert node2.pos() == node.pos()
+            assert len(node2.edges) == len(node.edges)
+
+        edge, edge2 = net.edges["E0"], net2.edges["E0"]
+        assert edge2.source is net2.nodes["N0"]
+        assert edge2.head is not edge.head
+        assert edge2.head.parent is edge2
+        assert edge2.ctrl_point.pos() == edge.ctrl_point.pos()
+        assert edge2.boundingRect() == edge.boundingRect()
+
+        # Modifying the copy does not affect the original.
+        net2.nodes["N0"]["FILL_COLOR"] = Qt.red
+        net2.nodes["N1"]["POS_X"] = 1000
+        assert n0["FILL_COLOR"] == QColor(Qt.green).name(QColor.HexArgb)
+        assert net.nodes["N1"].pos().x() != 1000
+        assert net.to_dict() == dict_net
+
+
+def test_cow_copy_shares_storage():
+    net = create_network()
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+    for node in net.nodes.values():
+        net.add_label(LabelClass(node, node.iden))
+
+    net2 = net.copy(cow=True)
+    for iden, edge in net.edges.items():
+        edge2 = net2.edges[iden]
+        assert edge2._attr.data is edge._attr.data
+        assert edge2.head is not edge.head
+        assert edge2["HEAD"] is edge2.head
+        assert any(value is edge2.head for value in edge2.values())
+
+    for iden, label in net.labels.items():
+        label2 = net2.labels[iden]
+        assert label2._attr.data is label._attr.data
+        assert label2.font is label.font
+
+    # Modifying the copy detaches its storage only.
+    edge, edge2 = net.edges["E0"], net2.edges["E0"]
+    edge2.width = 10
+    assert edge2._attr.data is not edge._attr.data
+    assert edge.width != 10
+    assert net2.edges["E1"]._attr.data is net.edges["E1"]._attr.data
+
+
+def test_incident_edges():
+    NodeClass = NodeClassFactory.create("ELLIPSE_NODE")
+    EdgeClass = EdgeClassFactory.create("STRAIGHT_EDGE")
+    SelfloopClass = EdgeClassFactory.create("SELFLOOP_EDGE")
+
+    net = Network("ID_NETWORK")
+    hub = NodeClass("HUB", 40, 30)
+    leaves = [NodeClass("N%d" % i, 40, 30) for i in range(100)]
+    edges = [EdgeClass("E%d" % i, hub, leaf) if i % 2
+             else EdgeClass("E%d" % i, leaf, hub)
+             for i, leaf in enumerate(leaves)]
+    selfloop = SelfloopClass("E_SELF", hub)
+
+    net.add_edges(edges + [selfloop])
+    net.add_nodes([hub] + leaves)
+
+    assert len(hub.edges) == 101
+    assert len(hub.out_edges) == 50
+    assert len(hub.in_edges) == 50
+    assert all(edge.source is hub for edge in hub.out_edges)
+    assert all(edge.target is hub for edge in hub.in_edges)
+    assert isinstance(hub.edges, list)
+    assert all(a is b for a, b in zip(hub.edges, edges[:3]))
+    assert len(list(hub.iter_edges())) == 101
+
+    # Adding an edge twice does not duplicate it.
+    hub.add_edge(edges[0])
+    assert len(hub.edges) == 101
+
+    net.remove_edge(selfloop)
+    assert not hub.has_edge(selfloop)
+    assert len(hub.edges) == 100
+
+    hub_new = NodeClass("HUB", 40, 30)
+    net.replace_node(hub, hub_new)
+    assert not hub.edges
+    assert len(hub_new.out_edges) == 50
+    assert len(hub_new.in_edges) == 50
+
+    net.remove_node(leaves[0])
+    assert len(hub_new.edges) == 99
+    assert not hub_new.has_edge(edges[0])
+    assert "E0" not in net.edges
+
+
+def test_positions():
+    for headless in (False, True):
+        net = create_network()
+        if headless:
+            net = Network.from_dict(net.to_dict(), headless=True)
+
+        pos = net.positions
+        assert pos.shape == (5, 2)
+        assert pos.dtype == np.float64
+        assert not pos.flags.writeable
+        assert pos[1].tolist() == [100, 50]
+
+        # Moving a node is reflected in the array.
+        net.nodes["N1"]["POS_X"] = 120
+        assert net.positions[1].tolist() == [120, 50]
+
+        pos_new = np.arange(10, dtype=np.float64).reshape(5, 2) * 10
+        net.set_positions(pos_new)
+        assert np.array_equal(net.positions, pos_new)
+        n0, n1 = net.nodes["N0"], net.nodes["N1"]
+        assert n1.pos() == QPointF(20, 30)
+        assert n1["POS_X"] == 20 and n1["POS_Y"] == 30
+        assert net.edges["E0"].pos() == (n0.pos() + n1.pos()) / 2
+
+        net.remove_node("N1")
+        assert net.positions.shape == (4, 2)
+        assert net.positions[1].tolist() == [40, 50]
+
+        net.nodes["N2"].setPos(-1, -1)
+        assert net.positions[1].tolist() == [-1, -1]
+
+        try:
+            net.set_positions(pos_new)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("ValueError is not raised.")
+
+
+def test_set_attr():
+    net = create_network()
+
+    rgba = np.zeros((5, 4), dtype=np.uint8)
+    rgba[:, 0] = np.arange(5) * 50
+    rgba[:, 3] = 255
+    net.set_node_attr("FILL_COLOR", rgba)
+    net.set_node_attr("WIDTH", np.linspace(10, 50, 5))
+    net.set_node_attr("BORDER_COLOR", Qt.black)
+    net.set_node_attr("HEIGHT", {"N0": np.float32(5), "N4": 7})
+
+    for i, node in enumerate(net.nodes.values()):
+        assert node["FILL_COLOR"] == QColor(50 * i, 0, 0, 255).name(QColor.HexArgb)
+        assert node["WIDTH"] == 10 + 10 * i
+        assert node["BORDER_COLOR"] == QColor(Qt.black).name(QColor.HexArgb)
+
+    assert node.width == 50
+    assert net.nodes["N0"]["HEIGHT"] == 5
+    assert type(net.nodes["N0"]["HEIGHT"]) is float
+    assert net.nodes["N4"].height == 7
+
+    net.set_edge_attr("WIDTH", [1, 2, 3, 4])
+    net.set_edge_attr("FILL_COLOR", np.array([[0, 0, 255]] * 4))
+    for i, edge in enumerate(net.edges.values()):
+        assert edge.width == i + 1
+        assert edge["FILL_COLOR"] == QColor(Qt.blue).name(QColor.HexArgb)
+
+    try:
+        net.set_edge_attr("WIDTH", [1, 2])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError is not raised.")
+
+
+def test_edge_path_cache():
+    net = create_network()
+    n0 = net.nodes["N0"]
+    edge = net.edges["E0"]
+    edge.update()
+    path = edge.shape()
+
+    # Repaints and selection toggles do not recreate the path.
+    edge.update()
+    n0.setSelected(True)
+    n0.setSelected(False)
+    assert edge.shape() is path
+
+    n0["POS_X"] = -100
+    assert edge.shape() is not path
+    path = edge.shape()
+
+    edge.ctrl_point.setPos(QPointF(10, 80))
+    assert edge.shape() is not path
+    path = edge.shape()
+
+    edge.head.width = 20
+    assert edge.shape() is not path
+    path = edge.shape()
+
+    edge.invalidate_geometry()
+    edge.update()
+    assert edge.shape() is not path
+
+
+def test_update_curved_edges_at_once():
+    net = create_network(10)
+    for i, edge in enumerate(net.edges.values()):
+        edge.ctrl_point.setPos(QPointF(10 * i, 30 + 5 * i))
+
+    pos = net.positions.copy()
+    pos[:, 1] += np.arange(10) * 7
+    net.set_positions(pos)
+    rects = [edge.boundingRect() for edge in net.edges.values()]
+
+    for edge, rect in zip(net.edges.values(), rects):
+        edge.invalidate_geometry()
+        edge.update()  # Create the path of each edge one by one.
+        rect_expected = edge.boundingRect()
+        for a, b in zip(rect.getCoords(), rect_expected.getCoords()):
+            assert abs(a - b) < 1e-3
+
+
+def test_drag_updates_edges_once():
+    net = create_network(6)
+    scene = net.scene
+    nodes = list(net.nodes.values())
+    for node in nodes:
+        node.setSelected(True)
+
+    counts = {}
+    for edge in net.edges.values():
+        def create_path(edge=edge, create_path=edge._create_path):
+            counts[edge.iden] = counts.get(edge.iden, 0) + 1
+            return create_path()
+        edge._create_path = create_path
+
+    view = QtWidgets.QGraphicsView(scene)
+    view.resize(800, 600)
+    view.show()
+    app.processEvents()
+    pos_press = view.mapFromScene(nodes[0].pos())
+    pos_move = pos_press + QPoint(30, 40)
+    viewport = view.viewport()
+    QTest.mousePress(viewport, Qt.LeftButton, Qt.NoModifier, pos_press)
+    assert scene.mouseGrabberItem() is nodes[0]
+
+    QtWidgets.QApplication.sendEvent(viewport, QMouseEvent(
+        QEvent.MouseMove, QPointF(pos_move),
+        Qt.NoButton, Qt.LeftButton, Qt.NoModifier))
+
+    # Every node has been moved, but each edge is recomputed only once.
+    assert nodes[-1].pos() == QPointF(530, 90)
+    assert counts == {edge.iden: 1 for edge in net.edges.values()}
+    for edge in net.edges.values():
+        assert edge.pos() == (edge.source.pos() + edge.target.pos()) / 2
+
+
+def test_index_policy():
+    net = create_network()
+    scene = net.scene
+    n0 = net.nodes["N0"]
+    assert scene.itemIndexMethod() == QtWidgets.QGraphicsScene.BspTreeIndex
+
+    with net.index_suspended():
+        with scene.index_suspended():
+            assert scene.itemIndexMethod() == QtWidgets.QGraphicsScene.NoIndex
+        assert scene.is_index_suspended
+    assert scene.itemIndexMethod() == QtWidgets.QGraphicsScene.BspTreeIndex
+
+    # The index is rebuilt after moving the nodes.
+    pos = net.positions.copy()
+    pos[0] = (-1000, -1000)
+    net.set_positions(pos)
+    assert scene.itemAt(QPointF(-1000, -1000), QTransform()) is n0
+
+    # The index follows the change of the bounding rect of a node.
+    n0.width = 400
+    assert scene.itemAt(QPointF(-1150, -1000), QTransform()) is n0
+
+    scene.profiling = True
+    scene.itemAt(QPointF(0, 0), QTransform())
+    scene.items(QRectF(-100, -100, 200, 200))
+    stats = scene.index_stats()
+    assert stats["itemAt"]["count"] == 1
+    assert stats["items"]["count"] == 1
+    scene.reset_index_stats()
+    assert not scene.index_stats()
+
+
+def test_level_of_detail():
+    from nezzle.graphics.screen import GraphicsView
+
+    net = create_network()
+    view = GraphicsView()
+    view.setScene(net.scene)
+    view.resize(400, 300)
+
+    simplified = []
+    for item in list(net.nodes.values()) + list(net.edges.values()):
+        def paint_simplified(painter, option, item=item,
+                             paint=item._paint_simplified):
+            simplified.append(item.iden)
+            return paint(painter, option)
+        item._paint_simplified = paint_simplified
+
+    # The level of detail is turned off by default.
+    view.scale(0.1, 0.1)
+    view.grab()
+    assert not simplified
+
+    ss = get_system_state()
+    ss.set_lod_enabled(True)
+    try:
+        view.grab()
+        assert set(simplified) == set(net.nodes) | set(net.edges)
+
+        # The thresholds of a view override the setting, and 0 means
+        # full fidelity.
+        simplified.clear()
+        view.lod_node = 0
+        view.grab()
+        assert simplified and set(simplified) == set(net.edges)
+    finally:
+        ss.set_lod_enabled(False)
+
+    # Rendering the scene for exporting is always full fidelity.
+    simplified.clear()
+    image = QImage(100, 100, QImage.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    net.scene.render(painter)
+    painter.end()
+    assert not simplified
+
+
+def test_style_pool_bounded():
+    from nezzle.graphics import stylepool
+
+    net = create_network()
+    for i in range(3 * stylepool._MAX_POOLED // len(net.nodes)):
+        net.set_node_attr("FILL_COLOR", [QColor(i % 256, i // 256, j)
+                                         for j in range(len(net.nodes))])
+
+    assert stylepool.count()["COLOR"] <= stylepool._MAX_POOLED
+
+    # The items keep their colors, and equal colors are shared again.
+    n0 = net.nodes["N0"]
+    assert n0["FILL_COLOR"] == QColor(i % 256, i // 256, 0).name(QColor.HexArgb)
+    assert stylepool.get_color(Qt.red) is stylepool.get_color(QColor(Qt.red))
+
+
+def test_static_text_label():
+    net = create_network()
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+    n0, n1 = net.nodes["N0"], net.nodes["N1"]
+    label0 = LabelClass(n0, "Label")
+    label1 = LabelClass(n1, "Label")
+
+    # The layout is shared by the labels of the same text and font.
+    assert label0._static_text is label1._static_text
+
+    # The bounding rect is the same as that of QGraphicsTextItem.
+    text_item = QtWidgets.QGraphicsTextItem()
+    text_item.setFont(label0.font)
+    text_item.setPlainText("Label")
+    assert label0.boundingRect() == text_item.boundingRect()
+
+    rect = label0.boundingRect()
+    assert label0.boundingRect() is rect  # Not created for every call
+
+    label0["FONT_SIZE"] = 30
+    assert label0.boundingRect().height() > rect.height()
+    assert label0._static_text is not label1._static_text
+
+    label1["TEXT"] = "Long label"
+    assert label1.boundingRect().width() > rect.width()
+    assert label1.text_item.toPlainText() == "Long label"
+
+
+def test_static_text_label_font():
+    from nezzle.io.image import to_rgba_array
+
+    net = create_network()
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+
+    def render_ink_height(font_size):
+        label = LabelClass(net.nodes["N0"], "ABCD")
+        label["FONT_SIZE"] = font_size
+        rect = label.boundingRect()
+        image = QImage(int(rect.width()) + 1, int(rect.height()) + 1,
+                       QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.translate(-rect.topLeft())
+        painter.setFont(QFont("Arial", 20))  # Not used for the label
+        option = QtWidgets.QStyleOptionGraphicsItem()
+        option.exposedRect = rect
+        label.paint(painter, option, None)
+        painter.end()
+
+        rows = np.nonzero(to_rgba_array(image)[..., 3].any(axis=1))[0]
+        assert rows.size > 0
+        # The text is not clipped by the bounding rect.
+        assert rows[0] > 0 and rows[-1] < image.height() - 1
+        return rows[-1] - rows[0] + 1
+
+    # The text is painted with the font of label.
+    heights = [render_ink_height(size) for size in (8, 16, 32)]
+    assert heights[0] < heights[1] < heights[2]
+    assert heights[2] > 3 * heights[0]
+
+
+def test_move_edge_label_with_node_selected():
+    net = create_network()
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+    edge = net.edges["E0"]
+    label = LabelClass(edge, "Label")
+    net.add_label(label)
+    assert label._text_item is None  # Not created until requested
+
+    # The label stays on the edge while an endpoint node is selected.
+    pos = label.pos()
+    net.nodes["N0"].setSelected(True)
+    assert edge.is_node_selected()
+    label.setPos(5, 5)
+    assert label.pos() == pos
+
+    net.nodes["N0"].setSelected(False)
+    label.setPos(5, 5)
+    assert label.pos() == QPointF(5, 5)
+
+
+def test_style_pool():
+    net = create_network()
+    n0, n1, n2 = (net.nodes["N%d" % i] for i in range(3))
+    for node in (n0, n1, n2):
+        node["FILL_COLOR"] = Qt.white
+        node["BORDER_COLOR"] = Qt.darkGray
+
+    # The items refer to the same objects in the pool.
+    assert n0._color is n1._color
+    assert n0._pen is n1._pen
+
+    # Restyling an item does not affect the others.
+    pen = n1._pen
+    n0["BORDER_WIDTH"] = 3
+    n0["FILL_COLOR"] = Qt.red
+    assert n0._pen is not pen and n0._pen.width() == 3
+    assert n1._pen is pen and pen.width() == 1
+    assert n1._color == QColor(Qt.white)
+
+    n2["BORDER_WIDTH"] = 3
+    n2["FILL_COLOR"] = QColor(255, 0, 0)
+    assert n2._pen is n0._pen
+    assert n2._color is n0._color
+
+    LabelClass = LabelClassFactory.create("TEXT_LABEL")
+    label0 = LabelClass(n0, "A")
+    label1 = LabelClass(n1, "B")
+    for label in (label0, label1):
+        label["FONT_FAMILY"] = "Tahoma"
+        label["FONT_SIZE"] = 10
+    assert label0.font is label1.font
+
+    label0["FONT_BOLD"] = True
+    assert label0.font.bold() and not label1.font.bold()
+
+    # Heads share their attributes until either of them is modified.
+    ArrowClass = ArrowClassFactory.create("TRIANGLE")
+    prototype = ArrowClass()
+    e0, e1 = net.edges["E0"], net.edges["E1"]
+    e0.head = prototype.copy(cow=True)
+    e1.head = prototype.copy(cow=True)
+    assert e0.head._attr.data is e1.head._attr.data
+
+    e0.head.width = 20
+    assert e0.head._attr.data is not e1.head._attr.data
+    assert e1.head.width == ArrowClass.DEFAULT_WIDTH
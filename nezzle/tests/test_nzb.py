@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import numpy as np
+from qtpy import QtWidgets
+
+from nezzle.io import read_network
+from nezzle.io import write_network
+from nezzle.io.nzb import NzbFile
+from nezzle.io.nzb import read_metadata_from_nzb
+from nezzle.io.nzj import read_metadata_from_nzj
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+dpath = os.path.dirname(__file__)
+fpath_nzj = os.path.join(dpath, "korkut_2015.json")
+edge_map = {"Triangle": "Triangle", "Hammer": "Hammer"}
+
+
+def normalize(dict_net):
+    # Tuples are stored as lists in both formats.
+    dict_net["NEZZLE_VERSION"] = list(dict_net["NEZZLE_VERSION"])
+    return dict_net
+
+
+def test_nzb_round_trip(tmpdir):
+    net = read_network(fpath_nzj, edge_map=edge_map, headless=True)
+    fpath_nzb = str(tmpdir.join("network.nzb"))
+    fpath_json = str(tmpdir.join("network.nzj"))
+    write_network(net, fpath_nzb)
+    write_network(net, fpath_json)
+
+    assert os.path.getsize(fpath_nzb) < os.path.getsize(fpath_json)
+
+    net_nzb = read_network(fpath_nzb, edge_map=edge_map, headless=True)
+    net_nzj = read_network(fpath_json, edge_map=edge_map, headless=True)
+    assert normalize(net_nzb.to_dict()) == normalize(net_nzj.to_dict())
+
+    metadata = read_metadata_from_nzb(fpath_nzb)
+    assert metadata == read_metadata_from_nzj(fpath_json)
+
+
+def test_nzb_columns(tmpdir):
+    net = read_network(fpath_nzj, edge_map=edge_map, headless=True)
+    fpath_nzb = str(tmpdir.join("network.nzb"))
+    write_network(net, fpath_nzb)
+
+    dict_net = net.to_dict()
+    with NzbFile(fpath_nzb) as nzb:
+        pos_x = nzb.column("NODES", "POS_X")
+        assert pos_x.dtype == np.float64
+        assert not pos_x.flags.owndata  # A view of the mapped file
+        assert pos_x.tolist() == [node["POS_X"] for node in dict_net["NODES"]]
+
+        ids = nzb.values("EDGES", "ID_SOURCE")
+        assert ids == [edge["ID_SOURCE"] for edge in dict_net["EDGES"]]
+        assert nzb.values("EDGES", "HEAD") \
+            == [edge["HEAD"] for edge in dict_net["EDGES"]]
+
+        # The repeated strings are stored once.
+        item_types = nzb.column("NODES", "ITEM_TYPE")
+        assert len(set(item_types.tolist())) == 1
+
+
+def test_nzb_read_progress(tmpdir):
+    net = read_network(fpath_nzj, edge_map=edge_map, headless=True)
+    fpath_nzb = str(tmpdir.join("network.nzb"))
+    write_network(net, fpath_nzb)
+
+    reports = []
+    with NzbFile(fpath_nzb) as nzb:
+        nzb.to_dict(progress=lambda *args: reports.append(args))
+        num_columns = sum(len(nzb.column_names(table))
+                          for table in ("NODES", "EDGES", "LABELS"))
+
+    # The bytes of file are reported after each column is decoded.
+    size = os.path.getsize(fpath_nzb)
+    assert len(reports) == num_columns
+    assert all(stage == "read" for stage, _, _ in reports)
+    assert reports[-1] == ("read", size, size)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import json
+import codecs
+
+import pytest
+from qtpy import QtWidgets
+
+from nezzle.io import read_metadata
+from nezzle.io import read_network
+from nezzle.io import write_network
+from nezzle.io.nzj import JsonStreamReader
+from nezzle.io.nzj import read_metadata_from_nzj
+from nezzle.io.nzj import read_nzj
+from nezzle.io.nzj import write_nzj
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+dpath = os.path.dirname(__file__)
+fpath_nzj = os.path.join(dpath, "korkut_2015.json")
+edge_map = {"Triangle": "Triangle", "Hammer": "Hammer"}
+
+
+def count_interactions(dict_net):
+    interactions = {}
+    for edge in dict_net["EDGES"]:
+        if edge["HEAD"]:
+            str_head_type = edge["HEAD"]["ITEM_TYPE"].title()
+            interactions[str_head_type] = interactions.get(str_head_type, 0) + 1
+    return interactions
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_json_stream_reader(chunk_size):
+    doc = {"A": [1, 2.5e-3, {"B": "x]}\\\"y"}], "C": {}, "D": [],
+           "E": -12345678901234567890, "F": None, "G": "é"}
+    reader = JsonStreamReader(io.StringIO(json.dumps(doc)), chunk_size)
+
+    result = {}
+    for key in reader.iter_object():
+        if key in ("A", "C"):
+            reader.skip_value()
+        else:
+            result[key] = reader.read_value()
+
+    assert result == {k: doc[k] for k in "DEFG"}
+    assert reader.peek() == ''
+
+
+def test_read_metadata_without_header():
+    with codecs.open(fpath_nzj, "r", encoding="utf-8") as fin:
+        dict_net = json.loads(fin.read())
+
+    metadata = read_metadata_from_nzj(fpath_nzj)
+    assert metadata["NETWORK_NAME"] == dict_net["NAME"]
+    assert dict(metadata["INTERACTIONS"]) == count_interactions(dict_net)
+
+
+def test_read_metadata_from_header(tmpdir):
+    net = read_nzj(fpath_nzj, edge_map=edge_map, headless=True)
+    fpath = str(tmpdir.join("network.nzj"))
+    write_nzj(net, fpath)
+
+    with codecs.open(fpath, "r", encoding="utf-8") as fin:
+        dict_net = json.loads(fin.read())
+
+    assert next(iter(dict_net)) == "METADATA"
+    metadata = read_metadata_from_nzj(fpath)
+    assert metadata["NETWORK_NAME"] == net.name
+    assert dict(metadata["INTERACTIONS"]) == count_interactions(dict_net)
+
+    net_read = read_nzj(fpath, edge_map=edge_map, headless=True)
+    assert len(net_read.nodes) == len(net.nodes)
+    assert len(net_read.edges) == len(net.edges)
+
+
+def test_write_nzj_stream(tmpdir):
+    net = read_nzj(fpath_nzj, edge_map=edge_map, headless=True)
+    fpath = str(tmpdir.join("network.nzj"))
+    write_nzj(net, fpath, metadata=False)
+
+    with codecs.open(fpath, "r", encoding="utf-8") as fin:
+        dict_net = json.loads(fin.read())
+
+    assert dict_net == json.loads(json.dumps(net.to_dict()))
+
+
+@pytest.mark.parametrize("ext", [".nzj.gz", ".json.gz", ".nzj.zst"])
+def test_compressed_nzj(tmpdir, ext):
+    if ext.endswith(".zst"):
+        pytest.importorskip("zstandard")
+
+    net = read_nzj(fpath_nzj, edge_map=edge_map, headless=True)
+    fpath = str(tmpdir.join("network" + ext))
+    fpath_plain = str(tmpdir.join("network.nzj"))
+    write_network(net, fpath)
+    write_network(net, fpath_plain)
+
+    assert os.path.getsize(fpath) < os.path.getsize(fpath_plain)
+    assert read_metadata(fpath) == read_metadata(fpath_plain)
+
+    net_read = read_network(fpath, edge_map=edge_map, headless=True)
+    assert net_read.to_dict() == net.to_dict()
+
+
+@pytest.mark.parametrize("ext", [".nzj", ".nzj.gz", ".nzb"])
+def test_read_network_without_edge_map(tmpdir, ext):
+    net = read_network(fpath_nzj, edge_map=edge_map, headless=True)
+    fpath = str(tmpdir.join("network" + ext))
+    write_network(net, fpath)
+
+    # The head types of file are kept without an edge map.
+    net2 = read_network(fpath, headless=True)
+    for iden, edge in net.edges.items():
+        head, head2 = edge.head, net2.edges[iden].head
+        assert type(head2) is type(head)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from qtpy.QtCore import QPointF
+
+from nezzle.graphics import quadbezier
+
+
+def to_array(points):
+    return np.array([(p.x(), p.y()) for p in points])
+
+
+def test_batch_functions():
+    rng = np.random.default_rng(0)
+    cps = rng.uniform(-100, 100, size=(50, 3, 2))
+    width = 4.0
+
+    sps, valid = quadbezier.identify_sps_batch(cps)
+    qps_top, qps_bottom = quadbezier.identify_qps_batch(sps, width)
+    dps_top, dps_bottom = quadbezier.identify_dps_batch(sps, width)
+    pos_head, t_head = quadbezier.identify_head_batch(cps, np.full(50, 20.0))
+
+    assert sps.shape == (50, 9, 2)
+    assert qps_top.shape == qps_bottom.shape == (50, 5, 2)
+    assert dps_top.shape == dps_bottom.shape == (50, 4, 2)
+    assert pos_head.shape == (50, 2)
+
+    for i in range(50):
+        list_cps = [QPointF(*p) for p in cps[i]]
+        try:
+            list_sps = quadbezier.identify_sps(list_cps)
+        except FloatingPointError:
+            assert not valid[i]
+            continue
+
+        assert valid[i]
+        assert np.allclose(to_array(list_sps), sps[i], atol=1e-3)
+
+        top, bottom = quadbezier.identify_qps(list_sps, width)
+        assert np.allclose(to_array(top), qps_top[i], atol=1e-3)
+        assert np.allclose(to_array(bottom), qps_bottom[i], atol=1e-3)
+
+        top, bottom = quadbezier.identify_dps(list_sps, width)
+        assert np.allclose(to_array(top), dps_top[i], atol=1e-3)
+        assert np.allclose(to_array(bottom), dps_bottom[i], atol=1e-3)
+
+        if quadbezier.arc_length(cps[i, :, 0], cps[i, :, 1], 0.5, 1) >= 20.0:
+            arclen = quadbezier.arc_length(cps[i, :, 0], cps[i, :, 1], t_head[i], 1)
+            assert abs(arclen - 20.0) <= 1e-6 * 20.0
+
+            t = quadbezier.solve_arc_length(cps[i, :, 0], cps[i, :, 1], 20.0)
+            assert np.isclose(t, t_head[i])
+        assert np.allclose(quadbezier.point_at_batch(cps[i:i+1], t_head[i:i+1]),
+                           pos_head[i])
+
+    arclen = quadbezier.arc_length_batch(cps, 0, 1)
+    for i in range(50):
+        assert np.isclose(arclen[i],
+                          quadbezier.arc_length(cps[i, :, 0], cps[i, :, 1], 0, 1))
+
+
+def test_solve_arc_length():
+    x = np.array([0.0, 50.0, 100.0])
+    y = np.array([0.0, 80.0, 0.0])
+    total = quadbezier.arc_length(x, y, 0.5, 1)
+
+    for length in np.linspace(1, total, 10):
+        t = quadbezier.solve_arc_length(x, y, length)
+        assert 0.5 <= t <= 1
+        assert abs(quadbezier.arc_length(x, y, t, 1) - length) <= 1e-6 * length
+
+    # A curve shorter than the length falls back to the end of curve.
+    assert quadbezier.solve_arc_length(x, y, 2 * total) == 1.0
+    assert quadbezier.solve_arc_length(x, y, 1.01 * total) == 0.5
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+
+import pytest
+from qtpy import QtWidgets
+from qtpy.QtGui import QImage
+
+from nezzle.render import collect_files
+from nezzle.render import main
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+dpath = os.path.dirname(__file__)
+
+
+@pytest.fixture
+def dpath_networks(tmpdir):
+    for fname in ("korkut_2015.json", "jkwon_egfr_pathway.sif"):
+        shutil.copy(os.path.join(dpath, fname), str(tmpdir))
+    return str(tmpdir)
+
+
+def test_collect_files(dpath_networks):
+    fnames = [os.path.basename(fpath) for fpath in collect_files([dpath_networks])]
+    assert fnames == ["jkwon_egfr_pathway.sif", "korkut_2015.json"]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_render(dpath_networks, jobs):
+    ret = main(["-o", "images", "-f", "png", "--scale", "50",
+                "-j", str(jobs), "."], cwd=dpath_networks)
+    assert ret == 0
+
+    for fname in ("korkut_2015.png", "jkwon_egfr_pathway.png"):
+        image = QImage(os.path.join(dpath_networks, "images", fname))
+        assert not image.isNull()
+
+
+def test_render_failure(dpath_networks, capsys):
+    fpath = os.path.join(dpath_networks, "broken.nzj")
+    with open(fpath, "w") as fout:
+        fout.write("{")
+
+    assert main(["-j", "1", fpath]) == 1
+    assert "broken.nzj" in capsys.readouterr().err
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import os
+import codecs
+
+import numpy as np
+from qtpy import QtWidgets
+
+from nezzle.io.sif import parse_sif
+from nezzle.io.sif import read_sif
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+dpath = os.path.dirname(__file__)
+fpath_sif = os.path.join(dpath, "jkwon_egfr_pathway.sif")
+
+
+def read_lines(fpath):
+    with codecs.open(fpath, "r", encoding="utf-8-sig") as fin:
+        return [line.split()[:3] for line in fin if not line.isspace()]
+
+
+def test_parse_sif():
+    lines = read_lines(fpath_sif)
+    nodes, edge_types, edges = parse_sif(fpath_sif)
+
+    assert edges.shape == (len(lines), 3)
+    for (str_src, str_edge_type, str_trg), (src, edge_type, trg) \
+            in zip(lines, edges.tolist()):
+        assert nodes[src] == str_src
+        assert edge_types[edge_type] == str_edge_type
+        assert nodes[trg] == str_trg
+
+    # The identifiers are interned in the order of their first appearance.
+    assert nodes[:3] == [lines[0][0], lines[0][2], lines[1][2]]
+    assert sorted(edge_types) == ["+", "-"]
+
+
+def test_parse_sif_in_chunks(tmpdir):
+    fpath = str(tmpdir.join("large.sif"))
+    rng = np.random.RandomState(0)
+    with open(fpath, "w", encoding="utf-8") as fout:
+        for src, trg, sign in zip(rng.randint(0, 300, 5000),
+                                  rng.randint(0, 300, 5000),
+                                  rng.randint(0, 2, 5000)):
+            fout.write("N%d\t%s\tN%d\n" % (src, "+-"[sign], trg))
+
+    serial = parse_sif(fpath)
+    for num_workers in (1, 3):
+        reports = []
+        chunked = parse_sif(fpath, num_workers, chunk_size=4096,
+                            progress=lambda *args: reports.append(args))
+        assert serial[0] == chunked[0]
+        assert serial[1] == chunked[1]
+        assert np.array_equal(serial[2], chunked[2])
+
+        # The bytes of file are reported after each chunk.
+        size = os.path.getsize(fpath)
+        assert len(reports) > 3
+        assert [num_read for _, num_read, _ in reports] \
+            == sorted(num_read for _, num_read, _ in reports)
+        assert reports[-1] == ("read", size, size)
+
+        # Parsing is aborted by the callback.
+        def stop(stage, num_read, total):
+            raise StopIteration()
+
+        try:
+            parse_sif(fpath, num_workers, chunk_size=4096, progress=stop)
+        except StopIteration:
+            pass
+        else:
+            raise AssertionError("StopIteration is not raised.")
+
+
+def test_read_sif():
+    edge_map = {"+": "TRIANGLE", "-": "HAMMER"}
+    net = read_sif(fpath_sif, edge_map=edge_map)
+    nodes, edge_types, edges = parse_sif(fpath_sif)
+
+    assert list(net.nodes) == nodes
+    assert len(net.labels) == len(nodes)
+    for src, edge_type, trg in edges.tolist():
+        iden = nodes[src] + edge_types[edge_type] + nodes[trg]
+        edge = net.edges[iden]
+        assert edge.name == edge_types[edge_type]
+        assert edge.head.ITEM_TYPE == edge_map[edge_types[edge_type]]
+
+    try:
+        read_sif(fpath_sif, edge_map={"+": "TRIANGLE"})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("ValueError is not raised.")
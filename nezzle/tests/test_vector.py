@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+
+import numpy as np
+from qtpy import QtWidgets
+from qtpy.QtCore import Qt
+from qtpy.QtGui import QImage
+from qtpy.QtGui import QPainter
+from qtpy.QtSvg import QSvgRenderer
+
+from nezzle.io import read_network
+from nezzle.io import write_image
+from nezzle.io import write_network
+from nezzle.io import render_image
+from nezzle.io import image as nzimage
+
+app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+dpath = os.path.dirname(__file__)
+fpath_nzj = os.path.join(dpath, "korkut_2015.json")
+edge_map = {"Triangle": "Triangle", "Hammer": "Hammer"}
+
+
+def test_write_svg(tmpdir):
+    net = read_network(fpath_nzj, edge_map=edge_map)
+    fpath = str(tmpdir.join("network.svg"))
+    write_image(net, fpath, scale_width=50, scale_height=50)
+
+    with open(fpath, encoding="utf-8") as fin:
+        svg = fin.read()
+
+    # Each item is an element, and the styles are shared in classes.
+    num_shapes = len(re.findall(r"<(?:ellipse|rect|path) class=", svg))
+    assert num_shapes == len(net.nodes) + len(net.edges)
+    assert len(re.findall(r"<text class=", svg)) == len(net.labels)
+
+    classes = re.findall(r"^\.(s\d+)\{", svg, re.MULTILINE)
+    assert len(classes) < 10
+    assert set(re.findall(r'class="(s\d+)"', svg)) == set(classes)
+
+    # The size of file does not depend on the size of image.
+    fpath_large = str(tmpdir.join("network_large.svg"))
+    write_network(net, fpath_large)
+    assert abs(os.path.getsize(fpath_large) - os.path.getsize(fpath)) < 100
+
+
+def test_svg_matches_raster_image(tmpdir):
+    net = read_network(fpath_nzj, edge_map=edge_map)
+
+    # Glyphs are rasterized differently, so only the shapes are compared.
+    for label in net.labels.values():
+        label.setVisible(False)
+
+    fpath = str(tmpdir.join("network.svg"))
+    write_image(net, fpath, transparent=False, scale_width=50, scale_height=50)
+    image_ref = render_image(net, transparent=False, scale_width=50, scale_height=50)
+
+    renderer = QSvgRenderer(fpath)
+    assert renderer.isValid()
+    assert renderer.defaultSize() == image_ref.size()
+
+    image = QImage(image_ref.size(), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    painter.setRenderHints(QPainter.Antialiasing)
+    renderer.render(painter)
+    painter.end()
+
+    arr = nzimage.to_rgba_array(image).astype(int)
+    arr_ref = nzimage.to_rgba_array(image_ref).astype(int)
+    assert np.abs(arr - arr_ref).mean() < 3
+
+
+def test_write_pdf(tmpdir):
+    net = read_network(fpath_nzj, edge_map=edge_map)
+    fpath = str(tmpdir.join("network.pdf"))
+    write_image(net, fpath, scale_width=50, scale_height=50)
+
+    with open(fpath, "rb") as fin:
+        data = fin.read()
+
+    assert data.startswith(b"%PDF")
+
+    # The page has the physical size of the image in points.
+    image = render_image(net, scale_width=50, scale_height=50)
+    media_box = re.search(rb"/MediaBox \[0 0 ([\d.]+) ([\d.]+)\]", data)
+    assert abs(float(media_box.group(1)) - 72 * image.width() / 350) <= 1
+    assert abs(float(media_box.group(2)) - 72 * image.height() / 350) <= 1
@@ -2,9 +2,10 @@
 
 # Form implementation generated from reading ui file './nezzle/ui/ui_progressdialog.ui'
 #
-# Created by: PyQt5 UI code generator 5.12.3
+# Created by: PyQt5 UI code generator 5.15.11
 #
-# WARNING! All changes made in this file will be lost!
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
 
 
 from PyQt5 import QtCore, QtGui, QtWidgets
@@ -13,16 +14,26 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 class Ui_ProgressDialog(object):
     def setupUi(self, ProgressDialog):
         ProgressDialog.setObjectName("ProgressDialog")
-        ProgressDialog.resize(449, 40)
+        ProgressDialog.resize(449, 70)
         ProgressDialog.setSizeGripEnabled(False)
         ProgressDialog.setModal(False)
         self.verticalLayout = QtWidgets.QVBoxLayout(ProgressDialog)
         self.verticalLayout.setObjectName("verticalLayout")
+        self.ui_messageLabel = QtWidgets.QLabel(ProgressDialog)
+        self.ui_messageLabel.setText("")
+        self.ui_messageLabel.setObjectName("ui_messageLabel")
+        self.verticalLayout.addWidget(self.ui_messageLabel)
+        self.horizontalLayout = QtWidgets.QHBoxLayout()
+        self.horizontalLayout.setObjectName("horizontalLayout")
         self.ui_progressBar = QtWidgets.QProgressBar(ProgressDialog)
         self.ui_progressBar.setProperty("value", 0)
         self.ui_progressBar.setTextVisible(False)
         self.ui_progressBar.setObjectName("ui_progressBar")
-        self.verticalLayout.addWidget(self.ui_progressBar)
+        self.horizontalLayout.addWidget(self.ui_progressBar)
+        self.ui_cancelButton = QtWidgets.QPushButton(ProgressDialog)
+        self.ui_cancelButton.setObjectName("ui_cancelButton")
+        self.horizontalLayout.addWidget(self.ui_cancelButton)
+        self.verticalLayout.addLayout(self.horizontalLayout)
 
         self.retranslateUi(ProgressDialog)
         QtCore.QMetaObject.connectSlotsByName(ProgressDialog)
@@ -30,3 +41,4 @@ class Ui_ProgressDialog(object):
     def retranslateUi(self, ProgressDialog):
         _translate = QtCore.QCoreApplication.translate
         ProgressDialog.setWindowTitle(_translate("ProgressDialog", "Dialog"))
+        self.ui_cancelButton.setText(_translate("ProgressDialog", "Cancel"))
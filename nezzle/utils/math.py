@@ -272,6 +272,62 @@ def solve_cubic(a, b, c, d):
     return sols
 
 
+def solve_cubic_batch(a, b, c, d):
+    """Solve cubic equations, a*x^3 + b*x^2+ c*x + d, at once.
+
+    This is a vectorized version of solve_cubic(),
+    which returns only the first solution of each equation.
+
+    Args:
+        a : numpy.ndarray
+            Coefficients of x^3.
+        b : numpy.ndarray
+            Coefficients of x^2.
+        c : numpy.ndarray
+            Coefficients of x.
+        d : numpy.ndarray
+            Constant terms.
+
+    Returns:
+        x : numpy.ndarray
+            The first solutions of the cubic equations,
+            which are the same as solve_cubic(a[i], b[i], c[i], d[i])[0].
+            The solution is NaN if a[i] is zero.
+
+    Examples:
+        >>> solve_cubic_batch(np.array([1, 1]), np.array([0, -1]),
+        ...                   np.array([0, -4]), np.array([-1, 4]))
+        array([1., 2.])
+    """
+    with np.errstate(all='ignore'):
+        A = b / a
+        B = c / a
+        C = d / a
+
+        sq_A = A * A
+        p = 1.0/3 * (-1.0/3*sq_A + B)
+        q = 1.0/2 * (2.0/27*A*sq_A - 1.0/3*A*B + C)
+
+        cb_p = p * p * p
+        D = q * q + cb_p
+
+        # One triple solution, or one single and one double solution
+        sol_double = np.where(np.isclose(q, 1e-12), 0.0, 2 * np.cbrt(-q))
+
+        # Casus irreducibilis: three real solutions
+        phi = 1.0/3 * np.arccos(-q/np.sqrt(-cb_p))
+        sol_three = 2*np.sqrt(-p)*np.cos(phi)
+
+        # One real solution
+        sqrt_D = np.sqrt(D)
+        sol_one = np.cbrt(sqrt_D - q) - np.cbrt(sqrt_D + q)
+
+        sols = np.where(np.isclose(D, 1e-12), sol_double,
+                        np.where(D < 0, sol_three, sol_one))
+
+        return sols - 1.0/3*A
+
+
 def rotate(ap, rp, angle, tlen=None):
     """Rotate a point clockwise with respect to the given axis.
 
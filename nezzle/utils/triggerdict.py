@@ -1,12 +1,97 @@
+import sys
 
-from collections import UserDict
+if sys.version_info.minor > 9:
+    from collections.abc import MutableMapping
+else:
+    from collections import MutableMapping
 
 
-class TriggerDict(UserDict):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._triggers_set = dict()
-        self._triggers_get = dict()
+def trigger(*keys, when='set'):
+    """Declare a method as the trigger of attributes.
+
+    The triggers of a class derived from Triggerable are compiled
+    once when the class is created, instead of being registered
+    for every instance. A subclass can override a trigger method
+    without declaring it again.
+
+    Args:
+        keys : str
+            Keys of the attributes.
+        when : str
+            'set' or 'get' for the timing of trigger.
+
+    Examples:
+        >>> class Item(Triggerable):
+        ...     def __init__(self):
+        ...         self._attr = TriggerDict(owner=self)
+        ...
+        ...     @trigger('WIDTH')
+        ...     def _trigger_set_width(self, key, value):
+        ...         self._width = value
+        ...         return value
+    """
+    if when not in ('set', 'get'):
+        raise ValueError("You should choose 'set' or 'get' "
+                         "for the timing of trigger, not '%s.'" % (when))
+
+    def decorator(func):
+        func._trigger_keys = getattr(func, '_trigger_keys', ()) \
+                             + tuple((key, when) for key in keys)
+        return func
+
+    return decorator
+
+
+class Triggerable(object):
+    """Base class whose triggers are compiled per class.
+
+    The compiled triggers are dicts of keys to the (unbound) functions
+    resolved by the names of trigger methods in the class.
+    """
+
+    _triggers_set = {}
+    _triggers_get = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        names = {'set': {}, 'get': {}}
+        for klass in reversed(cls.__mro__):
+            for name, member in vars(klass).items():
+                for key, when in getattr(member, '_trigger_keys', ()):
+                    names[when][key] = name
+
+        cls._triggers_set = {key: getattr(cls, name)
+                             for key, name in names['set'].items()}
+        cls._triggers_get = {key: getattr(cls, name)
+                             for key, name in names['get'].items()}
+
+
+class TriggerDict(MutableMapping):
+    """Dict of attributes calling the triggers when the values are set or get.
+
+    The triggers of the owner class are shared by all dicts of the class,
+    so a dict holds only its storage and a reference to the owner.
+    A trigger is called with the owner, key and value, and the returned
+    value is stored (or returned for 'get' triggers).
+    """
+
+    __slots__ = ('data', '_owner', '_triggers_set', '_triggers_get', '_shared')
+
+    def __init__(self, *args, owner=None, **kwargs):
+        self.data = {}
+        self._owner = owner
+        self._shared = False
+
+        if owner is None:
+            self._triggers_set = {}
+            self._triggers_get = {}
+        else:
+            self._triggers_set = type(owner)._triggers_set
+            self._triggers_get = type(owner)._triggers_get
+
+        if args or kwargs:
+            self.update(*args, **kwargs)
 
     def __setitem__(self, key, value):
         self.set(key, value)
@@ -14,30 +99,82 @@ class TriggerDict(UserDict):
     def __getitem__(self, key):
         return self.get(key)
 
+    def __delitem__(self, key):
+        self._detach()
+        del self.data[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __repr__(self):
+        return repr(self.data)
+
+    def keys(self):
+        return self.data.keys()
+
+    def items(self):
+        if self._triggers_get:
+            return super().items()
+        return self.data.items()
+
+    def values(self):
+        if self._triggers_get:
+            return super().values()
+        return self.data.values()
+
+    def share(self, other):
+        """Share the storage of other dict (copy-on-write).
+
+        The storage is shared until either of the dicts is modified.
+        The modified dict copies the storage before the modification.
+        """
+        self.data = other.data
+        self._shared = True
+        other._shared = True
+
+    def _detach(self):
+        if self._shared:
+            self.data = dict(self.data)
+            self._shared = False
+
     def set_trigger(self, key, func, when='set'):
+        """Set the trigger of this dict only.
+
+        Unlike the triggers declared with trigger(),
+        func is called with the key and value.
+        """
         if when == 'set':
-            self._triggers_set[key] = func
+            triggers = self._triggers_set = dict(self._triggers_set)
         elif when == 'get':
-            self._triggers_get[key] = func
+            triggers = self._triggers_get = dict(self._triggers_get)
         else:
-            ValueError("You should choose 'set' or 'get' "
-                       "for the timing of trigger, not '%s.'"%(when))
+            raise ValueError("You should choose 'set' or 'get' "
+                             "for the timing of trigger, not '%s.'" % (when))
+
+        triggers[key] = lambda owner, key, value: func(key, value)
 
     def set(self, key, value, trigger=True):
-        if key not in self._triggers_set or not trigger:
-            self.data[key] = value
-            return
+        if self._shared:
+            self._detach()
 
         if trigger:
-            func = self._triggers_set[key]
-            self.data[key] = func(key, value)
+            func = self._triggers_set.get(key)
+            if func is not None:
+                value = func(self._owner, key, value)
 
-    def get(self, key, trigger=True):
-        if key not in self._triggers_get or not trigger:
-            return self.data.get(key)
+        self.data[key] = value
 
-        if trigger:
-            func = self._triggers_get[key]
-            value = self.data.get(key)
-            return func(key, value)
+    def get(self, key, trigger=True):
+        value = self.data.get(key)
+        if trigger and self._triggers_get:
+            func = self._triggers_get.get(key)
+            if func is not None:
+                return func(self._owner, key, value)
 
+        return value